@@ -49,6 +49,7 @@ a = Analysis(
     hiddenimports=[
         'PIL._tkinter_finder',
         'matplotlib.backends.backend_tkagg',
+        'main_window',  # imported inside gui.main()
     ],
     hookspath=[],
     hooksconfig={},
@@ -1,7 +1,16 @@
 """
 Archaeology Simulator Module for ObeliskFarm
-"""
 
-from .simulator import ArchaeologySimulatorWindow
+The simulation core (block_stats, block_spawn_rates, calculator, monte_carlo_crit,
+stage_distribution, mc_parallel, headless) does not import tkinter/PIL. The GUI window is loaded on
+first access, so process-pool workers importing the core stay lightweight.
+"""
 
 __all__ = ['ArchaeologySimulatorWindow']
+
+
+def __getattr__(name):
+    if name == 'ArchaeologySimulatorWindow':
+        from .simulator import ArchaeologySimulatorWindow
+        return ArchaeologySimulatorWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
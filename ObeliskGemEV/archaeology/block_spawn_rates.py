@@ -17,9 +17,17 @@ Special floors where only one block type spawns (100% chance).
 These override the normal spawn rates.
 """
 
-from typing import Dict, Tuple, Optional
+from dataclasses import dataclass
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple, Optional
 import random
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only sample_floors_slot_types needs it
+    np = None
+
 # Boss floors with 100% spawn rate for a single block type
 # Format: floor -> block_type
 BOSS_FLOORS: Dict[int, str] = {
@@ -142,6 +150,10 @@ SPAWN_RATES_BY_STAGE: Dict[Tuple[int, int], Dict[str, float]] = {
 # Block types in order of rarity
 BLOCK_TYPES = ['dirt', 'common', 'rare', 'epic', 'legendary', 'mythic']
 
+# Integer type codes used by the bulk samplers: index into BLOCK_TYPES, EMPTY_SLOT = no block
+EMPTY_SLOT = -1
+SLOTS_PER_FLOOR = 24
+
 # Stage ranges for display purposes
 STAGE_RANGES = [
     "1-2", "3-4", "5", "6-9", "10-11", "12-14", 
@@ -315,6 +327,87 @@ def get_all_boss_floors() -> Dict[int, str]:
     return BOSS_FLOORS.copy()
 
 
+@dataclass(frozen=True)
+class SpawnTable:
+    """
+    Precomputed spawn data for one stage (see get_spawn_table).
+    
+    `cumulative` follows the normalized rates of the active types (`type_codes`),
+    in the same order spawn_block_for_slot walks them. The alias columns cover all
+    of BLOCK_TYPES (Walker's method: pick column i uniformly, keep it with
+    probability alias_prob[i], otherwise take alias_index[i]).
+    """
+    stage: int
+    total_spawn_chance: float  # percent (0-100)
+    type_codes: Tuple[int, ...]
+    cumulative: Tuple[float, ...]
+    alias_prob: Tuple[float, ...]
+    alias_index: Tuple[int, ...]
+
+
+def _build_alias_table(probs: Sequence[float]) -> Tuple[Tuple[float, ...], Tuple[int, ...]]:
+    """Walker/Vose alias table for a discrete distribution"""
+    k = len(probs)
+    scaled = [p * k for p in probs]
+    alias_prob = [1.0] * k
+    alias_index = list(range(k))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        alias_prob[s] = scaled[s]
+        alias_index[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    # Leftovers are 1.0 up to rounding
+    return tuple(alias_prob), tuple(alias_index)
+
+
+@lru_cache(maxsize=4096)
+def get_spawn_table(stage: int) -> SpawnTable:
+    """
+    Get the precomputed spawn table for a stage (cached).
+    
+    Args:
+        stage: The current floor/stage number (1-based)
+    
+    Returns:
+        SpawnTable with total spawn chance, cumulative type probabilities and
+        an alias table over BLOCK_TYPES codes.
+    """
+    total_spawn_chance = get_total_spawn_probability(stage)
+    normalized = get_normalized_spawn_rates(stage)
+    
+    type_codes = []
+    cumulative = []
+    acc = 0.0
+    for block_type, spawn_chance in normalized.items():
+        acc += spawn_chance
+        type_codes.append(BLOCK_TYPES.index(block_type))
+        cumulative.append(acc)
+    
+    probs = [normalized.get(block_type, 0.0) for block_type in BLOCK_TYPES]
+    alias_prob, alias_index = _build_alias_table(probs)
+    return SpawnTable(
+        stage=stage,
+        total_spawn_chance=total_spawn_chance,
+        type_codes=tuple(type_codes),
+        cumulative=tuple(cumulative),
+        alias_prob=alias_prob,
+        alias_index=alias_index,
+    )
+
+
+def _sample_slot_code(table: SpawnTable, rng) -> int:
+    # Same draws and comparisons as the original per-slot loop
+    if rng.random() * 100.0 > table.total_spawn_chance:
+        return EMPTY_SLOT
+    pos = bisect_left(table.cumulative, rng.random())
+    if pos == len(table.cumulative):
+        return EMPTY_SLOT  # Rounding gap above the last cumulative value
+    return table.type_codes[pos]
+
+
 def spawn_block_for_slot(stage: int, rng=None) -> Optional[str]:
     """
     Spawn a block for a single slot based on spawn rates.
@@ -337,28 +430,65 @@ def spawn_block_for_slot(stage: int, rng=None) -> Optional[str]:
     if rng is None:
         rng = random
     
-    raw_rates = get_spawn_rates_for_stage(stage)
+    code = _sample_slot_code(get_spawn_table(stage), rng)
+    return None if code == EMPTY_SLOT else BLOCK_TYPES[code]
+
+
+def sample_slot_types(stage: int, n_slots: int = SLOTS_PER_FLOOR, rng=None) -> List[int]:
+    """
+    Spawn all slots of one floor at once.
     
-    # Calculate total spawn probability (sum of all rates)
-    total_spawn_chance = sum(raw_rates.values())
+    Same draws as calling spawn_block_for_slot for each slot in turn, but returns
+    integer type codes (index into BLOCK_TYPES, EMPTY_SLOT for no block).
     
-    # Check if a block spawns at all
-    if rng.random() * 100.0 > total_spawn_chance:
-        return None
+    Args:
+        stage: The current floor/stage number (1-based)
+        n_slots: Number of slots on the floor
+        rng: Optional random number generator (for reproducibility)
+    """
+    if rng is None:
+        rng = random
+    table = get_spawn_table(stage)
+    return [_sample_slot_code(table, rng) for _ in range(n_slots)]
+
+
+def sample_floors_slot_types(stages, n_slots: int = SLOTS_PER_FLOOR, rng=None):
+    """
+    Spawn the slots of many floors at once (requires NumPy).
     
-    # A block spawns - determine type based on normalized rates
-    normalized_rates = get_normalized_spawn_rates(stage)
+    Uses the alias tables, so the draws differ from spawn_block_for_slot but the
+    distribution is the same.
     
-    # Select block type using weighted random
-    rand = rng.random()
-    cumulative = 0.0
-    for block_type, spawn_chance in normalized_rates.items():
-        cumulative += spawn_chance
-        if rand <= cumulative:
-            return block_type
+    Args:
+        stages: Sequence/array of floor numbers (one row per entry)
+        n_slots: Number of slots per floor
+        rng: Optional numpy.random.Generator. If None, one is seeded from the
+            global `random` module.
     
-    # Fallback (shouldn't happen)
-    return None
+    Returns:
+        int8 array of shape (len(stages), n_slots) with type codes (EMPTY_SLOT = no block)
+    """
+    if np is None:
+        raise ImportError("sample_floors_slot_types requires NumPy")
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    
+    stages = np.asarray(stages, dtype=np.int64).reshape(-1)
+    unique_stages, rows = np.unique(stages, return_inverse=True)
+    tables = [get_spawn_table(int(stage)) for stage in unique_stages]
+    spawn_chance = np.array([t.total_spawn_chance for t in tables])[rows]
+    alias_prob = np.array([t.alias_prob for t in tables])[rows]
+    alias_index = np.array([t.alias_index for t in tables], dtype=np.int8)[rows]
+    
+    k = len(BLOCK_TYPES)
+    u = rng.random((2, stages.size, n_slots))
+    scaled = u[1] * k
+    column = np.minimum(scaled.astype(np.int64), k - 1)
+    floor_idx = np.arange(stages.size)[:, None]
+    keep = (scaled - column) < alias_prob[floor_idx, column]
+    codes = np.where(keep, column, alias_index[floor_idx, column]).astype(np.int8)
+    codes[u[0] * 100.0 > spawn_chance[:, None]] = EMPTY_SLOT
+    return codes
 
 
 def get_total_spawn_probability(stage: int) -> float:
@@ -11,6 +11,11 @@ Tiers: 1, 2, 3 (higher tiers have more HP/Armor but also more rewards)
 from typing import Dict, List, Tuple, Optional, NamedTuple
 from dataclasses import dataclass
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only get_block_arrays needs it
+    np = None
+
 
 @dataclass
 class BlockData:
@@ -90,6 +95,38 @@ def get_block_data(tier: int, block_type: str) -> Optional[BlockData]:
     return _BLOCK_INDEX.get((tier, block_type))
 
 
+def _scan_block_at_floor(floor: int, block_type: str) -> Optional[BlockData]:
+    blocks = _BLOCK_BY_TYPE.get(block_type, [])
+    
+    # Find all tiers that can spawn at this floor
+    valid_blocks = [b for b in blocks if b.floor_min <= floor <= b.floor_max]
+    
+    if not valid_blocks:
+        return None
+    
+    # Return the highest tier among valid blocks
+    return max(valid_blocks, key=lambda b: b.tier)
+
+
+def _scan_block_mix(floor: int) -> Dict[str, BlockData]:
+    result = {}
+    for block_type in BLOCK_TYPES:
+        block = _scan_block_at_floor(floor, block_type)
+        if block:
+            result[block_type] = block
+    return result
+
+
+# From this floor on the mix no longer changes (every open-ended tier has started
+# and every bounded one has ended)
+MIX_STABLE_FROM: int = max(
+    [b.floor_min for b in BLOCK_DATA] + [int(b.floor_max) + 1 for b in BLOCK_DATA if b.floor_max != float('inf')]
+)
+
+# Dense floor -> block mix index for floors 0..MIX_STABLE_FROM (higher floors use the last entry)
+_FLOOR_MIX_INDEX: List[Dict[str, BlockData]] = [_scan_block_mix(f) for f in range(MIX_STABLE_FROM + 1)]
+
+
 def get_block_at_floor(floor: int, block_type: str) -> Optional[BlockData]:
     """
     Get the appropriate block data for a given floor and block type.
@@ -102,16 +139,9 @@ def get_block_at_floor(floor: int, block_type: str) -> Optional[BlockData]:
     Returns:
         BlockData for the appropriate tier, or None if block can't spawn at this floor
     """
-    blocks = _BLOCK_BY_TYPE.get(block_type, [])
-    
-    # Find all tiers that can spawn at this floor
-    valid_blocks = [b for b in blocks if b.floor_min <= floor <= b.floor_max]
-    
-    if not valid_blocks:
-        return None
-    
-    # Return the highest tier among valid blocks
-    return max(valid_blocks, key=lambda b: b.tier)
+    if isinstance(floor, int) and floor >= 1:
+        return _FLOOR_MIX_INDEX[min(floor, MIX_STABLE_FROM)].get(block_type)
+    return _scan_block_at_floor(floor, block_type)
 
 
 def get_available_blocks_at_floor(floor: int) -> List[BlockData]:
@@ -140,12 +170,9 @@ def get_block_mix_for_floor(floor: int) -> Dict[str, BlockData]:
     Returns:
         Dict mapping block_type -> BlockData
     """
-    result = {}
-    for block_type in BLOCK_TYPES:
-        block = get_block_at_floor(floor, block_type)
-        if block:
-            result[block_type] = block
-    return result
+    if isinstance(floor, int) and floor >= 1:
+        return dict(_FLOOR_MIX_INDEX[min(floor, MIX_STABLE_FROM)])
+    return _scan_block_mix(floor)
 
 
 def get_tier_transition_floors() -> List[int]:
@@ -162,6 +189,53 @@ def get_tier_transition_floors() -> List[int]:
     return sorted(floors)
 
 
+class BlockArrays(NamedTuple):
+    """
+    Struct-of-arrays view of the block mix for vectorized engines.
+    
+    Each array has shape (MIX_STABLE_FROM + 1, len(BLOCK_TYPES)): row = floor,
+    column = index into BLOCK_TYPES. Types that cannot spawn on a floor have
+    tier 0 and zero stats. Index with `np.minimum(floor, MIX_STABLE_FROM)`.
+    """
+    health: "np.ndarray"
+    armor: "np.ndarray"
+    xp: "np.ndarray"
+    fragment: "np.ndarray"
+    tier: "np.ndarray"
+
+
+_block_arrays: Optional[BlockArrays] = None
+
+
+def get_block_arrays() -> BlockArrays:
+    """
+    Get the block mix of every floor as NumPy arrays (built once, read-only).
+    
+    Returns:
+        BlockArrays with health, armor, xp, fragment and tier per (floor, type)
+    """
+    global _block_arrays
+    if np is None:
+        raise ImportError("get_block_arrays requires NumPy")
+    if _block_arrays is None:
+        shape = (MIX_STABLE_FROM + 1, len(BLOCK_TYPES))
+        health, armor, xp, fragment = (np.zeros(shape) for _ in range(4))
+        tier = np.zeros(shape, dtype=np.int8)
+        for floor, mix in enumerate(_FLOOR_MIX_INDEX):
+            for col, block_type in enumerate(BLOCK_TYPES):
+                block = mix.get(block_type)
+                if block:
+                    health[floor, col] = block.health
+                    armor[floor, col] = block.armor
+                    xp[floor, col] = block.xp
+                    fragment[floor, col] = block.fragment
+                    tier[floor, col] = block.tier
+        for arr in (health, armor, xp, fragment, tier):
+            arr.setflags(write=False)
+        _block_arrays = BlockArrays(health, armor, xp, fragment, tier)
+    return _block_arrays
+
+
 def print_block_table():
     """Print a formatted block stats table (for debugging/documentation)."""
     print("Block Stats by Tier")
@@ -0,0 +1,2215 @@
+"""
+Archaeology calculation core (Tk-free).
+
+Stats, analytic per-run calculators (floors, XP, fragments, duration) and the
+stage/forecast searches used by the simulator window. The calculators read a
+`BuildSnapshot` compiled once per stats dict instead of the live build state. Kept free of tkinter/PIL
+so headless evaluation and process-pool workers can import it cheaply;
+`ArchaeologySimulatorWindow` inherits everything from `ArchaeologyCalculator`.
+"""
+
+import math
+import random
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+from .block_spawn_rates import get_normalized_spawn_rates, get_total_spawn_probability, get_available_blocks_at_stage
+from .block_stats import get_block_mix_for_floor, BLOCK_TYPES, get_block_data
+from .upgrade_costs import get_upgrade_cost
+
+
+# Skill point caps (game rules)
+# STR/AGI can be allocated up to 50, PER/INT/LUC up to 25.
+SKILL_POINT_CAPS = {
+    "strength": 50,
+    "agility": 50,
+    "perception": 25,
+    "intellect": 25,
+    "luck": 25,
+}
+
+
+def get_skill_point_cap(skill_name: str) -> int:
+    """Return the max allocatable points for a given skill (Arch stat cap)."""
+    return SKILL_POINT_CAPS.get(skill_name, 0)
+
+
+def generate_distributions_capped(n_points: int, caps: list[int]):
+    """Yield integer distributions summing to n_points, each value <= caps[i]."""
+    if not caps:
+        return
+    if n_points < 0:
+        return
+    if len(caps) == 1:
+        if n_points <= caps[0]:
+            yield (n_points,)
+        return
+    first_cap = caps[0]
+    for i in range(min(n_points, first_cap) + 1):
+        for rest in generate_distributions_capped(n_points - i, caps[1:]):
+            yield (i,) + rest
+
+
+def generate_dirichlet_samples(
+    n_points: int,
+    skills_or_n_skills,
+    n_samples: int,
+    require_str: bool = False,
+    original_str: int = 0,
+    caps=None,
+):
+    """
+    Generate skill point distributions using Dirichlet-based sampling (space-filling design).
+    
+    This is much more efficient than brute-force for large n_points, as it samples uniformly
+    from the simplex (all points where sum = n_points) instead of testing all combinations.
+    
+    Args:
+        n_points: Total skill points to distribute
+        n_skills: Number of skills (typically 5) OR a list of skill names
+        n_samples: Number of samples to generate (e.g., 500-1000)
+        require_str: If True, only return samples where STR > 0 (after adding to original_str)
+        original_str: Original STR points (for require_str check)
+        caps: Optional list of per-skill caps (same order as skills)
+    
+    Yields:
+        Tuples of (skill1_points, skill2_points, ..., skillN_points) with sum = n_points
+    """
+    if isinstance(skills_or_n_skills, int):
+        n_skills = skills_or_n_skills
+        skill_names = None
+    else:
+        skill_names = list(skills_or_n_skills)
+        n_skills = len(skill_names)
+
+    if caps is None:
+        if skill_names is None:
+            # No skill names → fall back to "no caps" behavior.
+            caps = [n_points] * n_skills
+        else:
+            caps = [min(get_skill_point_cap(s), n_points) for s in skill_names]
+
+    if len(caps) != n_skills:
+        raise ValueError("Invalid caps length for Dirichlet sampling")
+
+    if sum(caps) < n_points:
+        raise ValueError(f"Cannot allocate {n_points} points within caps (max {sum(caps)}).")
+
+    str_idx = 0
+    if skill_names and "strength" in skill_names:
+        str_idx = skill_names.index("strength")
+
+    def _allocate_capped(weights):
+        # Convert weights → integer allocation with caps while preserving total sum.
+        desired = [float(w) * n_points for w in weights]
+        base = [min(int(math.floor(d)), caps[i]) for i, d in enumerate(desired)]
+        remaining = n_points - sum(base)
+        if remaining < 0:
+            # Should not happen with floor+cap, but keep it safe.
+            remaining = 0
+        remainders = [desired[i] - math.floor(desired[i]) for i in range(n_skills)]
+
+        # Allocate remaining points to highest remainders with available capacity.
+        while remaining > 0:
+            candidates = [i for i in range(n_skills) if base[i] < caps[i]]
+            if not candidates:
+                # Caps exhausted (should not happen due to validation)
+                break
+            best_i = max(candidates, key=lambda i: remainders[i])
+            base[best_i] += 1
+            remaining -= 1
+
+        # Final sanity: if still short, distribute arbitrarily to any non-full skill.
+        while sum(base) < n_points:
+            candidates = [i for i in range(n_skills) if base[i] < caps[i]]
+            if not candidates:
+                break
+            base[random.choice(candidates)] += 1
+
+        return base
+
+    # Try to use numpy if available (more efficient)
+    try:
+        import numpy as np
+        use_numpy = True
+    except ImportError:
+        use_numpy = False
+    
+    samples_generated = 0
+    while samples_generated < n_samples:
+        if use_numpy:
+            # Generate Dirichlet sample: n_skills values that sum to 1
+            # Using alpha=1 for uniform distribution on simplex
+            dirichlet_sample = np.random.dirichlet([1.0] * n_skills)
+            rounded = _allocate_capped(dirichlet_sample.tolist())
+        else:
+            # Fallback: Generate Dirichlet sample manually using Gamma distribution
+            # Dirichlet(α) = Gamma(α) / sum(Gamma(α))
+            # For α=1, Gamma(1) = Exponential(1)
+            gamma_samples = [-math.log(random.random()) for _ in range(n_skills)]
+            gamma_sum = sum(gamma_samples)
+            if gamma_sum == 0:
+                continue  # Skip if all zeros (very rare)
+            dirichlet_sample = [g / gamma_sum for g in gamma_samples]
+            rounded = _allocate_capped(dirichlet_sample)
+        
+        # Check STR requirement if needed
+        if require_str:
+            total_str = original_str + rounded[str_idx]
+            if total_str == 0:
+                continue  # Skip this sample
+        
+        # Verify sum is correct (should always be true after normalization)
+        if sum(rounded) == n_points:
+            samples_generated += 1
+            yield tuple(rounded)
+
+
+def generate_local_refinement_samples(
+    anchor_points: list,
+    n_points: int,
+    skills_or_n_skills,
+    n_samples_per_anchor: int,
+    local_radius: int = 2,
+    require_str: bool = False,
+    original_str: int = 0,
+    caps=None,
+):
+    """
+    Generate local refinement samples around promising candidates (anchor points).
+    
+    For each anchor point, generates samples in a local design space (±local_radius points
+    per skill) to explore the neighborhood and find better solutions.
+    
+    Args:
+        anchor_points: List of tuples from candidate_scores - first element is dist_tuple
+        n_points: Total skill points to distribute
+        n_skills: Number of skills (typically 5) OR a list of skill names
+        n_samples_per_anchor: Number of samples to generate around each anchor
+        local_radius: Maximum deviation per skill (e.g., ±2 points)
+        require_str: If True, only return samples where STR > 0
+        original_str: Original STR points (for require_str check)
+    
+    Yields:
+        Tuples of (skill1_points, skill2_points, ..., skillN_points) with sum = n_points
+    """
+    if isinstance(skills_or_n_skills, int):
+        n_skills = skills_or_n_skills
+        skill_names = None
+    else:
+        skill_names = list(skills_or_n_skills)
+        n_skills = len(skill_names)
+
+    if caps is None:
+        if skill_names is None:
+            caps = [n_points] * n_skills
+        else:
+            caps = [min(get_skill_point_cap(s), n_points) for s in skill_names]
+
+    if len(caps) != n_skills:
+        raise ValueError("Invalid caps length for local refinement sampling")
+
+    if sum(caps) < n_points:
+        raise ValueError(f"Cannot allocate {n_points} points within caps (max {sum(caps)}).")
+
+    str_idx = 0
+    if skill_names and "strength" in skill_names:
+        str_idx = skill_names.index("strength")
+
+    for anchor_data in anchor_points:
+        # Extract dist_tuple (first element) from candidate_scores format
+        # candidate_scores format: (dist_tuple, avg_max_stage, stats, fragments_per_hour, xp_per_hour)
+        anchor_tuple = anchor_data[0]
+        # Define local bounds around anchor point
+        # Each skill can vary by ±local_radius, but must stay within [0, n_points]
+        local_bounds = []
+        for i, skill_val in enumerate(anchor_tuple):
+            min_val = max(0, skill_val - local_radius)
+            max_val = min(n_points, skill_val + local_radius, caps[i])
+            local_bounds.append((min_val, max_val))
+        
+        # Generate samples in local space
+        samples_generated = 0
+        max_attempts = n_samples_per_anchor * 10  # Prevent infinite loops
+        
+        while samples_generated < n_samples_per_anchor and max_attempts > 0:
+            max_attempts -= 1
+            
+            # Generate sample within local bounds using Dirichlet
+            # Scale to local range, then shift to anchor neighborhood
+            try:
+                import numpy as np
+                use_numpy = True
+            except ImportError:
+                use_numpy = False
+            
+            if use_numpy:
+                dirichlet_sample = np.random.dirichlet([1.0] * n_skills)
+            else:
+                gamma_samples = [-math.log(random.random()) for _ in range(n_skills)]
+                gamma_sum = sum(gamma_samples)
+                if gamma_sum == 0:
+                    continue
+                dirichlet_sample = [g / gamma_sum for g in gamma_samples]
+            
+            # Map to local bounds
+            local_sample = []
+            for i, (min_val, max_val) in enumerate(local_bounds):
+                if max_val > min_val:
+                    # Map [0,1] to [min_val, max_val]
+                    local_val = min_val + dirichlet_sample[i] * (max_val - min_val)
+                else:
+                    local_val = min_val
+                local_sample.append(int(round(local_val)))
+            
+            # Normalize to ensure sum = n_points
+            current_sum = sum(local_sample)
+            if current_sum != n_points:
+                diff = n_points - current_sum
+                # Distribute difference while respecting bounds
+                if diff > 0:
+                    # Add points
+                    for _ in range(diff):
+                        idx = random.randint(0, n_skills - 1)
+                        if local_sample[idx] < local_bounds[idx][1]:
+                            local_sample[idx] += 1
+                else:
+                    # Remove points
+                    for _ in range(-diff):
+                        idx = random.randint(0, n_skills - 1)
+                        if local_sample[idx] > local_bounds[idx][0]:
+                            local_sample[idx] -= 1
+            
+            # Check STR requirement
+            if require_str:
+                total_str = original_str + local_sample[str_idx]
+                if total_str == 0:
+                    continue
+            
+            # Verify sum and bounds
+            if sum(local_sample) == n_points:
+                # Check all values are within bounds
+                valid = all(
+                    local_bounds[i][0] <= local_sample[i] <= local_bounds[i][1]
+                    for i in range(n_skills)
+                )
+                if valid:
+                    samples_generated += 1
+                    yield tuple(local_sample)
+
+
+def _card_block_hp(block_hp, card_level, polychrome_bonus):
+    """Block HP after the card reduction for `card_level` (0 = no card)."""
+    if card_level == 1:
+        return int(block_hp * 0.90)
+    elif card_level == 2:
+        return int(block_hp * 0.80)
+    elif card_level == 3:
+        # Polychrome: -35% base. Stage 34 upgrade adds +15% → -50% total
+        hp_reduce = 0.35 + polychrome_bonus  # 0.35 + 0.15 = 0.50
+        return int(block_hp * (1.0 - hp_reduce))
+    return block_hp
+
+
+def _card_xp_multiplier(card_level, polychrome_bonus):
+    """Block XP multiplier from the card at `card_level` (0 = no card)."""
+    if card_level == 1:
+        return 1.10
+    elif card_level == 2:
+        return 1.20
+    elif card_level == 3:
+        # Polychrome: +35% base. Stage 34 upgrade adds +15% → +50% total
+        xp_bonus = 0.35 + polychrome_bonus  # 0.35 + 0.15 = 0.50
+        return 1.0 + xp_bonus
+    return 1.0
+
+
+@dataclass(frozen=True)
+class BuildSnapshot:
+    """
+    Derived constants of one build, computed once by `compile_build_snapshot`.
+
+    The analytic calculators need the same handful of numbers for every block on
+    every floor (enrage share, crit factors, card levels, stamina refunds).
+    Deriving them from the calculator object per block re-reads fragment
+    upgrades, toggles and cards each time; a snapshot freezes them up front and
+    caches expected hits per block and per floor.
+    A snapshot is only valid for the stats/toggles/cards it was compiled from.
+    """
+    max_stamina: float
+    total_damage: float
+    armor_pen: float
+    one_hit_chance: float
+    # Expected damage factor per hit from crits/super/ultra crits
+    crit_factor: float
+    # Enrage share of hits and its boosted damage/crit factor
+    enrage_active: bool
+    enrage_proportion: float
+    enrage_total_damage: int
+    enrage_crit_factor: float
+    # Stamina refunded per block (stamina mod + flurry per hit)
+    stamina_per_block: float
+    # Card levels per (block_type, tier) and the polychrome upgrade bonus
+    block_cards: Dict[Tuple[str, int], int]
+    polychrome_bonus: float
+    # XP / fragment multipliers
+    xp_mult: float
+    arch_xp_mult: float
+    exp_mod_factor: float
+    fragment_mult: float
+    loot_mod_factor: float
+    slots_per_floor: int
+    # Run duration inputs
+    stamina_mod_chance: float
+    duration_stamina_mod_gain: float
+    flurry_active: bool
+    flurry_cooldown: int
+    flurry_stamina: float
+    speed_mod_chance: float
+    speed_mod_hits_avg: float
+    # Expected hits per (block_type, tier) and per floor (filled lazily, not part of the identity)
+    _block_hits: Dict[Tuple[str, int], float] = field(default_factory=dict, compare=False, repr=False)
+    _floor_hits: Dict[int, float] = field(default_factory=dict, compare=False, repr=False)
+    _floor_yield: Dict[int, tuple] = field(default_factory=dict, compare=False, repr=False)
+
+    def hits_to_kill(self, block_hp, block_armor) -> float:
+        """Expected hits for an already card-adjusted block (see calculate_hits_to_kill)."""
+        effective_armor = max(0, block_armor - self.armor_pen)
+        avg_dmg_per_hit = max(1, int(self.total_damage - effective_armor)) * self.crit_factor
+        if self.enrage_active:
+            effective_dmg_enrage = max(1, self.enrage_total_damage - effective_armor)
+            avg_dmg_per_hit = ((1.0 - self.enrage_proportion) * avg_dmg_per_hit +
+                               self.enrage_proportion * (effective_dmg_enrage * self.enrage_crit_factor))
+        hits = block_hp / avg_dmg_per_hit
+        if self.one_hit_chance > 0:
+            return min(1 / self.one_hit_chance, hits)
+        return hits
+
+    def avg_hits_per_block(self, floor: int) -> float:
+        """Spawn-weighted expected hits per block on `floor` (cached per floor)."""
+        cached = self._floor_hits.get(floor)
+        if cached is not None:
+            return cached
+        block_mix = get_block_mix_for_floor(floor)
+        avg_hits = 0
+        for block_type, spawn_chance in get_normalized_spawn_rates(floor).items():
+            if spawn_chance <= 0:
+                continue
+            block_data = block_mix.get(block_type)
+            if not block_data:
+                continue
+            key = (block_type, block_data.tier)
+            hits = self._block_hits.get(key)
+            if hits is None:
+                block_hp = _card_block_hp(block_data.health, self.block_cards.get(key, 0), self.polychrome_bonus)
+                hits = self._block_hits[key] = self.hits_to_kill(block_hp, block_data.armor)
+            avg_hits += spawn_chance * hits
+        self._floor_hits[floor] = avg_hits
+        return avg_hits
+
+    def floor_yield(self, floor: int):
+        """
+        XP and fragments for fully clearing `floor` (cached per floor).
+        
+        Returns (xp, ((fragment_type, fragments), ...)); dirt drops no fragments.
+        """
+        cached = self._floor_yield.get(floor)
+        if cached is not None:
+            return cached
+        block_mix = get_block_mix_for_floor(floor)
+        # Expected blocks per floor: 24 slots * (total spawn probability / 100)
+        expected_blocks = self.slots_per_floor * (get_total_spawn_probability(floor) / 100.0)
+        floor_xp = 0.0
+        fragments = []
+        for block_type, spawn_chance in get_normalized_spawn_rates(floor).items():
+            if spawn_chance <= 0:
+                continue
+            block_data = block_mix.get(block_type)
+            if not block_data:
+                continue
+            # Block base XP with card XP bonus, weighted by spawn chance
+            floor_xp += spawn_chance * (block_data.xp * self.xp_multiplier(block_type, block_data.tier))
+            if block_type != 'dirt':
+                # expected_blocks * spawn_chance * base_frag * mult * loot_mod
+                fragments.append((block_type, expected_blocks * spawn_chance * block_data.fragment
+                                  * self.fragment_mult * self.loot_mod_factor))
+        # XP for this floor: expected_blocks * avg_xp * xp_mult * arch_xp_mult * exp_mod_factor
+        floor_total_xp = expected_blocks * floor_xp * self.xp_mult * self.arch_xp_mult * self.exp_mod_factor
+        cached = self._floor_yield[floor] = (floor_total_xp, tuple(fragments))
+        return cached
+
+    def xp_multiplier(self, block_type, tier) -> float:
+        """Card XP multiplier for a block (see get_block_xp_multiplier)."""
+        return _card_xp_multiplier(self.block_cards.get((block_type, tier), 0), self.polychrome_bonus)
+
+
+class ArchaeologyCalculator:
+    """
+    Archaeology build state and the math on top of it.
+    
+    Holds skill points, upgrades and cards (see reset_to_level1) and computes
+    stats and per-run expectations from them. Subclasses provide the ability
+    toggles (`enrage_enabled`, `flurry_enabled`, ... with a `.get()` API).
+    """
+    
+    # Skill bonuses per point
+    SKILL_BONUSES = {
+        'strength': {
+            'flat_damage': 1,
+            'percent_damage': 0.01,
+            'crit_damage': 0.03,
+        },
+        'agility': {
+            'max_stamina': 5,
+            'crit_chance': 0.01,
+            'speed_mod_chance': 0.002,
+        },
+        'perception': {
+            'fragment_gain': 0.04,
+            'loot_mod_chance': 0.003,
+            'armor_pen': 2,
+        },
+        'intellect': {
+            'xp_bonus': 0.05,
+            'exp_mod_chance': 0.003,
+            'armor_pen_mult': 0.03,  # +3% armor pen multiplier per point
+        },
+        'luck': {
+            'crit_chance': 0.02,
+            'all_mod_chance': 0.002,
+            'one_hit_chance': 0.0004,
+        },
+    }
+    
+    # Enrage ability constants
+    # 5 charges every 60 seconds, +20% damage, +100% crit damage for those hits
+    ENRAGE_CHARGES = 5
+    ENRAGE_COOLDOWN = 60  # seconds
+    ENRAGE_DAMAGE_BONUS = 0.20  # +20%
+    ENRAGE_CRIT_DAMAGE_BONUS = 1.00  # +100% crit damage (additive)
+
+    # Super/Ultra crit damage multipliers (Archaeology)
+    #
+    # These are separate multipliers applied on top of the regular crit damage
+    # multiplier when a crit procs:
+    # - Super crit: 2.0x (default)
+    # - Ultra crit: 3.0x (default)
+    SUPER_CRIT_DMG_MULT_DEFAULT = 2.0
+    ULTRA_CRIT_DMG_MULT_DEFAULT = 3.0
+    
+    # Flurry ability constants
+    # +100% attack speed (QoL), +5 stamina on cast, 120s cooldown
+    FLURRY_COOLDOWN = 120  # seconds
+    FLURRY_STAMINA_BONUS = 5  # +5 stamina on cast (one time per activation)
+    
+    # Quake ability constants
+    # 5 charges every 180 seconds, next 5 attacks deal 20% damage to all blocks
+    QUAKE_CHARGES = 5
+    QUAKE_COOLDOWN = 180  # seconds
+    QUAKE_DAMAGE_MULTIPLIER = 0.20  # 20% damage to all blocks
+    
+    # Mod effects (applied per block when triggered)
+    # Based on the in-game stats panel, these appear to be fixed base values:
+    # - Exp Mod Gain: 3x XP
+    # - Loot Mod Gain: 2x Fragments
+    # - Speed Mod Gain: +10 hits at 2x attack rate (QoL only)
+    # - Stamina Mod Gain: +3 Stamina
+    MOD_EXP_MULTIPLIER_AVG = 3.0
+    MOD_LOOT_MULTIPLIER_AVG = 2.0
+    MOD_SPEED_ATTACKS_AVG = 10.0
+    MOD_STAMINA_BONUS_AVG = 3.0
+    
+    # Gem Upgrade bonuses per level (purchased with Gems, N/A = always unlocked)
+    GEM_UPGRADE_BONUSES = {
+        'stamina': {
+            'max_stamina': 2,
+            'stamina_mod_chance': 0.0005,  # +0.05%
+            'max_level': 50,
+            'stage_unlock': 0,  # N/A - always unlocked
+        },
+        'xp': {
+            'xp_bonus': 0.05,  # +5%
+            'exp_mod_chance': 0.0005,  # +0.05%
+            'max_level': 25,
+            'stage_unlock': 0,  # N/A - always unlocked
+        },
+        'fragment': {
+            'fragment_gain': 0.02,  # +2%
+            'loot_mod_chance': 0.0005,  # +0.05%
+            'max_level': 25,
+            'stage_unlock': 0,  # N/A - always unlocked
+        },
+        'arch_xp': {
+            'arch_xp_bonus': 0.02,  # +2% Archaeology Exp
+            'max_level': 25,
+            'stage_unlock': 3,  # Unlocks at stage 3
+        },
+    }
+    
+    # Fragment upgrades with Stage to Unlock
+    # Format: upgrade_key -> {bonuses, max_level, stage_unlock, cost_type, display_name}
+    # cost_type: 'common', 'rare', 'epic', 'legendary', 'mythic'
+    FRAGMENT_UPGRADES = {
+        # Common Fragment Upgrades (gray)
+        'flat_damage_c1': {
+            'flat_damage': 1,
+            'max_level': 25,
+            'stage_unlock': 0,  # N/A
+            'cost_type': 'common',
+            'display_name': 'Flat Dmg +1',
+        },
+        'armor_pen_c1': {
+            'armor_pen': 1,
+            'max_level': 25,
+            'stage_unlock': 2,
+            'cost_type': 'common',
+            'display_name': 'Armor Pen +1',
+        },
+        'arch_xp_c1': {
+            'arch_xp_bonus': 0.02,  # +2%
+            'max_level': 25,
+            'stage_unlock': 3,
+            'cost_type': 'common',
+            'display_name': 'Exp Gain +2%',
+        },
+        'crit_c1': {
+            'crit_chance': 0.0025,  # +0.25%
+            'crit_damage': 0.01,  # +1%
+            'max_level': 25,
+            'stage_unlock': 4,
+            'cost_type': 'common',
+            'display_name': 'Crit +0.25%/+1%',
+        },
+        'str_skill_buff': {
+            'flat_damage_skill': 0.2,  # +0.2 flat dmg from skill
+            'percent_damage_skill': 0.001,  # +0.1% dmg from skill
+            'max_level': 5,
+            'stage_unlock': 13,
+            'cost_type': 'common',
+            'display_name': 'STR Buff',
+        },
+        'polychrome_bonus': {
+            'polychrome_bonus': 0.15,  # +15%
+            'max_level': 1,
+            'stage_unlock': 34,
+            'cost_type': 'common',
+            'display_name': 'Polychrome +15%',
+        },
+        
+        # Rare Fragment Upgrades (blue)
+        'stamina_r1': {
+            'max_stamina': 2,
+            'stamina_mod_chance': 0.0005,  # +0.05%
+            'max_level': 20,
+            'stage_unlock': 5,
+            'cost_type': 'rare',
+            'display_name': 'Stam +2/+0.05%',
+        },
+        'flat_damage_r1': {
+            'flat_damage': 2,
+            'max_level': 20,
+            'stage_unlock': 6,
+            'cost_type': 'rare',
+            'display_name': 'Flat Dmg +2',
+        },
+        'loot_mod_mult': {
+            'loot_mod_multiplier': 0.30,  # +0.30x
+            'max_level': 10,
+            'stage_unlock': 6,
+            'cost_type': 'rare',
+            'display_name': 'Loot Mod +0.3x',
+        },
+        'enrage_buff': {
+            'enrage_damage': 0.02,  # +2%
+            'enrage_crit_damage': 0.02,  # +2%
+            'enrage_cooldown': -1,  # -1s
+            'max_level': 15,
+            'stage_unlock': 7,
+            'cost_type': 'rare',
+            'display_name': 'Enrage Buff',
+        },
+        'agi_skill_buff': {
+            'max_stamina_skill': 1,
+            'mod_chance_skill': 0.0002,  # +0.02%
+            'max_level': 5,
+            'stage_unlock': 15,
+            'cost_type': 'rare',
+            'display_name': 'AGI Buff',
+        },
+        'per_skill_buff': {
+            'mod_chance_skill': 0.0001,  # +0.01%
+            'armor_pen_skill': 1,
+            'max_level': 5,
+            'stage_unlock': 22,
+            'cost_type': 'rare',
+            'display_name': 'PER Buff',
+        },
+        'fragment_gain_1x': {
+            'fragment_gain_mult': 1.25,  # 1.25x
+            'max_level': 1,
+            'stage_unlock': 36,
+            'cost_type': 'rare',
+            'display_name': 'Frag Gain 1.25x',
+        },
+        
+        # Epic Fragment Upgrades (purple)
+        'flat_damage_e1': {
+            'flat_damage': 2,
+            'super_crit_chance': 0.0035,  # +0.35%
+            'max_level': 25,
+            'stage_unlock': 9,
+            'cost_type': 'epic',
+            'display_name': 'Dmg +2/SCrit +0.35%',
+        },
+        'arch_xp_frag_e1': {
+            'arch_xp_bonus': 0.03,  # +3%
+            'fragment_gain': 0.02,  # +2%
+            'max_level': 20,
+            'stage_unlock': 10,
+            'cost_type': 'epic',
+            'display_name': 'Exp +3%/Frag +2%',
+        },
+        'flurry_buff': {
+            'flurry_stamina': 1,
+            'flurry_cooldown': -1,  # -1s
+            'max_level': 10,
+            'stage_unlock': 11,
+            'cost_type': 'epic',
+            'display_name': 'Flurry Buff',
+        },
+        'stamina_e1': {
+            'max_stamina': 4,
+            'stamina_mod_gain': 1,
+            'max_level': 5,
+            'stage_unlock': 12,
+            'cost_type': 'epic',
+            'display_name': 'Stam +4/+1 Mod',
+        },
+        'int_skill_buff': {
+            'xp_bonus_skill': 0.01,  # +1%
+            'mod_chance_skill': 0.0001,  # +0.01%
+            'max_level': 5,
+            'stage_unlock': 24,
+            'cost_type': 'epic',
+            'display_name': 'INT Buff',
+        },
+        'stamina_mod_gain_1': {
+            'stamina_mod_gain': 2,
+            'max_level': 1,
+            'stage_unlock': 38,
+            'cost_type': 'epic',
+            'display_name': 'Stam Mod +2',
+        },
+        
+        # Legendary Fragment Upgrades (gold)
+        'arch_xp_stam_l1': {
+            'arch_xp_bonus': 0.05,  # +5%
+            'max_stamina_percent': 0.01,  # +1%
+            'max_level': 15,
+            'stage_unlock': 17,
+            'cost_type': 'legendary',
+            'display_name': 'Exp +5%/Stam +1%',
+        },
+        'armor_pen_cd_l1': {
+            'armor_pen_percent': 0.02,  # +2%
+            'ability_cooldown': -1,  # -1s
+            'max_level': 10,
+            'stage_unlock': 18,
+            'cost_type': 'legendary',
+            'display_name': 'APen +2%/CD -1s',
+        },
+        'crit_dmg_l1': {
+            'crit_damage': 0.02,  # +2%
+            'super_crit_damage': 0.02,  # +2%
+            'max_level': 20,
+            'stage_unlock': 20,
+            'cost_type': 'legendary',
+            'display_name': 'Crit Dmg +2%/+2%',
+        },
+        'quake_buff': {
+            'quake_attacks': 1,
+            'quake_cooldown': -2,  # -2s
+            'max_level': 10,
+            'stage_unlock': 20,
+            'cost_type': 'legendary',
+            'display_name': 'Quake Buff',
+        },
+        'all_mod_chance': {
+            'all_mod_chance': 0.015,  # +1.50%
+            'max_level': 1,
+            'stage_unlock': 40,
+            'cost_type': 'legendary',
+            'display_name': 'All Mod +1.5%',
+        },
+        
+        # Mythic Fragment Upgrades (orange/red)
+        'damage_apen_m1': {
+            'percent_damage': 0.02,  # +2%
+            'armor_pen': 3,
+            'max_level': 20,
+            'stage_unlock': 26,
+            'cost_type': 'mythic',
+            'display_name': 'Dmg +2%/APen +3',
+        },
+        'crit_chance_m1': {
+            'super_crit_chance': 0.0035,  # +0.35%
+            'ultra_crit_chance': 0.01,  # +1%
+            'max_level': 20,
+            'stage_unlock': 28,
+            'cost_type': 'mythic',
+            'display_name': 'S/U Crit +0.35%/+1%',
+        },
+        'exp_mod_m1': {
+            'exp_mod_gain': 0.10,  # +0.10x
+            'exp_mod_chance': 0.001,  # +0.10%
+            'max_level': 20,
+            'stage_unlock': 30,
+            'cost_type': 'mythic',
+            'display_name': 'Exp Mod +0.1x/+0.1%',
+        },
+        'ability_stam_m1': {
+            'ability_instacharge': 0.003,  # +0.30%
+            'max_stamina': 4,
+            'max_level': 20,
+            'stage_unlock': 32,
+            'cost_type': 'mythic',
+            'display_name': 'Insta +0.3%/Stam +4',
+        },
+        'exp_stat_cap_m1': {
+            'xp_bonus_mult': 2.0,  # 2.00x
+            'all_stat_cap': 5,
+            'max_level': 1,
+            'stage_unlock': 42,
+            'cost_type': 'mythic',
+            'display_name': 'Exp 2x/Caps +5',
+        },
+    }
+    
+    # Gem costs per level for each upgrade type
+    GEM_COSTS = {
+        'stamina': [
+            300, 315, 330, 347, 364, 382, 402, 422, 443, 465,  # 1-10
+            488, 513, 538, 565, 593, 623, 654, 687, 721, 758,  # 11-20
+            795, 835, 877, 921, 967, 1000, 1000, 1000, 1000, 1000,  # 21-30
+            1000, 1000, 1000, 1000, 1000, 1000, 1000, 1000, 1000, 1000,  # 31-40
+            1000, 1000, 1000, 1000, 1000, 1000, 1000, 1000, 1000, 1000,  # 41-50
+        ],
+        'xp': [
+            400, 420, 441, 463, 486, 510, 536, 562, 590, 620,  # 1-10
+            651, 684, 718, 754, 791, 831, 873, 916, 962, 1000,  # 11-20
+            1000, 1000, 1000, 1000, 1000,  # 21-25
+        ],
+        'fragment': [
+            500, 525, 551, 578, 607, 638, 670, 703, 738, 775,  # 1-10
+            814, 855, 897, 942, 989, 1000, 1000, 1000, 1000, 1000,  # 11-20
+            1000, 1000, 1000, 1000, 1000,  # 21-25
+        ],
+        # Archaeology Exp Gain +2% per level (Common currency, not Gems)
+        # Costs: 1.00, 1.20, 1.44, 1.73, 2.07, 2.49, 2.99, 3.58, 4.30, 5.16,
+        #        6.19, 7.43, 8.92, 10.70, 12.84, 15.41, 18.49, 22.19, 26.62, 31.95,
+        #        38.34, 46.01, 55.21, 66.25, 79.50
+        'arch_xp': [
+            1.00, 1.20, 1.44, 1.73, 2.07, 2.49, 2.99, 3.58, 4.30, 5.16,  # 1-10
+            6.19, 7.43, 8.92, 10.70, 12.84, 15.41, 18.49, 22.19, 26.62, 31.95,  # 11-20
+            38.34, 46.01, 55.21, 66.25, 79.50,  # 21-25
+        ],
+    }
+    
+    # Game constants
+    # Stage structure: 6 columns x 4 rows = 24 slots
+    # Each slot CAN spawn a block (but doesn't have to)
+    # Blocks per floor varies between 0-24 based on spawn probabilities
+    SLOTS_PER_FLOOR = 24
+    BLOCKS_PER_FLOOR_MIN = 0
+    BLOCKS_PER_FLOOR_MAX = 24
+    BLOCKS_PER_FLOOR = 19.0  # Average for calculations (realistic estimate, will be calculated dynamically)
+    
+    def reset_stats_only(self):
+        """Reset only stats (skill points, level, stage) but keep upgrades (fragment_upgrade_levels, gem_upgrades)"""
+        self.level = 1
+        self.current_stage = 1
+        self.unlocked_stage = 1
+        self.skill_points = {
+            'strength': 0, 'agility': 0, 'perception': 0, 'intellect': 0, 'luck': 0,
+        }
+        self.base_damage = 10
+        self.base_armor_pen = 0
+        self.base_stamina = 100
+        self.base_crit_chance = 0.0
+        self.base_crit_damage = 1.5
+        self.base_xp_mult = 1.0
+        self.base_fragment_mult = 1.0
+        # Note: fragment_upgrade_levels and gem_upgrades are NOT reset
+    
+    def reset_to_level1(self):
+        self.level = 1
+        self.current_stage = 1
+        self.unlocked_stage = 1
+        self.skill_points = {
+            'strength': 0, 'agility': 0, 'perception': 0, 'intellect': 0, 'luck': 0,
+        }
+        self.base_damage = 10
+        self.base_armor_pen = 0
+        self.base_stamina = 100
+        self.base_crit_chance = 0.0
+        self.base_crit_damage = 1.5
+        self.base_xp_mult = 1.0
+        self.base_fragment_mult = 1.0
+        # Gem upgrades
+        self.gem_upgrades = {
+            'stamina': 0,
+            'xp': 0,
+            'fragment': 0,
+            'arch_xp': 0,
+        }
+        # Fragment upgrades (new system)
+        self.fragment_upgrade_levels = {}
+        # Block cards: separate cards for each tier (T1, T2, T3) per block type
+        # Format: (block_type, tier) -> card_level (0 = none, 1 = normal, 2 = gilded, 3 = polychrome)
+        # Card: -10% HP, +10% XP; Gilded: -20% HP, +20% XP; Polychrome: -35% HP, +35% XP
+        self.block_cards = {}
+        # Initialize all combinations
+        for block_type in BLOCK_TYPES:
+            for tier in [1, 2, 3]:
+                if get_block_data(tier, block_type):  # Only if this tier exists for this block type
+                    self.block_cards[(block_type, tier)] = 0
+        
+        # Misc card: 0 = none, 1 = normal card, 2 = gilded card, 3 = polychrome card
+        # Reduces ability cooldowns: Normal = -3%, Gilded = -6%, Polychrome = -10%
+        self.misc_card_level = 0
+    
+    def _get_calculation_stage(self):
+        """
+        Get the stage used for calculations.
+        
+        When user enters Goal Stage N, we use Stage N-1 for calculations
+        (to optimize for beating Stage N-1 to reach Stage N).
+        Minimum is 1.
+        
+        Returns:
+            int: Stage number to use for block stats and spawn rates
+        """
+        return max(1, self.current_stage - 1)
+    
+    def get_total_stats(self):
+        """
+        Calculate total character stats from skills, upgrades, and fragments.
+        
+        MULTIPLICATOR REGELN (Archaeology):
+        ===================================
+        
+        MULTIPLIKATIV (Multiplikator auf Basis):
+        - INT Armor Pen: Basis wird zuerst gerundet, dann mit (1 + INT * 0.03) multipliziert
+        - Crit Damage: Basis 1.5 * (1 + STR*0.03 + Fragment %) — STR und Fragment ADDITIV im gleichen Mult
+        - INT XP Gain: (Base + Gem + Fragment Upgrades) * (1 + INT * 0.05)
+        - Fragment XP Multiplier: Wenn vorhanden, multipliziert XP Base
+        
+        ADDITIV (Werte werden addiert):
+        - Flat Damage: Base + STR * 1 + Upgrades
+        - Percent Damage: STR * 0.01 + Upgrades (dann multipliziert mit Flat)
+        - Armor Pen Base: Base + PER * 2 + Upgrades (vor INT Multiplikator)
+        - Max Stamina: Base + AGI * 5 + Upgrades
+        - Crit Chance: Base + AGI * 0.01 + LUC * 0.02 + Upgrades
+        - Fragment Gain: Base + PER * 0.04 + Gem + Upgrades
+        - Mod Chances: Alle additiv
+        
+        WICHTIG:
+        - Armor Pen wird ZUERST gerundet, DANN mit INT multipliziert
+        - Crit Damage: STR-% und Fragment-% addieren im gleichen Mult (nicht nacheinander multiplizieren)
+        - INT XP Gain multipliziert die gesamte XP Base (inkl. Upgrades)
+        """
+        str_pts = self.skill_points['strength']
+        agi_pts = self.skill_points['agility']
+        int_pts = self.skill_points['intellect']
+        per_pts = self.skill_points['perception']
+        luck_pts = self.skill_points['luck']
+        
+        # Gem upgrade levels
+        gem_stamina = self.gem_upgrades.get('stamina', 0)
+        gem_xp = self.gem_upgrades.get('xp', 0)
+        gem_fragment = self.gem_upgrades.get('fragment', 0)
+        gem_arch_xp = self.gem_upgrades.get('arch_xp', 0)
+        
+        # Collect all bonuses from fragment upgrades
+        frag_bonuses = self._get_fragment_upgrade_bonuses()
+        
+        # Base flat damage from skills (with possible skill buff from fragment upgrades)
+        flat_damage_per_str = self.SKILL_BONUSES['strength']['flat_damage'] + frag_bonuses.get('flat_damage_skill', 0)
+        percent_damage_per_str = self.SKILL_BONUSES['strength']['percent_damage'] + frag_bonuses.get('percent_damage_skill', 0)
+        
+        flat_damage = (self.base_damage + 
+                      str_pts * flat_damage_per_str +
+                      frag_bonuses.get('flat_damage', 0))
+        percent_damage_bonus = str_pts * percent_damage_per_str + frag_bonuses.get('percent_damage', 0)
+        # Block Bonker: +1% damage per highest stage (capped at 100)
+        block_bonker = self._get_block_bonker_bonus()
+        percent_damage_bonus += block_bonker['damage_percent']
+        # Damage is always integer (floored) - no decimal damage in game
+        total_damage = int(flat_damage * (1 + percent_damage_bonus))
+        
+        # Armor pen from skills (with possible skill buff)
+        armor_pen_per_per = self.SKILL_BONUSES['perception']['armor_pen'] + frag_bonuses.get('armor_pen_skill', 0)
+        armor_pen_base = (self.base_armor_pen + 
+                    per_pts * armor_pen_per_per +
+                    frag_bonuses.get('armor_pen', 0))
+        # Apply percent armor pen bonus from fragment upgrades
+        armor_pen_base = armor_pen_base * (1 + frag_bonuses.get('armor_pen_percent', 0))
+        # Round base armor pen to integer first (as game does)
+        armor_pen_base = round(armor_pen_base)
+        # INT gives +3% armor pen multiplier per point (applied to rounded base)
+        int_armor_pen_mult = 1 + int_pts * self.SKILL_BONUSES['intellect']['armor_pen_mult']
+        armor_pen = round(armor_pen_base * int_armor_pen_mult)
+        
+        # Max stamina: base + agility + gem upgrade + fragment upgrades
+        max_stamina_per_agi = self.SKILL_BONUSES['agility']['max_stamina'] + frag_bonuses.get('max_stamina_skill', 0)
+        max_stamina = (self.base_stamina + 
+                      agi_pts * max_stamina_per_agi +
+                      gem_stamina * self.GEM_UPGRADE_BONUSES['stamina']['max_stamina'] +
+                      frag_bonuses.get('max_stamina', 0))
+        # Apply percent stamina bonus (fragment upgrades + Block Bonker)
+        max_stamina = int(max_stamina * (1 + frag_bonuses.get('max_stamina_percent', 0) + block_bonker['max_stamina_percent']))
+        
+        crit_chance = (self.base_crit_chance + 
+                      agi_pts * self.SKILL_BONUSES['agility']['crit_chance'] +
+                      luck_pts * self.SKILL_BONUSES['luck']['crit_chance'] +
+                      frag_bonuses.get('crit_chance', 0))
+        # STR crit damage (+3%/pt) and fragment crit damage (+1% or +2%/lvl) ADD in one multiplier (ingame)
+        # e.g. STR 5 + crit_c1 lv9: 1.5 * (1 + 0.15 + 0.09) = 1.86x (not 1.5*1.15*1.09 = 1.88x)
+        total_crit_mult = 1 + str_pts * self.SKILL_BONUSES['strength']['crit_damage'] + frag_bonuses.get('crit_damage', 0)
+        crit_damage = self.base_crit_damage * total_crit_mult
+        one_hit_chance = luck_pts * self.SKILL_BONUSES['luck']['one_hit_chance']
+        
+        # Super crit and ultra crit from fragment upgrades
+        super_crit_chance = frag_bonuses.get('super_crit_chance', 0)
+        super_crit_damage = frag_bonuses.get('super_crit_damage', 0)
+        ultra_crit_chance = frag_bonuses.get('ultra_crit_chance', 0)
+
+        # Crit-type damage multipliers (shown as x multipliers in the stats panel)
+        # Fragment "Super Crit Damage" acts as a % bonus applied to both multipliers.
+        super_crit_dmg_mult = self.SUPER_CRIT_DMG_MULT_DEFAULT * (1.0 + super_crit_damage)
+        ultra_crit_dmg_mult = self.ULTRA_CRIT_DMG_MULT_DEFAULT * (1.0 + super_crit_damage)
+        
+        # XP mult: base + gem upgrade + fragment upgrades (additive)
+        xp_mult_base = (self.base_xp_mult + 
+                       gem_xp * self.GEM_UPGRADE_BONUSES['xp']['xp_bonus'])
+        # Apply XP multiplier from fragment upgrades
+        if frag_bonuses.get('xp_bonus_mult', 0) > 0:
+            xp_mult_base *= frag_bonuses.get('xp_bonus_mult', 1.0)
+        # INT gives +5% XP multiplier per point (multiplicative on base)
+        xp_bonus_per_int = self.SKILL_BONUSES['intellect']['xp_bonus'] + frag_bonuses.get('xp_bonus_skill', 0)
+        xp_mult = xp_mult_base * (1 + int_pts * xp_bonus_per_int)
+        
+        # Fragment mult: base + perception + gem upgrade + fragment upgrades
+        fragment_mult = (self.base_fragment_mult + 
+                        per_pts * self.SKILL_BONUSES['perception']['fragment_gain'] +
+                        gem_fragment * self.GEM_UPGRADE_BONUSES['fragment']['fragment_gain'] +
+                        frag_bonuses.get('fragment_gain', 0))
+        # Apply fragment gain multiplier
+        if frag_bonuses.get('fragment_gain_mult', 0) > 0:
+            fragment_mult *= frag_bonuses.get('fragment_gain_mult', 1.0)
+        
+        # Mod chances (per block)
+        # Luck adds to ALL mod chances
+        all_mod_bonus = (luck_pts * self.SKILL_BONUSES['luck']['all_mod_chance'] + 
+                        frag_bonuses.get('all_mod_chance', 0))
+        # Skill buff adds to all mod chances
+        mod_chance_skill_bonus = frag_bonuses.get('mod_chance_skill', 0)
+        
+        # Exp mod: intellect + luck + gem upgrade + fragment upgrades
+        exp_mod_chance = (int_pts * self.SKILL_BONUSES['intellect']['exp_mod_chance'] + 
+                         all_mod_bonus + mod_chance_skill_bonus +
+                         gem_xp * self.GEM_UPGRADE_BONUSES['xp']['exp_mod_chance'] +
+                         frag_bonuses.get('exp_mod_chance', 0))
+        
+        # Loot mod: perception + luck + gem upgrade
+        loot_mod_chance = (per_pts * self.SKILL_BONUSES['perception']['loot_mod_chance'] + 
+                          all_mod_bonus + mod_chance_skill_bonus +
+                          gem_fragment * self.GEM_UPGRADE_BONUSES['fragment']['loot_mod_chance'])
+        
+        speed_mod_chance = agi_pts * self.SKILL_BONUSES['agility']['speed_mod_chance'] + all_mod_bonus + mod_chance_skill_bonus
+        
+        # Stamina mod: luck + gem upgrade + fragment upgrades
+        stamina_mod_chance = (all_mod_bonus + mod_chance_skill_bonus +
+                             gem_stamina * self.GEM_UPGRADE_BONUSES['stamina']['stamina_mod_chance'] +
+                             frag_bonuses.get('stamina_mod_chance', 0))
+        
+        # Archaeology XP bonus from gem upgrade + fragment upgrades (multiplicative)
+        # Each level gives +2%, so level 6 = 1.0 * 1.02^6 or additive: 1.0 + 6*0.02 = 1.12
+        arch_xp_bonus_total = gem_arch_xp * self.GEM_UPGRADE_BONUSES['arch_xp']['arch_xp_bonus'] + frag_bonuses.get('arch_xp_bonus', 0)
+        arch_xp_mult = 1.0 + arch_xp_bonus_total
+        
+        # Loot mod multiplier bonus (affects average loot from loot mod)
+        loot_mod_multiplier = self.MOD_LOOT_MULTIPLIER_AVG + frag_bonuses.get('loot_mod_multiplier', 0)
+        
+        # Exp mod gain bonus (affects average XP from exp mod)
+        exp_mod_gain = self.MOD_EXP_MULTIPLIER_AVG + frag_bonuses.get('exp_mod_gain', 0)
+        
+        # Stamina mod gain bonus
+        stamina_mod_gain = self.MOD_STAMINA_BONUS_AVG + frag_bonuses.get('stamina_mod_gain', 0)
+        
+        # Block Bonker: +1 speed_mod_gain per highest stage (capped at 100)
+        # Note: speed_mod_gain affects the number of attacks during speed mod (not chance)
+        # This is stored separately and used in calculations
+        
+        # Enrage bonuses from fragment upgrades (additive to base enrage bonuses)
+        enrage_damage_bonus = self.ENRAGE_DAMAGE_BONUS + frag_bonuses.get('enrage_damage', 0)
+        enrage_crit_damage_bonus = self.ENRAGE_CRIT_DAMAGE_BONUS + frag_bonuses.get('enrage_crit_damage', 0)
+        
+        # Quake charges from fragment upgrades (base 5 + quake_attacks per level) + Avada Keda
+        avada_keda = self._get_avada_keda_bonus()
+        quake_charges = self.QUAKE_CHARGES + frag_bonuses.get('quake_attacks', 0) + avada_keda['duration_bonus']
+        
+        # Ability instacharge chance from fragment upgrades + Avada Keda
+        ability_instacharge = frag_bonuses.get('ability_instacharge', 0) + avada_keda['instacharge_bonus']
+        
+        return {
+            'flat_damage': flat_damage,
+            'total_damage': total_damage,
+            'armor_pen': armor_pen,
+            'max_stamina': max_stamina,
+            'crit_chance': min(1.0, crit_chance),
+            'crit_damage': crit_damage,
+            'super_crit_chance': min(1.0, super_crit_chance),
+            'super_crit_damage': super_crit_damage,
+            'ultra_crit_chance': min(1.0, ultra_crit_chance),
+            'super_crit_dmg_mult': super_crit_dmg_mult,
+            'ultra_crit_dmg_mult': ultra_crit_dmg_mult,
+            'one_hit_chance': min(1.0, one_hit_chance),
+            'xp_mult': xp_mult,
+            'xp_gain_total': xp_mult * arch_xp_mult,  # combined for display (incl. Arch XP upgrades)
+            'fragment_mult': fragment_mult,
+            # Mod chances
+            'exp_mod_chance': min(1.0, exp_mod_chance),
+            'loot_mod_chance': min(1.0, loot_mod_chance),
+            'speed_mod_chance': min(1.0, speed_mod_chance),
+            'stamina_mod_chance': min(1.0, stamina_mod_chance),
+            # Mod effect bonuses
+            'loot_mod_multiplier': loot_mod_multiplier,
+            'exp_mod_gain': exp_mod_gain,
+            'stamina_mod_gain': stamina_mod_gain,
+            # Block Bonker: speed_mod_gain bonus (affects speed mod duration)
+            'speed_mod_gain': block_bonker['speed_mod_gain'],
+            # Archaeology XP multiplier (applies to leveling)
+            'arch_xp_mult': arch_xp_mult,
+            # Enrage bonuses (with fragment upgrades)
+            'enrage_damage_bonus': enrage_damage_bonus,
+            'enrage_crit_damage_bonus': enrage_crit_damage_bonus,
+            # Misc card level for ability cooldown reduction
+            'misc_card_level': getattr(self, 'misc_card_level', 0),
+            # Fragment upgrade cooldown reductions (for MC simulations) + Avada Keda
+            'enrage_cooldown': frag_bonuses.get('enrage_cooldown', 0),
+            'flurry_cooldown': frag_bonuses.get('flurry_cooldown', 0),
+            'quake_cooldown': frag_bonuses.get('quake_cooldown', 0),
+            'ability_cooldown': frag_bonuses.get('ability_cooldown', 0) + avada_keda['cooldown_reduction'],
+            # Avada Keda duration bonus (for MC simulations)
+            'avada_keda_duration_bonus': avada_keda['duration_bonus'],
+            # Flurry bonus stamina per activation (for MC simulations)
+            # Base stamina comes from FLURRY_STAMINA_BONUS in the simulator.
+            'flurry_stamina_bonus': frag_bonuses.get('flurry_stamina', 0) + avada_keda['duration_bonus'],
+            # Quake charges and ability instacharge
+            'quake_charges': quake_charges,
+            'ability_instacharge': ability_instacharge,
+        }
+    
+    def _get_fragment_upgrade_bonuses(self):
+        """Collect all bonuses from fragment upgrades into a single dict"""
+        bonuses = {}
+        
+        for upgrade_key, level in self.fragment_upgrade_levels.items():
+            if level <= 0:
+                continue
+            
+            upgrade_info = self.FRAGMENT_UPGRADES.get(upgrade_key, {})
+            
+            # Add each bonus type multiplied by level
+            for bonus_key, bonus_value in upgrade_info.items():
+                # Skip non-bonus keys
+                if bonus_key in ('max_level', 'stage_unlock', 'cost_type', 'display_name'):
+                    continue
+                
+                if bonus_key not in bonuses:
+                    bonuses[bonus_key] = 0
+                bonuses[bonus_key] += bonus_value * level
+        
+        return bonuses
+    
+    def calculate_effective_damage(self, stats, block_armor):
+        effective_armor = max(0, block_armor - stats['armor_pen'])
+        effective = max(1, int(stats['total_damage'] - effective_armor))
+        return effective
+    
+    def get_block_hp_with_card(self, block_hp, block_type, tier=None):
+        """Apply card HP reduction: Card = -10%, Gilded = -20%, Polychrome = -35% (+15% from upgrade → -50%)
+        Args:
+            block_hp: Base HP of the block
+            block_type: Type of block (dirt, common, rare, etc.)
+            tier: Tier of the block (1, 2, or 3). If None, uses tier from block_data if available.
+        """
+        if tier is None:
+            # Fallback: try to find any card for this block type (backward compatibility)
+            # This shouldn't happen in normal usage, but handle it gracefully
+            for t in [1, 2, 3]:
+                card_level = self.block_cards.get((block_type, t), 0)
+                if card_level > 0:
+                    break
+            else:
+                return block_hp
+        else:
+            card_level = self.block_cards.get((block_type, tier), 0)
+        
+        if card_level == 3:
+            poly_bonus = self._get_fragment_upgrade_bonuses().get('polychrome_bonus', 0)  # 0.15 when upgrade at 1
+        else:
+            poly_bonus = 0
+        return _card_block_hp(block_hp, card_level, poly_bonus)
+    
+    def get_block_xp_multiplier(self, block_type, tier=None):
+        """Get XP multiplier from card: Card = +10%, Gilded = +20%, Polychrome = +35% (+15% from upgrade → +50%)
+        Args:
+            block_type: Type of block (dirt, common, rare, etc.)
+            tier: Tier of the block (1, 2, or 3). If None, uses tier from block_data if available.
+        """
+        if tier is None:
+            # Fallback: try to find any card for this block type (backward compatibility)
+            for t in [1, 2, 3]:
+                card_level = self.block_cards.get((block_type, t), 0)
+                if card_level > 0:
+                    break
+            else:
+                return 1.0
+        else:
+            card_level = self.block_cards.get((block_type, tier), 0)
+        
+        if card_level == 3:
+            poly_bonus = self._get_fragment_upgrade_bonuses().get('polychrome_bonus', 0)  # 0.15 when upgrade at 1
+        else:
+            poly_bonus = 0
+        return _card_xp_multiplier(card_level, poly_bonus)
+    
+    def get_ability_cooldown_multiplier(self):
+        """Get ability cooldown multiplier from misc card: Normal = -3%, Gilded = -6%, Polychrome = -10%"""
+        if self.misc_card_level == 1:
+            return 0.97  # -3%
+        elif self.misc_card_level == 2:
+            return 0.94  # -6%
+        elif self.misc_card_level == 3:
+            return 0.90  # -10%
+        return 1.0
+
+    def _get_avada_keda_bonus(self):
+        """Return Avada Keda bonuses if enabled: +5 duration, -10s cooldown, +3% instacharge"""
+        if hasattr(self, 'avada_keda_enabled') and self.avada_keda_enabled.get():
+            return {
+                'duration_bonus': 5,
+                'cooldown_reduction': -10,
+                'instacharge_bonus': 0.03,  # +3%
+            }
+        return {
+            'duration_bonus': 0,
+            'cooldown_reduction': 0,
+            'instacharge_bonus': 0.0,
+        }
+    
+    def _get_block_bonker_bonus(self):
+        """Return Block Bonker bonuses if enabled: +1% damage, +1% max_stamina, +1 speed_mod_gain per highest stage (capped at 100)"""
+        if hasattr(self, 'block_bonker_enabled') and self.block_bonker_enabled.get():
+            # Highest stage = Goal Stage - 1 (if goal is 9, highest is 8)
+            goal_stage = getattr(self, 'current_stage', 1)
+            highest_stage = max(0, goal_stage - 1)
+            # Cap at 100
+            highest_stage = min(highest_stage, 100)
+            
+            return {
+                'damage_percent': highest_stage * 0.01,  # +1% per stage
+                'max_stamina_percent': highest_stage * 0.01,  # +1% per stage
+                'speed_mod_gain': highest_stage,  # +1 per stage
+                'highest_stage': highest_stage,  # For tooltip display
+            }
+        return {
+            'damage_percent': 0.0,
+            'max_stamina_percent': 0.0,
+            'speed_mod_gain': 0,
+            'highest_stage': 0,
+        }
+    
+    def _get_effective_ability_cooldowns(self):
+        """Return effective cooldowns (seconds) for Enrage, Flurry, Quake after fragments + misc card + Avada Keda."""
+        frag_bonuses = self._get_fragment_upgrade_bonuses()
+        avada_keda = self._get_avada_keda_bonus()
+        mult = self.get_ability_cooldown_multiplier()
+        enrage_base = self.ENRAGE_COOLDOWN + frag_bonuses.get('enrage_cooldown', 0) + frag_bonuses.get('ability_cooldown', 0) + avada_keda['cooldown_reduction']
+        flurry_base = self.FLURRY_COOLDOWN + frag_bonuses.get('flurry_cooldown', 0) + frag_bonuses.get('ability_cooldown', 0) + avada_keda['cooldown_reduction']
+        quake_base = self.QUAKE_COOLDOWN + frag_bonuses.get('quake_cooldown', 0) + frag_bonuses.get('ability_cooldown', 0) + avada_keda['cooldown_reduction']
+        return {
+            'enrage': int(enrage_base * mult),
+            'flurry': int(flurry_base * mult),
+            'quake': int(quake_base * mult),
+        }
+    
+    def _get_effective_enrage_charges(self):
+        """Return effective Enrage charges (base + Avada Keda bonus)"""
+        avada_keda = self._get_avada_keda_bonus()
+        return self.ENRAGE_CHARGES + avada_keda['duration_bonus']
+    
+    def _get_effective_quake_charges(self):
+        """Return effective Quake charges (base + fragment upgrades + Avada Keda bonus)"""
+        frag_bonuses = self._get_fragment_upgrade_bonuses()
+        avada_keda = self._get_avada_keda_bonus()
+        return self.QUAKE_CHARGES + frag_bonuses.get('quake_attacks', 0) + avada_keda['duration_bonus']
+
+    def calculate_damage_breakpoints(self, block_hp, block_armor, stats, block_type=None, tier=None):
+        """
+        Calculate damage breakpoints for a specific block.
+        Returns info about current hits, avg hits with crits, and next breakpoint.
+        
+        A breakpoint is where you need one less hit to kill the block.
+        Example: 20 HP block
+          - At 10 dmg: 2 hits (ceil(20/10) = 2)
+          - At 11 dmg: 2 hits (ceil(20/11) = 2) 
+          - At 20 dmg: 1 hit (ceil(20/20) = 1) <-- breakpoint at 20
+        
+        If block_type and tier are provided, card HP reduction is applied.
+        """
+        import math
+        
+        # Apply card HP reduction if block_type is provided
+        if block_type:
+            block_hp = self.get_block_hp_with_card(block_hp, block_type, tier=tier)
+        
+        effective_armor = max(0, block_armor - stats['armor_pen'])
+        current_eff_dmg = self.calculate_effective_damage(stats, block_armor)
+        current_hits = math.ceil(block_hp / current_eff_dmg) if current_eff_dmg > 0 else float('inf')
+        
+        # Calculate average hits with crits (using calculate_hits_to_kill logic)
+        avg_hits = self.calculate_hits_to_kill(stats, block_hp, block_armor, block_type=block_type, tier=tier)
+        
+        # Find next breakpoint: the minimum damage that results in one fewer hit
+        # If current_hits = n, we need dmg such that ceil(hp/dmg) = n-1
+        # That means dmg >= hp/(n-1), so min dmg = ceil(hp/(n-1))
+        
+        next_breakpoint_dmg = None
+        next_breakpoint_hits = None
+        dmg_needed = None
+        
+        if current_hits > 1:
+            target_hits = current_hits - 1
+            # Minimum effective damage needed for target_hits
+            # ceil(hp/dmg) = target_hits  =>  dmg >= hp/target_hits
+            min_eff_dmg_needed = math.ceil(block_hp / target_hits)
+            
+            # Total damage needed = effective damage + effective armor
+            total_dmg_needed = min_eff_dmg_needed + effective_armor
+            
+            next_breakpoint_dmg = total_dmg_needed
+            next_breakpoint_hits = target_hits
+            dmg_needed = max(0, total_dmg_needed - stats['total_damage'])
+        
+        return {
+            'block_hp': block_hp,
+            'block_armor': block_armor,
+            'effective_armor': effective_armor,
+            'current_eff_dmg': current_eff_dmg,
+            'current_hits': current_hits,
+            'avg_hits': avg_hits,
+            'next_breakpoint_dmg': next_breakpoint_dmg,
+            'next_breakpoint_hits': next_breakpoint_hits,
+            'dmg_needed': dmg_needed,
+        }
+    
+    def _crit_damage_factor(self, stats, crit_dmg_mult):
+        """
+        Expected damage factor per hit accounting for:
+        - Normal hits: (1 - crit_chance) * 1
+        - Normal crits: crit_chance * (1 - super_crit_chance) * crit_dmg_mult
+        - Super crits: crit_chance * super_crit_chance * (1 - ultra_crit_chance) * crit_dmg_mult * super_mult
+        - Ultra crits: crit_chance * super_crit_chance * ultra_crit_chance * crit_dmg_mult * ultra_mult
+        
+        Super crits only occur when a crit procs.
+        Ultra crits occur only on a super crit and use their own multiplier.
+        """
+        crit_chance = stats['crit_chance']
+        # Clamp chances defensively
+        sc = max(0.0, min(1.0, stats.get('super_crit_chance', 0)))
+        uc = max(0.0, min(1.0, stats.get('ultra_crit_chance', 0)))
+        cd = max(0.0, stats.get('super_crit_damage', 0))
+        super_mult = self.SUPER_CRIT_DMG_MULT_DEFAULT * (1.0 + cd)
+        ultra_mult = self.ULTRA_CRIT_DMG_MULT_DEFAULT * (1.0 + cd)
+        
+        # Expected multiplier on a crit:
+        # - Normal crit: crit_dmg_mult
+        # - Super crit:  crit_dmg_mult * super_mult
+        # - Ultra crit:  crit_dmg_mult * ultra_mult
+        crit_mult_expected = (
+            (1.0 - sc) * crit_dmg_mult
+            + sc * ((1.0 - uc) * crit_dmg_mult * super_mult + uc * crit_dmg_mult * ultra_mult)
+        )
+        
+        # Mix crit and non-crit:
+        return (1.0 - crit_chance) + crit_chance * crit_mult_expected
+    
+    def compile_build_snapshot(self, stats) -> BuildSnapshot:
+        """
+        Freeze everything the analytic calculators derive from `stats` and the
+        current toggles/cards/fragment upgrades into a `BuildSnapshot`.
+        
+        Compile once per stats dict and pass it to the calculate_* methods;
+        they compile their own when none is given.
+        """
+        frag_bonuses = self._get_fragment_upgrade_bonuses()
+        avada_keda = self._get_avada_keda_bonus()
+        cooldown_multiplier = self.get_ability_cooldown_multiplier()
+        crit_damage = stats['crit_damage']
+        
+        # Enrage: 5 hits out of every 60 have +20% damage and +100% crit damage
+        enrage_active = getattr(self, 'enrage_enabled', None)
+        enrage_active = enrage_active is not None and bool(enrage_active.get())
+        enrage_proportion = 0.0
+        enrage_total_damage = 0
+        enrage_crit_factor = 0.0
+        if enrage_active:
+            # Flat reductions (fragments -1s per level, Avada Keda), then percentage from misc card
+            base_enrage_cooldown = (self.ENRAGE_COOLDOWN + frag_bonuses.get('enrage_cooldown', 0)
+                                    + frag_bonuses.get('ability_cooldown', 0) + avada_keda['cooldown_reduction'])
+            effective_enrage_cooldown = base_enrage_cooldown * cooldown_multiplier
+            # Proportion of enrage hits: effective_charges / effective_cooldown
+            enrage_proportion = self._get_effective_enrage_charges() / effective_enrage_cooldown
+            # Damage is always integer - enrage bonus is floored before armor calculation
+            enrage_damage_bonus = stats.get('enrage_damage_bonus', self.ENRAGE_DAMAGE_BONUS)
+            enrage_total_damage = int(stats['total_damage'] * (1 + enrage_damage_bonus))
+            # Enrage crit: multiplier on current crit (ingame), e.g. +104% → crit * (1 + 1.04)
+            enrage_crit_damage_bonus = stats.get('enrage_crit_damage_bonus', self.ENRAGE_CRIT_DAMAGE_BONUS)
+            enrage_crit_factor = self._crit_damage_factor(stats, crit_damage * (1 + enrage_crit_damage_bonus))
+        
+        # Flurry: +5 stamina on cast, 120s cooldown (Avada Keda "duration" adds stamina per cast)
+        flurry_active = getattr(self, 'flurry_enabled', None)
+        flurry_active = flurry_active is not None and bool(flurry_active.get())
+        base_flurry_cooldown = (self.FLURRY_COOLDOWN + frag_bonuses.get('flurry_cooldown', 0)
+                                + frag_bonuses.get('ability_cooldown', 0) + avada_keda['cooldown_reduction'])
+        flurry_cooldown = int(base_flurry_cooldown * cooldown_multiplier)
+        flurry_stamina = self.FLURRY_STAMINA_BONUS + frag_bonuses.get('flurry_stamina', 0) + avada_keda['duration_bonus']
+        
+        # Stamina mod: each block has stamina_mod_chance to give stamina_mod_gain;
+        # flurry stamina per hit approximated as stamina / cooldown (~1 hit per second)
+        stamina_mod_chance = stats.get('stamina_mod_chance', 0)
+        stamina_per_block = stamina_mod_chance * stats.get('stamina_mod_gain', self.MOD_STAMINA_BONUS_AVG)
+        if flurry_active:
+            stamina_per_block += flurry_stamina / flurry_cooldown
+        
+        exp_mod_multiplier = self.MOD_EXP_MULTIPLIER_AVG + stats.get('exp_mod_gain', 0)
+        loot_mod_multiplier = stats.get('loot_mod_multiplier', self.MOD_LOOT_MULTIPLIER_AVG)
+        
+        return BuildSnapshot(
+            max_stamina=stats['max_stamina'],
+            total_damage=stats['total_damage'],
+            armor_pen=stats['armor_pen'],
+            one_hit_chance=stats['one_hit_chance'],
+            crit_factor=self._crit_damage_factor(stats, crit_damage),
+            enrage_active=enrage_active,
+            enrage_proportion=enrage_proportion,
+            enrage_total_damage=enrage_total_damage,
+            enrage_crit_factor=enrage_crit_factor,
+            stamina_per_block=stamina_per_block,
+            block_cards=dict(self.block_cards),
+            polychrome_bonus=frag_bonuses.get('polychrome_bonus', 0),
+            xp_mult=stats['xp_mult'],
+            arch_xp_mult=stats.get('arch_xp_mult', 1.0),
+            exp_mod_factor=1 + stats.get('exp_mod_chance', 0) * (exp_mod_multiplier - 1),
+            fragment_mult=stats['fragment_mult'],
+            loot_mod_factor=1 + stats.get('loot_mod_chance', 0) * (loot_mod_multiplier - 1),
+            slots_per_floor=self.SLOTS_PER_FLOOR,
+            stamina_mod_chance=stamina_mod_chance,
+            duration_stamina_mod_gain=self.MOD_STAMINA_BONUS_AVG + frag_bonuses.get('stamina_mod_gain', 0),
+            flurry_active=flurry_active,
+            flurry_cooldown=flurry_cooldown,
+            flurry_stamina=flurry_stamina,
+            speed_mod_chance=stats.get('speed_mod_chance', 0),
+            # Base attacks + Block Bonker bonus
+            speed_mod_hits_avg=self.MOD_SPEED_ATTACKS_AVG + stats.get('speed_mod_gain', 0),
+        )
+    
+    def calculate_hits_to_kill(self, stats, block_hp, block_armor, block_type=None, tier=None, snapshot=None):
+        """
+        Calculate expected hits to kill a block, accounting for:
+        - Base damage with armor penetration
+        - Critical hits (always included - MC handles exact simulation)
+        - One-hit chance
+        - Enrage ability (5 charges every 60s with +20% dmg, +100% crit dmg) - if enabled
+        - Card HP reduction (if block_type and tier provided)
+        
+        Note: MC simulations handle crits exactly, so this is just for deterministic estimates.
+        """
+        # Apply card HP reduction if block_type is provided
+        if block_type:
+            block_hp = self.get_block_hp_with_card(block_hp, block_type, tier=tier)
+        if snapshot is None:
+            snapshot = self.compile_build_snapshot(stats)
+        return snapshot.hits_to_kill(block_hp, block_armor)
+    
+    def calculate_blocks_per_run(self, stats, floor: int, snapshot=None):
+        if snapshot is None:
+            snapshot = self.compile_build_snapshot(stats)
+        weighted_hits = snapshot.avg_hits_per_block(floor)
+        if weighted_hits > 0:
+            return snapshot.max_stamina / weighted_hits
+        return 0
+    
+    def calculate_floors_per_run(self, stats, starting_floor: int, blocks_per_floor: float = None, snapshot=None):
+        """
+        Calculate floors per run, accounting for:
+        - Stamina Mod: Each block has a chance to give +6.5 stamina (avg of 3-10)
+        - Flurry ability: 5 charges × 5 stamina every 120 seconds (if enabled)
+        """
+        if snapshot is None:
+            snapshot = self.compile_build_snapshot(stats)
+        
+        stamina_remaining = snapshot.max_stamina
+        floors_cleared = 0
+        current_floor = starting_floor
+        # Stamina mod + flurry stamina per block
+        avg_stamina_per_block = snapshot.stamina_per_block
+        
+        for _ in range(100):
+            # Calculate expected blocks per floor: 24 slots * (total spawn probability / 100)
+            if blocks_per_floor is None:
+                total_spawn_prob = get_total_spawn_probability(current_floor)
+                floor_blocks = self.SLOTS_PER_FLOOR * (total_spawn_prob / 100.0)
+            else:
+                floor_blocks = blocks_per_floor
+            
+            avg_hits_per_block = snapshot.avg_hits_per_block(current_floor)
+            
+            # Net stamina cost per block = hits - stamina gained from mod
+            # But stamina gained can't exceed max_stamina, so we cap the effective gain
+            net_stamina_per_block = max(0.1, avg_hits_per_block - avg_stamina_per_block)
+            stamina_for_floor = net_stamina_per_block * floor_blocks
+            
+            if stamina_remaining >= stamina_for_floor:
+                stamina_remaining -= stamina_for_floor
+                floors_cleared += 1
+                current_floor += 1
+            else:
+                if stamina_for_floor > 0:
+                    floors_cleared += stamina_remaining / stamina_for_floor
+                break
+        
+        return floors_cleared
+    
+    def calculate_xp_per_run(self, stats, starting_floor: int, snapshot=None):
+        """
+        Calculate expected XP gained per run, accounting for:
+        - XP from each block based on spawn rates and block XP values
+        - XP multiplier from Intellect and Gem upgrades
+        - Exp Mod chance (avg 4x XP when triggered)
+        - Card XP bonuses per block type
+        
+        Returns:
+            Expected total XP for one full run
+        """
+        return self.calculate_run_metrics(stats, starting_floor, snapshot=snapshot)['xp']
+    
+    def calculate_fragments_per_run(self, stats, starting_floor: int, snapshot=None):
+        """
+        Calculate expected fragments gained per run, broken down by fragment type.
+        
+        Returns:
+            dict with fragment counts per type: {'common': X, 'rare': Y, ...}
+        """
+        return self.calculate_run_metrics(stats, starting_floor, snapshot=snapshot)['fragments']
+    
+    def calculate_run_metrics(self, stats, starting_floor: int, snapshot=None):
+        """
+        Floors, XP, fragments and run duration of one run in a single floor walk.
+        
+        The stamina walk (calculate_floors_per_run) runs once; XP and fragments
+        are then summed over the cleared floors (the last one scaled by its
+        cleared fraction) from the per-floor yields cached on the snapshot.
+        
+        Returns:
+            dict with:
+                - 'floors': floors cleared per run
+                - 'xp': expected XP per run
+                - 'fragments': dict of fragment type -> expected fragments per run
+                - 'run_duration': expected run duration in seconds
+        """
+        if snapshot is None:
+            snapshot = self.compile_build_snapshot(stats)
+        floors = self.calculate_floors_per_run(stats, starting_floor, snapshot=snapshot)
+        run_duration = self.calculate_run_duration(stats, starting_floor, snapshot=snapshot)
+        if floors <= 0:
+            return {
+                'floors': floors,
+                'xp': 0.0,
+                'fragments': {'common': 0, 'rare': 0, 'epic': 0, 'legendary': 0, 'mythic': 0},
+                'run_duration': run_duration,
+            }
+        
+        total_xp = 0.0
+        fragments_by_type = {'common': 0.0, 'rare': 0.0, 'epic': 0.0, 'legendary': 0.0, 'mythic': 0.0}
+        floors_to_process = int(floors)  # Full floors
+        partial_floor = floors - floors_to_process  # Partial floor fraction
+        
+        for i in range(floors_to_process + 1):  # +1 for partial floor
+            if i == floors_to_process:
+                # Partial floor - scale by remaining fraction
+                floor_mult = partial_floor
+                if floor_mult <= 0:
+                    break
+            else:
+                floor_mult = 1.0
+            
+            floor_xp, floor_fragments = snapshot.floor_yield(starting_floor + i)
+            total_xp += floor_xp * floor_mult
+            for frag_type, frag_gain in floor_fragments:
+                fragments_by_type[frag_type] += frag_gain * floor_mult
+        
+        return {
+            'floors': floors,
+            'xp': total_xp,
+            'fragments': fragments_by_type,
+            'run_duration': run_duration,
+        }
+    
+    
+    def calculate_run_duration(self, stats, starting_floor: int, snapshot=None):
+        """
+        Calculate expected run duration in seconds.
+        
+        Base: 1 hit = 1 second
+        Speed modifiers:
+        - Speed Mod: 2x speed for avg 60 hits when triggered
+        - Flurry: 2x speed during active (every 120s cooldown)
+        
+        Returns:
+            Run duration in seconds
+        """
+        if snapshot is None:
+            snapshot = self.compile_build_snapshot(stats)
+        # Total hits = stamina (since 1 hit costs 1 stamina)
+        total_hits = snapshot.max_stamina
+        
+        # Add stamina from Stamina Mod (gain includes fragment upgrade bonus)
+        blocks_per_run = self.calculate_blocks_per_run(stats, starting_floor, snapshot=snapshot)
+        avg_stamina_from_mod = blocks_per_run * snapshot.stamina_mod_chance * snapshot.duration_stamina_mod_gain
+        total_hits += avg_stamina_from_mod
+        
+        # Add stamina from Flurry
+        if snapshot.flurry_active:
+            # Estimate run duration first without flurry to see how many activations
+            base_duration = total_hits  # 1 hit = 1 second base
+            flurry_activations = base_duration / snapshot.flurry_cooldown
+            total_hits += flurry_activations * snapshot.flurry_stamina
+        
+        # Base duration: 1 hit per second
+        base_duration_seconds = total_hits
+        
+        # Speed Mod effect: 2x speed for avg 60 hits (+ Block Bonker attacks)
+        speed_mod_hits = blocks_per_run * snapshot.speed_mod_chance * snapshot.speed_mod_hits_avg
+        # These hits take half the time (2x speed)
+        time_saved_from_speed_mod = speed_mod_hits * 0.5  # Save 0.5s per hit
+        
+        # Flurry effect: 2x speed while active
+        # Flurry is active for ~5 hits every cooldown period
+        flurry_time_saved = 0
+        if snapshot.flurry_active:
+            # Each activation speeds up some hits; assume ~5 seconds saved per activation
+            # This is an approximation
+            activations = base_duration_seconds / snapshot.flurry_cooldown
+            flurry_time_saved = activations * 5
+        
+        run_duration = base_duration_seconds - time_saved_from_speed_mod - flurry_time_saved
+        return max(10, run_duration)  # Minimum 10 seconds
+    
+    def get_gem_upgrade_cost(self, upgrade_name):
+        """Get the cost of the next gem upgrade level"""
+        current_level = self.gem_upgrades[upgrade_name]
+        max_level = self.GEM_UPGRADE_BONUSES[upgrade_name]['max_level']
+        if current_level >= max_level:
+            return None
+        return self.GEM_COSTS[upgrade_name][current_level]
+    
+    def get_total_gem_cost(self, upgrade_name):
+        """Get total gems spent on this upgrade"""
+        current_level = self.gem_upgrades[upgrade_name]
+        if current_level == 0:
+            return 0
+        return sum(self.GEM_COSTS[upgrade_name][:current_level])
+    
+    def calculate_fragment_upgrade_efficiency(self, upgrade_key):
+        """Calculate the efficiency factor of adding one fragment upgrade level (Stage Rush = Floors/Run improvement per cost)"""
+        upgrade_info = self.FRAGMENT_UPGRADES.get(upgrade_key, {})
+        max_level = upgrade_info.get('max_level', 25)
+        current_level = self.fragment_upgrade_levels.get(upgrade_key, 0)
+        
+        if current_level >= max_level:
+            return 0, 0
+        
+        # Get cost for next level
+        cost = get_upgrade_cost(upgrade_key, current_level)
+        if cost is None or cost <= 0:
+            return 0, 0
+        
+        current_stats = self.get_total_stats()
+        calc_stage = self._get_calculation_stage()
+        current_floors = self.calculate_floors_per_run(
+            current_stats, calc_stage, snapshot=self.compile_build_snapshot(current_stats))
+        
+        # Temporarily add one level
+        self.fragment_upgrade_levels[upgrade_key] = current_level + 1
+        new_stats = self.get_total_stats()
+        new_floors = self.calculate_floors_per_run(
+            new_stats, calc_stage, snapshot=self.compile_build_snapshot(new_stats))
+        # Restore original level
+        self.fragment_upgrade_levels[upgrade_key] = current_level
+        
+        # Calculate efficiency factor: floors improvement per fragment cost
+        floors_improvement = new_floors - current_floors
+        efficiency_factor = floors_improvement / cost if cost > 0 else 0
+        
+        return new_floors, efficiency_factor
+    
+    def calculate_fragment_upgrade_xp_efficiency(self, upgrade_key):
+        """Calculate the XP efficiency factor of adding one fragment upgrade level (XP improvement per cost)"""
+        upgrade_info = self.FRAGMENT_UPGRADES.get(upgrade_key, {})
+        max_level = upgrade_info.get('max_level', 25)
+        current_level = self.fragment_upgrade_levels.get(upgrade_key, 0)
+        
+        if current_level >= max_level:
+            return 0, 0
+        
+        # Get cost for next level
+        cost = get_upgrade_cost(upgrade_key, current_level)
+        if cost is None or cost <= 0:
+            return 0, 0
+        
+        current_stats = self.get_total_stats()
+        calc_stage = self._get_calculation_stage()
+        current_xp = self.calculate_run_metrics(current_stats, calc_stage)['xp']
+        
+        # Temporarily add one level
+        self.fragment_upgrade_levels[upgrade_key] = current_level + 1
+        new_stats = self.get_total_stats()
+        new_xp = self.calculate_run_metrics(new_stats, calc_stage)['xp']
+        # Restore original level
+        self.fragment_upgrade_levels[upgrade_key] = current_level
+        
+        # Calculate efficiency factor: XP improvement per fragment cost
+        xp_improvement = new_xp - current_xp
+        efficiency_factor = xp_improvement / cost if cost > 0 else 0
+        
+        return new_xp, efficiency_factor
+    
+    def calculate_fragment_upgrade_fragment_efficiency(self, upgrade_key):
+        """
+        Calculate the Fragment/Hour efficiency factor of adding one fragment upgrade level.
+        
+        Returns:
+            (new_frags_per_hour, efficiency_factor) - Frag/h improvement per fragment cost
+        """
+        upgrade_info = self.FRAGMENT_UPGRADES.get(upgrade_key, {})
+        max_level = upgrade_info.get('max_level', 25)
+        current_level = self.fragment_upgrade_levels.get(upgrade_key, 0)
+        
+        if current_level >= max_level:
+            return 0, 0
+        
+        # Get cost for next level
+        cost = get_upgrade_cost(upgrade_key, current_level)
+        if cost is None or cost <= 0:
+            return 0, 0
+        
+        current_stats = self.get_total_stats()
+        calc_stage = self._get_calculation_stage()
+        current_metrics = self.calculate_run_metrics(current_stats, calc_stage)
+        current_total = sum(current_metrics['fragments'].values())
+        current_duration = current_metrics['run_duration']
+        
+        # Calculate current frags/hour
+        if current_duration > 0:
+            current_frags_per_hour = current_total * (3600.0 / current_duration)
+        else:
+            current_frags_per_hour = 0
+        
+        # Temporarily add one level
+        self.fragment_upgrade_levels[upgrade_key] = current_level + 1
+        new_stats = self.get_total_stats()
+        new_metrics = self.calculate_run_metrics(new_stats, calc_stage)
+        new_total = sum(new_metrics['fragments'].values())
+        new_duration = new_metrics['run_duration']
+        # Restore original level
+        self.fragment_upgrade_levels[upgrade_key] = current_level
+        
+        # Calculate new frags/hour
+        if new_duration > 0:
+            new_frags_per_hour = new_total * (3600.0 / new_duration)
+        else:
+            new_frags_per_hour = 0
+        
+        # Calculate efficiency factor: Frag/h improvement per fragment cost
+        frag_improvement = new_frags_per_hour - current_frags_per_hour
+        efficiency_factor = frag_improvement / cost if cost > 0 else 0
+        
+        return new_frags_per_hour, efficiency_factor
+    
+    
+    def get_unlocked_stage(self):
+        """Get the current unlocked stage value"""
+        if hasattr(self, 'unlocked_stage'):
+            return self.unlocked_stage
+        return 1
+    
+    def is_upgrade_unlocked(self, upgrade_key):
+        """Check if a fragment upgrade is unlocked based on current stage"""
+        if upgrade_key in self.FRAGMENT_UPGRADES:
+            stage_required = self.FRAGMENT_UPGRADES[upgrade_key].get('stage_unlock', 0)
+            return self.get_unlocked_stage() >= stage_required
+        return True  # Non-fragment upgrades are always available
+    
+    def scan_stage_curves(self, stats, max_stage: int, min_stage: int = 1, snapshot=None):
+        """
+        Run metrics for every starting stage in [min_stage, max_stage] in one pass.
+        
+        Runs from consecutive stages walk mostly the same floors, so the per-floor
+        stamina cost, XP and fragments are summed once into prefix sums over
+        floors min_stage .. max_stage + 100 (a run clears at most 100 floors).
+        Floors cleared from stage s is then a bisection on the stamina prefix sum,
+        and XP/fragments are prefix differences plus the partial last floor.
+        Matches calculate_run_metrics per stage up to float rounding.
+        
+        Returns:
+            dict with lists indexed like 'stages':
+                - 'stages': starting stages
+                - 'floors', 'xp', 'run_duration': per-run values
+                - 'fragments': dict of fragment type -> per-run list
+                - 'xp_per_hour', 'stages_per_hour': per-hour values
+                - 'frags_per_hour': dict of fragment type -> per-hour list
+        """
+        if snapshot is None:
+            snapshot = self.compile_build_snapshot(stats)
+        min_stage = max(1, int(min_stage))
+        max_stage = max(min_stage, int(max_stage))
+        frag_types = ('common', 'rare', 'epic', 'legendary', 'mythic')
+        
+        # Prefix sums over floors; index i is floor min_stage + i
+        max_walk = 100
+        cost_prefix = [0.0]
+        xp_prefix = [0.0]
+        frag_prefix = {t: [0.0] for t in frag_types}
+        costs, floor_xps, floor_frags = [], [], []
+        for floor in range(min_stage, max_stage + max_walk + 1):
+            floor_blocks = self.SLOTS_PER_FLOOR * (get_total_spawn_probability(floor) / 100.0)
+            cost = max(0.1, snapshot.avg_hits_per_block(floor) - snapshot.stamina_per_block) * floor_blocks
+            floor_xp, fragments = snapshot.floor_yield(floor)
+            fragments = dict(fragments)
+            costs.append(cost)
+            floor_xps.append(floor_xp)
+            floor_frags.append(fragments)
+            cost_prefix.append(cost_prefix[-1] + cost)
+            xp_prefix.append(xp_prefix[-1] + floor_xp)
+            for t in frag_types:
+                frag_prefix[t].append(frag_prefix[t][-1] + fragments.get(t, 0.0))
+        
+        curves = {
+            'stages': [], 'floors': [], 'xp': [], 'run_duration': [],
+            'fragments': {t: [] for t in frag_types},
+            'xp_per_hour': [], 'stages_per_hour': [],
+            'frags_per_hour': {t: [] for t in frag_types},
+        }
+        stamina = snapshot.max_stamina
+        for i, stage in enumerate(range(min_stage, max_stage + 1)):
+            # Full floors: last k with cost_prefix[i + k] - cost_prefix[i] <= stamina
+            full = bisect_right(cost_prefix, cost_prefix[i] + stamina, i, i + max_walk + 1) - 1 - i
+            if full < max_walk:
+                partial = (stamina - (cost_prefix[i + full] - cost_prefix[i])) / costs[i + full]
+            else:
+                partial = 0.0
+            floors = full + partial
+            xp = xp_prefix[i + full] - xp_prefix[i]
+            if partial > 0:
+                xp += floor_xps[i + full] * partial
+            run_duration = self.calculate_run_duration(stats, stage, snapshot=snapshot)
+            runs_per_hour = 3600 / run_duration if run_duration > 0 else 0
+            
+            curves['stages'].append(stage)
+            curves['floors'].append(floors)
+            curves['xp'].append(xp)
+            curves['run_duration'].append(run_duration)
+            curves['xp_per_hour'].append(xp * runs_per_hour)
+            curves['stages_per_hour'].append(floors * runs_per_hour)
+            for t in frag_types:
+                frags = frag_prefix[t][i + full] - frag_prefix[t][i]
+                if partial > 0:
+                    frags += floor_frags[i + full].get(t, 0.0) * partial
+                curves['fragments'][t].append(frags)
+                curves['frags_per_hour'][t].append(frags * runs_per_hour)
+        return curves
+    
+    def find_optimal_stage_for_fragment_type(self, stats: dict, target_frag_type: str, max_stage_to_test: int = 100) -> tuple:
+        """
+        Find the optimal starting stage for farming a specific fragment type.
+        
+        Scans every stage where the target fragment type can spawn (see
+        scan_stage_curves) and returns the one with the most frags/hour.
+        
+        Args:
+            stats: Current stats dictionary
+            target_frag_type: 'common', 'rare', 'epic', 'legendary', or 'mythic'
+            max_stage_to_test: Maximum stage to test (default 100)
+        
+        Returns:
+            tuple: (optimal_stage, frags_per_hour_at_optimal_stage)
+        """
+        best_stage = 1
+        best_frag_per_hour = 0.0
+        
+        # Stages where the fragment type is available
+        # Common: stage 1+, Rare: stage 3+, Epic: stage 6+, Legendary: stage 12+, Mythic: stage 20+
+        stage_ranges = {
+            'common': (1, max_stage_to_test),
+            'rare': (3, max_stage_to_test),
+            'epic': (6, max_stage_to_test),
+            'legendary': (12, max_stage_to_test),
+            'mythic': (20, max_stage_to_test),
+        }
+        
+        min_stage, max_stage = stage_ranges.get(target_frag_type, (1, max_stage_to_test))
+        if max_stage < min_stage:
+            return (best_stage, best_frag_per_hour)
+        
+        curves = self.scan_stage_curves(stats, max_stage, min_stage=min_stage)
+        frags_per_hour = curves['frags_per_hour'].get(target_frag_type)
+        if frags_per_hour is None:
+            return (best_stage, best_frag_per_hour)
+        for test_stage, frag_per_hour in zip(curves['stages'], frags_per_hour):
+            # Check if fragment type is available at this stage
+            if target_frag_type not in get_available_blocks_at_stage(test_stage):
+                continue
+            if frag_per_hour > best_frag_per_hour:
+                best_frag_per_hour = frag_per_hour
+                best_stage = test_stage
+        
+        return (best_stage, best_frag_per_hour)
+    
+    def find_optimal_stage_for_xp(self, stats: dict, max_stage_to_test: int = 100) -> tuple:
+        """
+        Find the optimal starting stage for maximum XP per hour.
+        
+        Scans every stage from 1 to max_stage_to_test (capped at 100, see
+        scan_stage_curves) and returns the one with the most XP/hour.
+        
+        Args:
+            stats: Current stats dictionary
+            max_stage_to_test: Maximum stage to test (default 100)
+        
+        Returns:
+            tuple: (optimal_stage, xp_per_hour_at_optimal_stage)
+        """
+        best_stage = 1
+        best_xp_per_hour = 0.0
+        
+        curves = self.scan_stage_curves(stats, min(max(1, max_stage_to_test), 100))
+        for test_stage, xp_per_hour in zip(curves['stages'], curves['xp_per_hour']):
+            if xp_per_hour > best_xp_per_hour:
+                best_xp_per_hour = xp_per_hour
+                best_stage = test_stage
+        
+        return (best_stage, best_xp_per_hour)
+    
+    def _stats_with_added_points(self, skills, added):
+        """get_total_stats() with `added[i]` extra points in `skills[i]` (skill points are restored)."""
+        for skill, points in zip(skills, added):
+            self.skill_points[skill] += points
+        try:
+            return self.get_total_stats()
+        finally:
+            for skill, points in zip(skills, added):
+                self.skill_points[skill] -= points
+    
+    def _forecast_rates(self, stats, calc_stage, target_frag_type):
+        """(target frags/hour, stages/hour, XP/hour) of one build at `calc_stage`."""
+        metrics = self.calculate_run_metrics(stats, calc_stage)
+        run_duration = metrics['run_duration']
+        runs_per_hour = 3600 / run_duration if run_duration > 0 else 0
+        return (
+            metrics['fragments'].get(target_frag_type, 0) * runs_per_hour,
+            metrics['floors'] * runs_per_hour,
+            metrics['xp'] * runs_per_hour,
+        )
+    
+    def _frag_rate_upper_bound(self, skills, caps, prefix, remaining, calc_stage, target_frag_type):
+        """
+        Upper bound on target frags/hour over every completion of `prefix` that
+        spends `remaining` more points on the open skills (within `caps`).
+        
+        Every stat only grows with skill points, so floors cleared, target
+        fragments per run and blocks per run are monotone in each skill.
+        Fragments are bounded by the optimistic build that gives each open skill
+        all remaining points at once; run duration is bounded below by the build
+        without the remaining points (fewest stamina refunds) minus the speed-mod
+        saving of the optimistic build. Mirrors calculate_run_duration.
+        """
+        n_open = len(skills) - len(prefix)
+        low = tuple(prefix) + (0,) * n_open
+        high = tuple(prefix) + tuple(min(cap, remaining) for cap in caps[len(prefix):])
+        low_stats = self._stats_with_added_points(skills, low)
+        high_stats = self._stats_with_added_points(skills, high)
+        low_snapshot = self.compile_build_snapshot(low_stats)
+        high_snapshot = self.compile_build_snapshot(high_stats)
+        
+        frags_high = self.calculate_fragments_per_run(high_stats, calc_stage, snapshot=high_snapshot).get(target_frag_type, 0)
+        
+        blocks_low = self.calculate_blocks_per_run(low_stats, calc_stage, snapshot=low_snapshot)
+        blocks_high = self.calculate_blocks_per_run(high_stats, calc_stage, snapshot=high_snapshot)
+        total_hits = low_snapshot.max_stamina + blocks_low * low_snapshot.stamina_mod_chance * low_snapshot.duration_stamina_mod_gain
+        flurry_time_saved = 0
+        if low_snapshot.flurry_active:
+            if low_snapshot.flurry_cooldown <= 5:
+                return float('inf')  # Flurry would save more time than it adds; no useful bound
+            total_hits += total_hits / low_snapshot.flurry_cooldown * low_snapshot.flurry_stamina
+            flurry_time_saved = total_hits / low_snapshot.flurry_cooldown * 5
+        speed_time_saved = blocks_high * high_snapshot.speed_mod_chance * high_snapshot.speed_mod_hits_avg * 0.5
+        duration_low = max(10, total_hits - speed_time_saved - flurry_time_saved)
+        
+        # Small slack so float rounding never prunes a tie
+        return frags_high * (3600 / duration_low) * (1 + 1e-9)
+    
+    def _greedy_frag_forecast(self, skills, caps, levels_ahead, calc_stage, target_frag_type):
+        """
+        Frags/hour of a good feasible build (incumbent for the search): grow it one
+        best point at a time, then move single points between skills while that helps.
+        """
+        def rate(dist):
+            return self._forecast_rates(self._stats_with_added_points(skills, dist), calc_stage, target_frag_type)[0]
+        
+        dist = [0] * len(skills)
+        value = None
+        for _ in range(levels_ahead):
+            best_step = None
+            for i, cap in enumerate(caps):
+                if dist[i] >= cap:
+                    continue
+                dist[i] += 1
+                step_value = rate(dist)
+                dist[i] -= 1
+                if best_step is None or step_value > best_step[0]:
+                    best_step = (step_value, i)
+            value, i = best_step
+            dist[i] += 1
+        
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(skills)):
+                for j in range(len(skills)):
+                    if i == j or dist[i] == 0 or dist[j] >= caps[j]:
+                        continue
+                    dist[i] -= 1
+                    dist[j] += 1
+                    moved_value = rate(dist)
+                    if moved_value > value:
+                        value = moved_value
+                        improved = True
+                    else:
+                        dist[i] += 1
+                        dist[j] -= 1
+        return value
+    
+    def _search_frag_forecast(self, skills, caps, prefix, remaining, calc_stage, target_frag_type,
+                              best_value, threshold=float('-inf')):
+        """
+        Branch-and-bound over the distributions extending `prefix`.
+        
+        Children are searched best-bound first, so good builds are found early.
+        A subtree is skipped when its upper bound cannot beat the best so far, or
+        falls below `threshold` (frags/hour of a known feasible distribution).
+        Only a strictly better distribution replaces `best_value`, and among equal
+        ones the first in generate_distributions_capped order wins, so the result
+        is the distribution exhaustive enumeration picks.
+        
+        Returns:
+            (best_value, best_distribution or None, best_rates or None, evaluations)
+        """
+        best = [best_value, None, None]
+        evaluations = 0
+        last = len(skills) - 1
+        
+        def consider(dist):
+            nonlocal evaluations
+            rates = self._forecast_rates(self._stats_with_added_points(skills, dist), calc_stage, target_frag_type)
+            evaluations += 1
+            value = rates[0]
+            if value > best[0] or (best[1] is not None and value == best[0] and dist < best[1]):
+                best[:] = [value, dist, rates]
+        
+        def bound(prefix, remaining):
+            nonlocal evaluations
+            if sum(caps[len(prefix):]) < remaining:
+                return None  # No completion fits within the caps
+            evaluations += 2
+            return self._frag_rate_upper_bound(skills, caps, prefix, remaining, calc_stage, target_frag_type)
+        
+        def visit(prefix, remaining, prefix_bound):
+            if prefix_bound <= best[0] or prefix_bound < threshold:
+                return
+            depth = len(prefix)
+            if depth == last - 1:
+                # Children are complete distributions: evaluate them directly
+                for points in range(min(remaining, caps[depth]) + 1):
+                    if remaining - points <= caps[last]:
+                        consider(prefix + (points, remaining - points))
+                return
+            children = []
+            for points in range(min(remaining, caps[depth]) + 1):
+                child = prefix + (points,)
+                child_bound = bound(child, remaining - points)
+                if child_bound is not None:
+                    children.append((child_bound, child, remaining - points))
+            children.sort(key=lambda c: c[0], reverse=True)
+            for child_bound, child, child_remaining in children:
+                visit(child, child_remaining, child_bound)
+        
+        prefix = tuple(prefix)
+        if len(prefix) > last:
+            return best[0], best[1], best[2], evaluations
+        if len(prefix) == last:
+            if remaining <= caps[last]:
+                consider(prefix + (remaining,))
+            return best[0], best[1], best[2], evaluations
+        root_bound = bound(prefix, remaining)
+        if root_bound is not None:
+            visit(prefix, remaining, root_bound)
+        return best[0], best[1], best[2], evaluations
+    
+    def _forecast_build_payload(self):
+        """Plain-dict build (ArchBuild fields) for rebuilding this state in a worker process."""
+        def _flag(name):
+            var = getattr(self, name, None)
+            return bool(var.get()) if var is not None else False
+        
+        return {
+            'starting_floor': self._get_calculation_stage(),
+            'current_stage': getattr(self, 'current_stage', 1),
+            'skill_points': dict(self.skill_points),
+            'gem_upgrades': dict(self.gem_upgrades),
+            'fragment_upgrade_levels': dict(self.fragment_upgrade_levels),
+            'misc_card_level': self.misc_card_level,
+            'block_cards': dict(self.block_cards),
+            'enrage_enabled': _flag('enrage_enabled'),
+            'flurry_enabled': _flag('flurry_enabled'),
+            'quake_enabled': _flag('quake_enabled'),
+            'avada_keda_enabled': _flag('avada_keda_enabled'),
+            'block_bonker_enabled': _flag('block_bonker_enabled'),
+        }
+    
+    def calculate_frag_forecast(self, levels_ahead: int, target_frag_type: str,
+                                parallel: bool = False, max_workers: int = None):
+        """
+        Calculate the optimal skill point distribution for maximum fragment income of a specific type.
+        
+        Exact branch-and-bound over the capped distributions (see
+        _search_frag_forecast): returns the same distribution as trying every
+        one, but skips subtrees that provably cannot win. With `parallel=True`
+        the subtrees for each first-skill value are searched on the shared
+        worker pool.
+        
+        Args:
+            levels_ahead: Number of skill points to allocate
+            target_frag_type: 'common', 'rare', 'epic', 'legendary', or 'mythic'
+            parallel: Split the search across processes
+            max_workers: Worker count for the parallel search (default: CPU count)
+        
+        Returns:
+            dict with:
+                - 'distribution': dict of skill -> points to add
+                - 'frags_per_hour': resulting frags/hour for target type
+                - 'stages_per_hour': stages cleared per hour with this build
+                - 'xp_per_hour': XP earned per hour with this build
+                - 'improvement_pct': percentage improvement
+        """
+        skills = ['strength', 'agility', 'perception', 'intellect', 'luck']
+        
+        # Calculate current frags per hour for target type
+        stats = self.get_total_stats()
+        calc_stage = self._get_calculation_stage()
+        current_frag_per_hour, current_stages_per_hour, current_xp_per_hour = self._forecast_rates(
+            stats, calc_stage, target_frag_type)
+        
+        best_result = {
+            'distribution': {s: 0 for s in skills},
+            'frags_per_hour': current_frag_per_hour,
+            'stages_per_hour': current_stages_per_hour,
+            'xp_per_hour': current_xp_per_hour,
+            'improvement_pct': 0.0,
+        }
+        
+        best_frag_per_hour = current_frag_per_hour
+
+        # Respect per-stat caps when adding levels ahead
+        caps_remaining = [
+            max(0, get_skill_point_cap(skill) - self.skill_points.get(skill, 0))
+            for skill in skills
+        ]
+        if sum(caps_remaining) < levels_ahead:
+            return best_result  # Can't allocate that many additional points within caps
+        if levels_ahead <= 0:
+            return best_result
+
+        # A good feasible build up front lets the search prune from the start
+        threshold = self._greedy_frag_forecast(skills, caps_remaining, levels_ahead, calc_stage, target_frag_type)
+        
+        if parallel:
+            subtrees = self._search_frag_forecast_parallel(
+                skills, caps_remaining, levels_ahead, calc_stage, target_frag_type,
+                current_frag_per_hour, threshold, max_workers)
+        else:
+            subtrees = [self._search_frag_forecast(
+                skills, caps_remaining, (), levels_ahead, calc_stage, target_frag_type,
+                current_frag_per_hour, threshold)]
+        
+        # Subtrees are in enumeration order: keep the first strictly best one
+        for value, dist_tuple, rates, _evaluations in subtrees:
+            if dist_tuple is not None and value > best_frag_per_hour:
+                best_frag_per_hour = value
+                best_result['distribution'] = {s: p for s, p in zip(skills, dist_tuple)}
+                best_result['frags_per_hour'] = rates[0]
+                best_result['stages_per_hour'] = rates[1]
+                best_result['xp_per_hour'] = rates[2]
+        
+        # Calculate improvement percentage
+        if current_frag_per_hour > 0:
+            best_result['improvement_pct'] = ((best_frag_per_hour - current_frag_per_hour) / current_frag_per_hour) * 100
+        
+        return best_result
+    
+    def _search_frag_forecast_parallel(self, skills, caps, levels_ahead, calc_stage, target_frag_type,
+                                       best_value, threshold, max_workers=None):
+        """Run _search_frag_forecast for each first-skill value on the shared worker pool."""
+        import os
+        
+        try:
+            from ..worker_pool import acquire_worker_pool
+            from .mc_parallel import run_frag_forecast_subtree
+        except (ImportError, ValueError):
+            from worker_pool import acquire_worker_pool
+            from archaeology.mc_parallel import run_frag_forecast_subtree
+        
+        payload = self._forecast_build_payload()
+        executor = acquire_worker_pool(max_workers or os.cpu_count() or 1)
+        try:
+            futures = [
+                executor.submit(
+                    run_frag_forecast_subtree,
+                    build=payload,
+                    skills=list(skills),
+                    caps=list(caps),
+                    prefix=(points,),
+                    remaining=levels_ahead - points,
+                    target_frag_type=target_frag_type,
+                    best_value=best_value,
+                    threshold=threshold,
+                )
+                for points in range(min(levels_ahead, caps[0]) + 1)
+            ]
+            return [fut.result() for fut in futures]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -5,6 +5,8 @@ WHY:
 - The main `ArchaeologySimulatorWindow` is GUI-first (Tk) and builds a window
   on init. For DOE experiments we want to reuse the exact same math without
   creating UI objects.
+- The math lives in `calculator.ArchaeologyCalculator` (the window's base
+  class), so importing this module does not load tkinter/PIL either.
 """
 
 from __future__ import annotations
@@ -12,7 +14,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Optional, Tuple
 
-from .simulator import ArchaeologySimulatorWindow
+from .calculator import ArchaeologyCalculator
 
 
 class _BoolVar:
@@ -58,18 +60,16 @@ class ArchBuild:
     current_stage: Optional[int] = None
 
 
-class HeadlessArchaeologySimulator(ArchaeologySimulatorWindow):
+class HeadlessArchaeologySimulator(ArchaeologyCalculator):
     """
-    Reuse `ArchaeologySimulatorWindow` math without creating Tk windows.
+    Reuse the `ArchaeologySimulatorWindow` math without creating Tk windows.
 
     Implementation strategy:
-    - Do NOT call the GUI `__init__`.
     - Initialize core state via `reset_to_level1()` (pure-python).
     - Overwrite state with the provided build.
     """
 
     def __init__(self, build: ArchBuild):
-        # Intentionally do not call `super().__init__` (would create a Tk window).
         self.reset_to_level1()
 
         # Stage / floor context
@@ -98,3 +98,8 @@ class HeadlessArchaeologySimulator(ArchaeologySimulatorWindow):
         stats = self.get_total_stats()
         return float(self.calculate_floors_per_run(stats, starting_floor=starting_floor))
 
+    def eval_run_metrics(self, starting_floor: int) -> Dict[str, object]:
+        """Floors, XP, fragments and run duration for this build (one floor walk)."""
+        stats = self.get_total_stats()
+        return self.calculate_run_metrics(stats, starting_floor=starting_floor)
+
@@ -5,11 +5,32 @@ Design goals:
 - Windows-safe (spawn) -> all worker entrypoints are top-level and pickleable.
 - Dependency-light, reuse existing simulation math.
 - Chunk-friendly: workers can run many sims per call to reduce IPC overhead.
+- Cancellable: the simulation entrypoints take an optional `cancel_token`
+  (worker_pool.CancelToken) polled between runs. A cancelled task raises
+  TaskCancelled, or with `return_partial=True` returns the aggregates of the
+  runs finished so far, marked `cancelled` (never written to the result cache).
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from ..result_cache import cached_sums, result_key, store_sums
+    from ..worker_pool import TaskCancelled
+except (ImportError, ValueError):
+    # When gui.py runs directly, archaeology is not a package, so use absolute import
+    from result_cache import cached_sums, result_key, store_sums
+    from worker_pool import TaskCancelled
+
+
+def _cancelled(result: Dict[str, Any], runs: int, return_partial: bool) -> Dict[str, Any]:
+    """Result of a task whose cancel token stopped it after `runs` runs"""
+    if not return_partial:
+        raise TaskCancelled(f"cancelled after {runs} runs")
+    result["cancelled"] = True
+    result["runs_completed"] = int(runs)
+    return result
 
 
 def run_stage_sims_summary(
@@ -23,10 +44,15 @@ def run_stage_sims_summary(
     quake_enabled: bool,
     block_cards: Optional[Dict[str, int]],
     seed: int,
+    cancel_token: Optional[Any] = None,
+    return_partial: bool = False,
 ) -> Dict[str, Any]:
     """
     Run `n_sims` archaeology simulations and return aggregated summary metrics.
 
+    Results are seeded, so they are served from the on-disk result cache when
+    the same inputs were simulated before.
+
     Returns dict:
       - avg_max_stage: float
       - fragments_per_hour: float
@@ -34,54 +60,79 @@ def run_stage_sims_summary(
       - stage_counts: dict[int, int]  (int(max_stage_reached) -> count)
       - max_stage_seen: int
     """
+    seed = int(seed) & 0x7FFFFFFF
+    n_sims_i = max(0, int(n_sims))
+    key = result_key(
+        "arch_stage_sims", stats=stats, starting_floor=int(starting_floor), n_sims=n_sims_i,
+        use_crit=bool(use_crit), enrage_enabled=bool(enrage_enabled), flurry_enabled=bool(flurry_enabled),
+        quake_enabled=bool(quake_enabled), block_cards=block_cards, seed=seed,
+    )
+    sums = cached_sums(key)
+    if sums is None:
+        sums = _stage_sims_sums(
+            stats, int(starting_floor), n_sims_i, bool(use_crit), bool(enrage_enabled),
+            bool(flurry_enabled), bool(quake_enabled), block_cards, seed,
+            cancel_token.is_set if cancel_token is not None else None,
+        )
+        if sums["runs"] < n_sims_i:
+            return _cancelled(stage_summary_from_sums(sums), sums["runs"], return_partial)
+        store_sums(key, sums)
+    return stage_summary_from_sums(sums)
+
+
+def _stage_sims_sums(stats, starting_floor, n_sims, use_crit, enrage_enabled, flurry_enabled,
+                     quake_enabled, block_cards, seed, should_stop=None) -> Dict[str, Any]:
+    """Simulate and return the (mergeable) sums behind run_stage_sims_summary"""
     import random
 
     # Ensure deterministic, per-task RNG. The simulator uses the global `random` module.
-    random.seed(int(seed) & 0x7FFFFFFF)
+    random.seed(seed)
 
     from .monte_carlo_crit import MonteCarloCritSimulator
 
-    sim = MonteCarloCritSimulator(seed=int(seed) & 0x7FFFFFFF)
+    sim = MonteCarloCritSimulator(seed=seed)
+
+    stage_counts: Dict[str, int] = {}
+    sums = {"runs": 0, "max_stage": 0.0, "fragments": 0.0, "xp": 0.0, "run_duration": 0.0}
+
+    # Vectorized engine (falls back to simulate_run for small n or without NumPy)
+    results = sim.simulate_runs_batch(
+        stats,
+        starting_floor,
+        n_sims,
+        use_crit=use_crit,
+        enrage_enabled=enrage_enabled,
+        flurry_enabled=flurry_enabled,
+        quake_enabled=quake_enabled,
+        block_cards=block_cards,
+        should_stop=should_stop,
+    )
+    # Fewer than n_sims only if should_stop cut the batch short
+    sums["runs"] = len(results)
+    for result in results:
+        max_stage = float(result.get("max_stage_reached", 0.0))
+        sums["max_stage"] += max_stage
 
-    stage_counts: Dict[int, int] = {}
-    max_stage_seen = 0
+        # String keys: the sums are stored as JSON
+        stage_key = str(int(max_stage))
+        stage_counts[stage_key] = stage_counts.get(stage_key, 0) + 1
 
-    sum_max_stage = 0.0
-    sum_fragments = 0.0
-    sum_xp = 0.0
-    sum_run_duration = 0.0
+        sums["fragments"] += float(result.get("total_fragments", 0.0))
+        sums["xp"] += float(result.get("xp_per_run", 0.0))
+        sums["run_duration"] += float(result.get("run_duration_seconds", 1.0))
 
-    n_sims_i = max(0, int(n_sims))
-    for _ in range(n_sims_i):
-        result = sim.simulate_run(
-            stats,
-            int(starting_floor),
-            use_crit=bool(use_crit),
-            enrage_enabled=bool(enrage_enabled),
-            flurry_enabled=bool(flurry_enabled),
-            quake_enabled=bool(quake_enabled),
-            block_cards=block_cards,
-            return_metrics=True,
-            return_block_metrics=False,
-        )
+    sums["stage_counts"] = stage_counts
+    return sums
 
-        max_stage = float(result.get("max_stage_reached", 0.0))
-        sum_max_stage += max_stage
-
-        stage_int = int(max_stage)
-        stage_counts[stage_int] = stage_counts.get(stage_int, 0) + 1
-        if stage_int > max_stage_seen:
-            max_stage_seen = stage_int
-
-        sum_fragments += float(result.get("total_fragments", 0.0))
-        sum_xp += float(result.get("xp_per_run", 0.0))
-        sum_run_duration += float(result.get("run_duration_seconds", 1.0))
-
-    if n_sims_i > 0:
-        avg_max_stage = sum_max_stage / n_sims_i
-        avg_fragments = sum_fragments / n_sims_i
-        avg_xp = sum_xp / n_sims_i
-        avg_run_duration = sum_run_duration / n_sims_i
+
+def stage_summary_from_sums(sums: Dict[str, Any]) -> Dict[str, Any]:
+    """run_stage_sims_summary result from (possibly merged) simulation sums"""
+    runs = sums["runs"]
+    if runs > 0:
+        avg_max_stage = sums["max_stage"] / runs
+        avg_fragments = sums["fragments"] / runs
+        avg_xp = sums["xp"] / runs
+        avg_run_duration = sums["run_duration"] / runs
     else:
         avg_max_stage = 0.0
         avg_fragments = 0.0
@@ -90,16 +141,61 @@ def run_stage_sims_summary(
 
     fragments_per_hour = (avg_fragments * 3600.0 / avg_run_duration) if avg_run_duration > 0 else 0.0
     xp_per_hour = (avg_xp * 3600.0 / avg_run_duration) if avg_run_duration > 0 else 0.0
+    stage_counts = {int(stage): int(count) for stage, count in sums.get("stage_counts", {}).items()}
 
     return {
         "avg_max_stage": float(avg_max_stage),
         "fragments_per_hour": float(fragments_per_hour),
         "xp_per_hour": float(xp_per_hour),
         "stage_counts": stage_counts,
-        "max_stage_seen": int(max_stage_seen),
+        "max_stage_seen": int(max(stage_counts, default=0)),
     }
 
 
+def run_stage_exact_summary(
+    *,
+    stats: Dict[str, Any],
+    starting_floor: int,
+    n_sims: int,
+    use_crit: bool,
+    enrage_enabled: bool,
+    flurry_enabled: bool,
+    quake_enabled: bool,
+    block_cards: Optional[Dict[str, int]],
+    seed: int,
+    cancel_token: Optional[Any] = None,
+    return_partial: bool = False,
+) -> Dict[str, Any]:
+    """
+    Drop-in replacement for run_stage_sims_summary backed by the stage solver.
+
+    avg_max_stage, fragments_per_hour and xp_per_hour are the solver's means
+    (no Monte Carlo noise); stage_counts spreads `n_sims` runs over the solved
+    distribution. Falls back to run_stage_sims_summary (using `seed`) when the
+    solver does not support the abilities (Flurry/Quake) or NumPy is missing.
+    """
+    from .stage_distribution import exact_solver_supported, solve_stage_distribution
+
+    kwargs = dict(
+        stats=stats, starting_floor=starting_floor, n_sims=n_sims, use_crit=use_crit,
+        enrage_enabled=enrage_enabled, flurry_enabled=flurry_enabled, quake_enabled=quake_enabled,
+        block_cards=block_cards, cancel_token=cancel_token, return_partial=return_partial,
+    )
+    if not exact_solver_supported(stats, flurry_enabled=bool(flurry_enabled), quake_enabled=bool(quake_enabled)):
+        return run_stage_sims_summary(seed=seed, **kwargs)
+    if cancel_token is not None and cancel_token.is_set():
+        # The solver itself is not interruptible; just don't start it
+        return _cancelled(stage_summary_from_sums({"runs": 0}), 0, return_partial)
+    dist = solve_stage_distribution(
+        stats,
+        int(starting_floor),
+        use_crit=bool(use_crit),
+        enrage_enabled=bool(enrage_enabled),
+        block_cards=block_cards,
+    )
+    return dist.to_summary(max(1, int(n_sims)))
+
+
 def run_stage_sims_detailed(
     *,
     stats: Dict[str, Any],
@@ -111,6 +207,8 @@ def run_stage_sims_detailed(
     quake_enabled: bool,
     block_cards: Optional[Dict[str, int]],
     seed: int,
+    cancel_token: Optional[Any] = None,
+    return_partial: bool = False,
 ) -> Dict[str, Any]:
     """
     Run `n_sims` archaeology simulations and return per-run samples needed by the UI.
@@ -132,6 +230,11 @@ def run_stage_sims_detailed(
 
     n_sims_i = max(0, int(n_sims))
     for _ in range(n_sims_i):
+        if cancel_token is not None and cancel_token.is_set():
+            return _cancelled(
+                {"max_stage_samples": max_stage_samples, "metrics_samples": metrics_samples},
+                len(max_stage_samples), return_partial,
+            )
         result = sim.simulate_run(
             stats,
             int(starting_floor),
@@ -172,44 +275,85 @@ def run_fragment_sims_summary(
     block_cards: Optional[Dict[str, int]],
     target_frag: str,
     seed: int,
+    cancel_token: Optional[Any] = None,
+    return_partial: bool = False,
 ) -> Dict[str, Any]:
     """
-    Run `n_sims` archaeology simulations and return average target-fragment/hour.
+    Run `n_sims` archaeology simulations and return average target-fragment/hour
+    (result-cached like run_stage_sims_summary).
 
     Returns dict:
       - avg_frag_per_hour: float
     """
-    import random
-
-    random.seed(int(seed) & 0x7FFFFFFF)
+    seed = int(seed) & 0x7FFFFFFF
+    tfrag = str(target_frag)
+    n_sims_i = max(0, int(n_sims))
+    key = result_key(
+        "arch_fragment_sims", stats=stats, starting_floor=int(starting_floor), n_sims=n_sims_i,
+        use_crit=bool(use_crit), enrage_enabled=bool(enrage_enabled), flurry_enabled=bool(flurry_enabled),
+        quake_enabled=bool(quake_enabled), block_cards=block_cards, target_frag=tfrag, seed=seed,
+    )
+    sums = cached_sums(key)
+    if sums is None:
+        import random
 
-    from .monte_carlo_crit import MonteCarloCritSimulator
+        random.seed(seed)
 
-    sim = MonteCarloCritSimulator(seed=int(seed) & 0x7FFFFFFF)
+        from .monte_carlo_crit import MonteCarloCritSimulator
 
-    tfrag = str(target_frag)
-    sum_frags_per_hour = 0.0
-    n_sims_i = max(0, int(n_sims))
+        sim = MonteCarloCritSimulator(seed=seed)
 
-    for _ in range(n_sims_i):
-        result = sim.simulate_run(
+        sum_frags_per_hour = 0.0
+        # Vectorized engine (falls back to simulate_run for small n or without NumPy)
+        results = sim.simulate_runs_batch(
             stats,
             int(starting_floor),
+            n_sims_i,
             use_crit=bool(use_crit),
             enrage_enabled=bool(enrage_enabled),
             flurry_enabled=bool(flurry_enabled),
             quake_enabled=bool(quake_enabled),
             block_cards=block_cards,
-            return_metrics=True,
-            return_block_metrics=False,
+            should_stop=cancel_token.is_set if cancel_token is not None else None,
         )
+        for result in results:
+            fragments = result.get("fragments", {}) or {}
+            target_frag_count = float(fragments.get(tfrag, 0.0))
+            run_duration_seconds = float(result.get("run_duration_seconds", 1.0))
+            runs_per_hour = (3600.0 / run_duration_seconds) if run_duration_seconds > 0 else 0.0
+            sum_frags_per_hour += target_frag_count * runs_per_hour
+        sums = {"runs": len(results), "frag_per_hour": sum_frags_per_hour}
+        if sums["runs"] < n_sims_i:
+            avg = (sum_frags_per_hour / sums["runs"]) if sums["runs"] > 0 else 0.0
+            return _cancelled({"avg_frag_per_hour": float(avg)}, sums["runs"], return_partial)
+        store_sums(key, sums)
+
+    avg_frag_per_hour = (sums["frag_per_hour"] / sums["runs"]) if sums["runs"] > 0 else 0.0
+    return {"avg_frag_per_hour": float(avg_frag_per_hour)}
 
-        fragments = result.get("fragments", {}) or {}
-        target_frag_count = float(fragments.get(tfrag, 0.0))
-        run_duration_seconds = float(result.get("run_duration_seconds", 1.0))
-        runs_per_hour = (3600.0 / run_duration_seconds) if run_duration_seconds > 0 else 0.0
-        sum_frags_per_hour += target_frag_count * runs_per_hour
 
-    avg_frag_per_hour = (sum_frags_per_hour / n_sims_i) if n_sims_i > 0 else 0.0
-    return {"avg_frag_per_hour": float(avg_frag_per_hour)}
+def run_frag_forecast_subtree(
+    *,
+    build: Dict[str, Any],
+    skills: List[str],
+    caps: List[int],
+    prefix: Tuple[int, ...],
+    remaining: int,
+    target_frag_type: str,
+    best_value: float,
+    threshold: float,
+):
+    """
+    Search one subtree of the frag forecast (see ArchaeologyCalculator._search_frag_forecast).
+
+    `build` holds ArchBuild fields; the calculation stage is its starting_floor.
+
+    Returns (best_value, distribution or None, (frags/h, stages/h, xp/h) or None, evaluations).
+    """
+    from .headless import ArchBuild, HeadlessArchaeologySimulator
 
+    sim = HeadlessArchaeologySimulator(ArchBuild(**build))
+    return sim._search_frag_forecast(
+        list(skills), list(caps), tuple(prefix), int(remaining), sim._get_calculation_stage(),
+        str(target_frag_type), float(best_value), float(threshold),
+    )
@@ -6,14 +6,47 @@ crit calculations in the archaeology simulator. It compares runs with crit enabl
 vs disabled to show the actual impact and variance.
 """
 
+import hashlib
 import random
 import math
-from typing import Dict, List, Tuple, Optional
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import statistics
 
-from .block_stats import get_block_at_floor, get_block_mix_for_floor, BlockData
-from .block_spawn_rates import get_normalized_spawn_rates, spawn_block_for_slot
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; simulate_runs_batch falls back to simulate_run
+    np = None
+
+from .block_stats import get_block_at_floor, get_block_mix_for_floor, get_block_arrays, BlockData, BLOCK_TYPES, MIX_STABLE_FROM
+from .block_spawn_rates import EMPTY_SLOT, get_normalized_spawn_rates, sample_floors_slot_types, spawn_block_for_slot
+
+
+# Below this many runs the per-step NumPy overhead outweighs the vectorization gain.
+BATCH_MIN_RUNS = 64
+# Runs simulated (and discarded) to sample realistic ability states for a batch
+BATCH_WARMUP_RUNS = 256
+# Warm-up ability states kept per process, keyed by (build, starting floor, flags)
+BATCH_WARMUP_CACHE_SIZE = 64
+# Lockstep steps between two should_stop() polls of a batch
+BATCH_STOP_CHECK_STEPS = 16
+# simulate_block_kill samples hits from a table once a (build, block, Enrage schedule) was fought this often
+KILL_TABLE_MIN_BLOCKS = 3
+# Blocks that can take more hits than this keep the per-hit loop (table too large to build)
+KILL_TABLE_MAX_HITS = 2000
+
+
+# Warm-up end states shared by every simulator in the process (workers run many
+# small tasks on the same build, so the warm-up is paid once instead of per task)
+_warmup_cache: Dict[str, Dict] = {}
+
+
+def _warmup_key(stats: Dict, starting_floor: int, flags: tuple) -> str:
+    """Stable text key of a warm-up (also seeds it, so it must not depend on hash())"""
+    *switches, block_cards = flags
+    cards = sorted(block_cards.items()) if block_cards else None
+    return repr((sorted(stats.items()), int(starting_floor), tuple(bool(f) for f in switches), cards))
 
 
 @dataclass
@@ -64,6 +97,11 @@ class MonteCarloCritSimulator:
         self.persistent_enrage_state = None
         self.persistent_flurry_cooldown = None
         self.persistent_quake_state = None
+        # Hits-to-kill tables for simulate_block_kill (key -> cumulative list, or None if not worth it)
+        self._kill_tables = {}
+        self._kill_requests = {}
+        # Binomial crit-count tables for Quake splash ((hits, crit_chance) -> cumulative list)
+        self._quake_crit_cdfs = {}
     
     def get_ability_cooldown_multiplier(self, misc_card_level: int = 0) -> float:
         """Get ability cooldown multiplier from misc card: Normal = -3%, Gilded = -6%, Polychrome = -10%"""
@@ -93,6 +131,47 @@ class MonteCarloCritSimulator:
         total_damage = stats['total_damage']  # Base damage only, no Enrage bonus
         return max(1, int(total_damage * 0.20))
     
+    def _quake_crit_cdf(self, hits: int, crit_chance: float) -> List[float]:
+        """
+        Cumulative Binomial(hits, crit_chance): how many of `hits` Quake hits crit on one block.
+        
+        Every hit crits independently per block, so one draw from this table per
+        block replaces rolling every hit.
+        """
+        key = (hits, crit_chance)
+        cdf = self._quake_crit_cdfs.get(key)
+        if cdf is None:
+            log_p, log_q = math.log(crit_chance), math.log1p(-crit_chance)
+            log_n = math.lgamma(hits + 1)
+            cdf, total = [], 0.0
+            for k in range(hits + 1):
+                total += math.exp(log_n - math.lgamma(k + 1) - math.lgamma(hits - k + 1) + k * log_p + (hits - k) * log_q)
+                cdf.append(total)
+            self._quake_crit_cdfs[key] = cdf
+        return cdf
+    
+    def _apply_quake_splash(self, floor_hp: List[int], block_idx: int, hits: int,
+                            quake_damage_per_hit: int, crit_chance: float, crit_damage_mult: float) -> None:
+        """
+        Deal the Quake splash of `hits` hits on block `block_idx` to the blocks still
+        ahead on the floor (killed blocks are never read again), in place.
+        
+        Each block rolls separately for crits: one binomial crit count per block
+        instead of one roll per (block, hit). Quake damage ignores armor.
+        """
+        splash_damage = hits * quake_damage_per_hit
+        crit_bonus = int(quake_damage_per_hit * crit_damage_mult) - quake_damage_per_hit
+        if crit_chance >= 1:
+            splash_damage += hits * crit_bonus
+        cdf = self._quake_crit_cdf(hits, crit_chance) if 0 < crit_chance < 1 and hits > 0 else None
+        for other_idx in range(block_idx + 1, len(floor_hp)):
+            other_hp = floor_hp[other_idx]
+            if other_hp > 0:
+                damage = splash_damage
+                if cdf is not None:
+                    damage += crit_bonus * bisect_left(cdf, random.random() * cdf[-1])
+                floor_hp[other_idx] = max(0, other_hp - damage)
+    
     def simulate_hit_damage(self, stats: Dict, block_armor: int, 
                            is_enrage: bool = False, use_crit: bool = True) -> int:
         """
@@ -151,6 +230,60 @@ class MonteCarloCritSimulator:
         
         return max(1, damage)
     
+    def _kill_table(self, stats: Dict, block_hp: int, block_armor: int, use_crit: bool,
+                    enrage_schedule: Tuple[int, int, int, int]) -> Optional[List[float]]:
+        """
+        Cumulative hits-to-kill distribution of a block (index = hits).
+        
+        `enrage_schedule` is (charges_remaining, normal hits up to the trigger,
+        charges, cooldown) at the first hit; without instacharge it fixes which
+        hits are enraged. Only the hits the block can possibly take matter, so
+        e.g. all states with a long cooldown left share one table.
+        
+        Returns None until the same (build, block, schedule) was requested
+        KILL_TABLE_MIN_BLOCKS times (one-off states, e.g. HP after Quake splash, are
+        cheaper on the per-hit loop), without NumPy, or for blocks that can take
+        more than KILL_TABLE_MAX_HITS hits.
+        """
+        if np is None:
+            return None
+        total_damage = stats['total_damage']
+        effective_armor = max(0, block_armor - stats['armor_pen'])
+        enrage_damage_bonus = stats.get('enrage_damage_bonus', self.ENRAGE_DAMAGE_BONUS)
+        min_damage = max(1, min(int(total_damage - effective_armor),
+                                int(total_damage * (1 + enrage_damage_bonus)) - effective_armor))
+        max_hits = -(-block_hp // min_damage)
+        if max_hits > KILL_TABLE_MAX_HITS:
+            return None
+        charges_remaining, normal_hits, charges, cooldown = enrage_schedule
+        charges_remaining = min(charges_remaining, max_hits)
+        normal_hits = min(normal_hits, max_hits - charges_remaining)
+        if charges_remaining + normal_hits >= max_hits:
+            charges = cooldown = 0  # The block is dead before Enrage triggers
+        key = (
+            block_hp, block_armor, use_crit, charges_remaining, normal_hits, charges, cooldown,
+            total_damage, stats['armor_pen'], stats.get('one_hit_chance', 0),
+            stats.get('crit_chance', 0), stats.get('crit_damage', 1.5),
+            stats.get('super_crit_chance', 0.0), stats.get('ultra_crit_chance', 0.0), stats.get('super_crit_damage', 0.0),
+            enrage_damage_bonus, stats.get('enrage_crit_damage_bonus', self.ENRAGE_CRIT_DAMAGE_BONUS),
+        )
+        if key in self._kill_tables:
+            return self._kill_tables[key]
+        requests = self._kill_requests.get(key, 0) + 1
+        self._kill_requests[key] = requests
+        if requests < KILL_TABLE_MIN_BLOCKS:
+            return None
+        
+        # Same damage tree and Enrage state machine as the per-hit loop (shared with the stage solver)
+        from .stage_distribution import hit_damage_kernels, hits_to_kill_pmf
+        one_hit, normal, enraged = hit_damage_kernels(stats, block_armor, use_crit)
+        schedule_key = ('cycle', charges_remaining, normal_hits, charges, cooldown, 0.0)
+        pmf = hits_to_kill_pmf(block_hp, one_hit, normal, enraged, schedule_key)
+        table = np.cumsum(pmf[:np.flatnonzero(pmf)[-1] + 1]).tolist()
+        self._kill_tables[key] = table
+        del self._kill_requests[key]
+        return table
+    
     def simulate_block_kill(self, stats: Dict, block_hp: int, block_armor: int,
                            block_type: Optional[str] = None, use_crit: bool = True,
                            enrage_state: Optional[Dict] = None, block_cards: Optional[Dict] = None,
@@ -195,6 +328,33 @@ class MonteCarloCritSimulator:
         avada_keda_duration_bonus = stats.get('avada_keda_duration_bonus', 0)
         effective_enrage_charges = self.ENRAGE_CHARGES + avada_keda_duration_bonus
         
+        # Fast path: without instacharge the Enrage state fixes which hits are enraged,
+        # so hits-to-kill can be drawn from a table instead of rolling every hit
+        if ability_instacharge <= 0 and block_hp > 0:
+            charges_remaining = enrage_state['charges_remaining']
+            normal_hits = max(1, enrage_state['cooldown'])  # normal hits up to and including the trigger
+            cdf = self._kill_table(stats, block_hp, block_armor, use_crit,
+                                   (charges_remaining, normal_hits, effective_enrage_charges, enrage_cooldown))
+            if cdf is not None:
+                hits = bisect_left(cdf, random.random() * cdf[-1])
+                # Advance the Enrage state by `hits` hits (same rules as the loop below)
+                if hits <= charges_remaining:
+                    enrage_state['charges_remaining'] -= hits
+                elif hits - charges_remaining < normal_hits:
+                    enrage_state['charges_remaining'] = 0
+                    enrage_state['cooldown'] -= hits - charges_remaining
+                else:
+                    # Triggered, then full cycles of enraged + normal hits
+                    cycle = effective_enrage_charges + max(1, enrage_cooldown)
+                    left = (hits - charges_remaining - normal_hits) % cycle
+                    if left <= effective_enrage_charges:
+                        enrage_state['charges_remaining'] = effective_enrage_charges - left
+                        enrage_state['cooldown'] = enrage_cooldown
+                    else:
+                        enrage_state['charges_remaining'] = 0
+                        enrage_state['cooldown'] = enrage_cooldown - (left - effective_enrage_charges)
+                return hits, enrage_state if enrage_was_enabled else None
+        
         while damage_dealt < block_hp:
             # Check if enrage is available
             is_enrage = False
@@ -383,7 +543,7 @@ class MonteCarloCritSimulator:
                 floor_blocks_by_type = {}
             
             # For Quake: track all blocks on the floor and their HP
-            floor_blocks = []  # List of (block_type, block_data, current_hp)
+            floor_blocks = []  # List of (block_type, block_data, spawn_hp)
             
             # First pass: spawn all blocks
             for slot in range(self.SLOTS_PER_FLOOR):
@@ -407,8 +567,12 @@ class MonteCarloCritSimulator:
                             block_types_spawned[block_type] = 0
                         block_types_spawned[block_type] += 1
             
+            # Current HP per block (Quake splash lowers the HP of blocks not killed yet)
+            floor_hp = [block_hp for _t, _d, block_hp in floor_blocks]
+            
             # Second pass: kill blocks one by one
-            for block_idx, (block_type, block_data, block_hp) in enumerate(floor_blocks):
+            for block_idx, (block_type, block_data, _spawn_hp) in enumerate(floor_blocks):
+                block_hp = floor_hp[block_idx]
                 # Simulate killing this block (pass enrage state and cards, with effective cooldown)
                 hits, enrage_state = self.simulate_block_kill(
                     stats, block_hp, block_data.armor, 
@@ -477,24 +641,10 @@ class MonteCarloCritSimulator:
                         crit_chance = stats.get('crit_chance', 0) if use_crit else 0
                         crit_damage_mult = stats.get('crit_damage', 1.5) if use_crit else 1.0
                         
-                        # Apply quake damage to all other blocks
-                        # Each block rolls separately for crits
-                        for other_idx, (other_type, other_data, other_hp) in enumerate(floor_blocks):
-                            if other_idx != block_idx and other_hp > 0:
-                                # Calculate total quake damage for this block across all hits
-                                # Each hit can crit independently, so we need to simulate per hit
-                                quake_damage_total = 0
-                                for hit in range(hits):
-                                    # Roll for crit on this hit for this block
-                                    is_crit = use_crit and crit_chance > 0 and random.random() < crit_chance
-                                    if is_crit:
-                                        quake_damage_this_hit = int(base_quake_damage_per_hit * crit_damage_mult)
-                                    else:
-                                        quake_damage_this_hit = base_quake_damage_per_hit
-                                    quake_damage_total += quake_damage_this_hit
-                                
-                                # Quake damage ignores armor
-                                floor_blocks[other_idx] = (other_type, other_data, max(0, other_hp - quake_damage_total))
+                        # Splash the blocks still ahead on this floor (ignores armor, crits per block)
+                        self._apply_quake_splash(
+                            floor_hp, block_idx, hits, base_quake_damage_per_hit, crit_chance, crit_damage_mult
+                        )
                         
                         # Update quake charges
                         quake_state['charges_remaining'] -= 1
@@ -641,6 +791,431 @@ class MonteCarloCritSimulator:
         
         return floors_cleared
     
+    def simulate_runs_batch(
+        self,
+        stats: Dict,
+        starting_floor: int,
+        n_runs: int,
+        use_crit: bool = True,
+        enrage_enabled: bool = False,
+        flurry_enabled: bool = False,
+        quake_enabled: bool = False,
+        block_cards: Optional[Dict] = None,
+        rng=None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> List[Dict]:
+        """
+        Vectorized version of simulate_run(..., return_metrics=True) for many runs.
+        
+        All runs advance in lockstep as NumPy arrays: every step, each run that is
+        fighting a block resolves exactly one hit (same rules as simulate_block_kill,
+        including Enrage charges). Block completion (Flurry, Quake splash, XP/loot/
+        stamina mods) and floor spawning are applied to whichever runs reach them.
+        Quake splash draws each other block's crit count from a binomial instead of
+        rolling every hit separately (same distribution).
+        
+        Ability state: the first run starts from this simulator's persisted state
+        (exactly like the next simulate_run call would). The others stand in for the
+        chained runs that would follow it: their start states are drawn from the end
+        states of a short warm-up batch (discarded). The warm-up only depends on
+        (stats, starting_floor, flags) - it has its own RNG seeded from them - so it
+        is cached per process and results do not depend on which tasks ran before.
+        Afterwards the last run's state is persisted.
+        
+        Results follow the same distribution as repeated simulate_run calls, but not
+        the same random stream. Per-block breakdown metrics are not supported.
+        
+        Args:
+            rng: Optional numpy.random.Generator. If None, one is seeded from the
+                global `random` module so random.seed() keeps runs reproducible.
+            should_stop: Optional check polled between runs (every
+                BATCH_STOP_CHECK_STEPS steps in the batch engine). Once it returns
+                True, only the runs finished so far are returned - in a batch those
+                are the shortest ones - and no ability state is persisted.
+        
+        Returns:
+            List of metrics dicts (same keys as simulate_run with return_metrics=True)
+        """
+        n_runs = int(n_runs)
+        if np is None or n_runs < BATCH_MIN_RUNS:
+            results = []
+            for _ in range(n_runs):
+                if should_stop is not None and should_stop():
+                    break
+                results.append(self.simulate_run(
+                    stats, starting_floor, use_crit=use_crit, enrage_enabled=enrage_enabled,
+                    flurry_enabled=flurry_enabled, quake_enabled=quake_enabled,
+                    block_cards=block_cards, return_metrics=True,
+                ))
+            return results
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
+        
+        flags = (use_crit, enrage_enabled, flurry_enabled, quake_enabled, block_cards)
+        start_states = None
+        if enrage_enabled or flurry_enabled or quake_enabled:
+            warm_states = self._warmup_states(stats, starting_floor, flags, should_stop)
+            if warm_states is None:
+                return []
+            pick = rng.integers(0, BATCH_WARMUP_RUNS, size=n_runs)
+            start_states = {key: values[pick] for key, values in warm_states.items()}
+            # First run: same start state as the next simulate_run call
+            enrage_state = self.persistent_enrage_state or {'charges_remaining': 0, 'cooldown': 0}
+            quake_state = self.persistent_quake_state or {'charges_remaining': 0, 'cooldown': 0}
+            start_states['enrage_charges'][0] = enrage_state['charges_remaining']
+            start_states['enrage_cooldown'][0] = enrage_state['cooldown']
+            start_states['quake_charges'][0] = quake_state['charges_remaining']
+            start_states['quake_cooldown'][0] = quake_state['cooldown']
+            if self.persistent_flurry_cooldown is not None:
+                start_states['flurry_cooldown'][0] = self.persistent_flurry_cooldown
+            else:
+                start_states['flurry_cooldown'][0] = int(
+                    (self.FLURRY_COOLDOWN + stats.get('flurry_cooldown', 0) + stats.get('ability_cooldown', 0))
+                    * self.get_ability_cooldown_multiplier(stats.get('misc_card_level', 0))
+                )
+        
+        results, end_states = self._simulate_batch(stats, starting_floor, n_runs, *flags, rng, start_states, should_stop)
+        if len(results) < n_runs:
+            return results
+        
+        # Persist ability states of the last run for the next call
+        last = {key: int(values[-1]) for key, values in end_states.items()}
+        self.persistent_enrage_state = (
+            {'charges_remaining': last['enrage_charges'], 'cooldown': last['enrage_cooldown']} if enrage_enabled else None
+        )
+        self.persistent_flurry_cooldown = last['flurry_cooldown'] if flurry_enabled else None
+        self.persistent_quake_state = (
+            {'charges_remaining': last['quake_charges'], 'cooldown': last['quake_cooldown']} if quake_enabled else None
+        )
+        return results
+    
+    def _warmup_states(self, stats: Dict, starting_floor: int, flags: tuple,
+                       should_stop: Optional[Callable[[], bool]] = None) -> Optional[Dict]:
+        """
+        End ability states of BATCH_WARMUP_RUNS discarded runs (cached per process).
+        
+        Returns None if `should_stop()` interrupted the warm-up (nothing is cached).
+        """
+        key = _warmup_key(stats, starting_floor, flags)
+        states = _warmup_cache.get(key)
+        if states is None:
+            seed = int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "little")
+            warm_results, states = self._simulate_batch(
+                stats, starting_floor, BATCH_WARMUP_RUNS, *flags, np.random.default_rng(seed), None, should_stop,
+            )
+            if len(warm_results) < BATCH_WARMUP_RUNS:
+                return None
+            if len(_warmup_cache) >= BATCH_WARMUP_CACHE_SIZE:
+                del _warmup_cache[next(iter(_warmup_cache))]  # Oldest build first
+            _warmup_cache[key] = states
+        return states
+    
+    def _simulate_batch(self, stats: Dict, starting_floor: int, n: int, use_crit: bool,
+                        enrage_enabled: bool, flurry_enabled: bool, quake_enabled: bool,
+                        block_cards: Optional[Dict], rng, start_states: Optional[Dict],
+                        should_stop: Optional[Callable[[], bool]] = None):
+        """
+        Batch engine behind simulate_runs_batch.
+        
+        Runs without `start_states` start at a random point of each ability's cycle.
+        Returns (metrics dicts, end ability states as arrays); once `should_stop()`
+        returns True the metrics only cover the runs finished so far.
+        """
+        slots = self.SLOTS_PER_FLOOR
+        max_stamina = stats['max_stamina']
+        
+        # --- Scalar parameters (same lookups/defaults as simulate_run / simulate_hit_damage) ---
+        total_damage = stats['total_damage']
+        armor_pen = stats['armor_pen']
+        enrage_damage_bonus = stats.get('enrage_damage_bonus', self.ENRAGE_DAMAGE_BONUS)
+        enrage_total_damage = int(total_damage * (1 + enrage_damage_bonus))
+        one_hit_chance = stats.get('one_hit_chance', 0)
+        crit_chance = stats.get('crit_chance', 0)
+        crit_damage_mult = stats.get('crit_damage', 1.5)
+        enrage_crit_mult = crit_damage_mult * (1 + stats.get('enrage_crit_damage_bonus', self.ENRAGE_CRIT_DAMAGE_BONUS))
+        super_crit_chance = max(0.0, min(1.0, stats.get('super_crit_chance', 0.0)))
+        ultra_crit_chance = max(0.0, min(1.0, stats.get('ultra_crit_chance', 0.0)))
+        super_crit_damage_bonus = max(0.0, stats.get('super_crit_damage', 0.0))
+        super_mult = self.SUPER_CRIT_DMG_MULT_DEFAULT * (1.0 + super_crit_damage_bonus)
+        ultra_mult = self.ULTRA_CRIT_DMG_MULT_DEFAULT * (1.0 + super_crit_damage_bonus)
+        
+        fragment_mult = stats.get('fragment_mult', 1.0)
+        loot_mod_chance = stats.get('loot_mod_chance', 0)
+        loot_mod_multiplier = stats.get('loot_mod_multiplier', 3.5)
+        xp_mult = stats.get('xp_mult', 1.0)
+        exp_mod_chance = stats.get('exp_mod_chance', 0)
+        exp_mod_multiplier = stats.get('exp_mod_gain', 4.0)
+        arch_xp_mult = stats.get('arch_xp_mult', 1.0)
+        stamina_mod_chance = stats.get('stamina_mod_chance', 0)
+        
+        cooldown_multiplier = self.get_ability_cooldown_multiplier(stats.get('misc_card_level', 0))
+        ability_cd = stats.get('ability_cooldown', 0)
+        effective_enrage_cooldown = int((self.ENRAGE_COOLDOWN + stats.get('enrage_cooldown', 0) + ability_cd) * cooldown_multiplier)
+        effective_flurry_cooldown = int((self.FLURRY_COOLDOWN + stats.get('flurry_cooldown', 0) + ability_cd) * cooldown_multiplier)
+        effective_quake_cooldown = int((self.QUAKE_COOLDOWN + stats.get('quake_cooldown', 0) + ability_cd) * cooldown_multiplier)
+        quake_charges = stats.get('quake_charges', self.QUAKE_CHARGES)
+        ability_instacharge = stats.get('ability_instacharge', 0)
+        effective_enrage_charges = self.ENRAGE_CHARGES + stats.get('avada_keda_duration_bonus', 0)
+        flurry_stamina_bonus = self.FLURRY_STAMINA_BONUS + stats.get('flurry_stamina_bonus', 0)
+        quake_base = int(total_damage * self.QUAKE_DAMAGE_MULTIPLIER)
+        quake_crit_chance = crit_chance if (use_crit and crit_chance > 0) else 0.0
+        quake_crit = int(quake_base * crit_damage_mult) if use_crit else quake_base
+        
+        # Card effects per block type (simulate_run applies the HP reduction at spawn and
+        # simulate_block_kill applies it again when the block is fought)
+        card_hp_mult = np.ones(len(BLOCK_TYPES))
+        card_xp_mult = np.ones(len(BLOCK_TYPES))
+        if block_cards:
+            for t, block_type in enumerate(BLOCK_TYPES):
+                card_level = block_cards.get(block_type, 0)
+                if card_level == 1:
+                    card_hp_mult[t], card_xp_mult[t] = 0.90, 1.10
+                elif card_level == 2:
+                    card_hp_mult[t], card_xp_mult[t] = 0.80, 1.20
+        
+        # --- Per-floor block tables (row = min(floor, MIX_STABLE_FROM), column = BLOCK_TYPES index) ---
+        block_arrays = get_block_arrays()
+        effective_armor = np.maximum(0.0, block_arrays.armor - armor_pen)
+        tables = {
+            'in_mix': block_arrays.tier > 0,
+            'hp': np.floor(block_arrays.health * card_hp_mult),
+            'xp': block_arrays.xp,
+            'frag': block_arrays.fragment,
+            'dmg': np.maximum(1.0, np.trunc(total_damage - effective_armor)),
+            'dmg_enrage': np.maximum(1.0, enrage_total_damage - effective_armor),
+        }
+        
+        # --- Per-run state ---
+        floor = np.full(n, int(starting_floor), dtype=np.int64)
+        floors_done = np.zeros(n, dtype=np.int64)  # floor iterations (safety limit 1000)
+        floors_cleared = np.zeros(n)
+        max_stage = np.full(n, int(starting_floor), dtype=np.int64)
+        stamina = np.full(n, float(max_stamina))
+        floor_cost = np.zeros(n)
+        total_hits = np.zeros(n, dtype=np.int64)
+        total_xp = np.zeros(n)
+        fragments = np.zeros((n, len(BLOCK_TYPES)))
+        
+        slot_type = np.zeros((n, slots), dtype=np.int64)
+        slot_hp = np.zeros((n, slots))
+        present = np.zeros((n, slots), dtype=bool)
+        ptr = np.full(n, -1, dtype=np.int64)
+        
+        cur_target = np.zeros(n)
+        cur_dmg = np.zeros(n)
+        cur_dmg_enrage = np.zeros(n)
+        dealt = np.zeros(n)
+        hits = np.zeros(n, dtype=np.int64)
+        
+        def _random_phase(cooldown: int, charges: int, hits_per_charge: float = 1.0):
+            # Uniform position in the (active charges + cooldown) cycle, measured in hits
+            active = max(0, charges) * hits_per_charge
+            pos = rng.uniform(0.0, active + max(1, cooldown), size=n)
+            in_active = pos < active
+            ch = np.where(in_active, charges - (pos / hits_per_charge).astype(np.int64), 0)
+            cd = np.where(in_active, cooldown, np.clip((pos - active).astype(np.int64) + 1, 1, max(1, cooldown)))
+            return ch.astype(np.int64), cd.astype(np.int64)
+        
+        enrage_ch = np.zeros(n, dtype=np.int64)
+        enrage_cd = np.zeros(n, dtype=np.int64)
+        quake_ch = np.zeros(n, dtype=np.int64)
+        quake_cd = np.zeros(n, dtype=np.int64)
+        flurry_cd = np.full(n, effective_flurry_cooldown, dtype=np.int64)
+        if start_states is not None:
+            enrage_ch[:] = start_states['enrage_charges']
+            enrage_cd[:] = start_states['enrage_cooldown']
+            flurry_cd[:] = start_states['flurry_cooldown']
+            quake_ch[:] = start_states['quake_charges']
+            quake_cd[:] = start_states['quake_cooldown']
+        else:
+            if enrage_enabled:
+                enrage_ch, enrage_cd = _random_phase(effective_enrage_cooldown, effective_enrage_charges)
+            if flurry_enabled:
+                flurry_cd = rng.integers(1, max(1, effective_flurry_cooldown) + 1, size=n)
+            if quake_enabled:
+                # Quake charges are spent per block: weight them by the expected hits per block
+                row = min(int(starting_floor), MIX_STABLE_FROM)
+                spawn_rates = get_normalized_spawn_rates(starting_floor)
+                block_probs = np.array([spawn_rates.get(bt, 0.0) for bt in BLOCK_TYPES]) * tables['in_mix'][row]
+                block_hits = np.maximum(1.0, np.ceil(tables['hp'][row] * card_hp_mult / tables['dmg'][row]))
+                hits_per_block = float((block_probs * block_hits).sum() / block_probs.sum()) if block_probs.sum() > 0 else 1.0
+                quake_ch, quake_cd = _random_phase(effective_quake_cooldown, quake_charges, hits_per_block)
+        
+        def _instacharged(idx):
+            if ability_instacharge > 0 and idx.size:
+                return idx[rng.random(idx.size) < ability_instacharge]
+            return idx[:0]
+        
+        def _spawn(idx) -> None:
+            f = np.minimum(floor[idx], MIX_STABLE_FROM)
+            codes = sample_floors_slot_types(floor[idx], slots, rng=rng)
+            types = np.maximum(codes, 0)
+            rows = f[:, None]
+            present[idx] = (codes != EMPTY_SLOT) & tables['in_mix'][rows, types]
+            slot_type[idx] = types
+            slot_hp[idx] = tables['hp'][rows, types]
+            floor_cost[idx] = 0.0
+            ptr[idx] = -1
+        
+        def _finish_block(idx, block_hits) -> None:
+            t = slot_type[idx, ptr[idx]]
+            floor_cost[idx] += block_hits
+            total_hits[idx] += block_hits
+            
+            if flurry_enabled:
+                flurry_cd[idx] -= block_hits
+                trig = idx[flurry_cd[idx] <= 0]
+                stamina[trig] = np.minimum(max_stamina, stamina[trig] + flurry_stamina_bonus)
+                flurry_cd[trig] = effective_flurry_cooldown
+                again = _instacharged(trig)
+                stamina[again] = np.minimum(max_stamina, stamina[again] + flurry_stamina_bonus)
+            
+            f = np.minimum(floor[idx], MIX_STABLE_FROM)
+            not_dirt = t != 0
+            nd, nd_t, nd_f = idx[not_dirt], t[not_dirt], f[not_dirt]
+            exp_mult = np.where(rng.random(nd.size) < exp_mod_chance, exp_mod_multiplier, 1.0)
+            total_xp[nd] += tables['xp'][nd_f, nd_t] * xp_mult * card_xp_mult[nd_t] * exp_mult * arch_xp_mult
+            
+            if quake_enabled:
+                active = quake_ch[idx] > 0
+                q_idx, q_hits = idx[active], block_hits[active]
+                if q_idx.size:
+                    later = np.arange(slots)[None, :] > ptr[q_idx][:, None]
+                    targets = present[q_idx] & later & (slot_hp[q_idx] > 0)
+                    splash = q_hits[:, None] * float(quake_base)
+                    if quake_crit_chance > 0:
+                        crits = rng.binomial(np.broadcast_to(q_hits[:, None], targets.shape), quake_crit_chance)
+                        splash = splash + crits * float(quake_crit - quake_base)
+                    slot_hp[q_idx] = np.where(targets, np.maximum(0.0, slot_hp[q_idx] - splash), slot_hp[q_idx])
+                    quake_ch[q_idx] -= 1
+                    spent = q_idx[quake_ch[q_idx] <= 0]
+                    quake_cd[spent] = effective_quake_cooldown
+                w_idx = idx[~active]
+                quake_cd[w_idx] -= block_hits[~active]
+                trig = w_idx[quake_cd[w_idx] <= 0]
+                quake_ch[trig] = quake_charges
+                quake_cd[trig] = effective_quake_cooldown
+                quake_ch[_instacharged(trig)] += quake_charges
+            
+            loot_mult = np.where(rng.random(nd.size) < loot_mod_chance, loot_mod_multiplier, 1.0)
+            fragments[nd, nd_t] += tables['frag'][nd_f, nd_t] * fragment_mult * loot_mult
+            
+            mod = idx[rng.random(idx.size) < stamina_mod_chance]
+            if mod.size:
+                stamina[mod] = np.minimum(max_stamina, stamina[mod] + rng.uniform(3, 10, size=mod.size))
+        
+        def _end_floor(idx):
+            """Floor finished for `idx`; returns the runs that continue on a new floor."""
+            cost = floor_cost[idx]
+            cleared = stamina[idx] >= cost
+            up, stop = idx[cleared], idx[~cleared]
+            stamina[up] -= floor_cost[up]
+            floors_cleared[up] += 1
+            floor[up] += 1
+            max_stage[up] = floor[up]
+            floors_done[up] += 1
+            partial = stop[floor_cost[stop] > 0]
+            floors_cleared[partial] += stamina[partial] / floor_cost[partial]
+            up = up[floors_done[up] < 1000]
+            if up.size:
+                _spawn(up)
+            return up
+        
+        def _advance(idx):
+            """Move `idx` to their next block; returns (runs now fighting a block, runs to advance again)."""
+            later = np.arange(slots)[None, :] > ptr[idx][:, None]
+            candidates = present[idx] & later
+            has_next = candidates.any(axis=1)
+            again = _end_floor(idx[~has_next])
+            
+            b = idx[has_next]
+            if not b.size:
+                return b, again
+            ptr[b] = candidates[has_next].argmax(axis=1)
+            t = slot_type[b, ptr[b]]
+            f = np.minimum(floor[b], MIX_STABLE_FROM)
+            cur_target[b] = np.floor(slot_hp[b, ptr[b]] * card_hp_mult[t])
+            cur_dmg[b] = tables['dmg'][f, t]
+            cur_dmg_enrage[b] = tables['dmg_enrage'][f, t]
+            dealt[b] = 0.0
+            hits[b] = 0
+            if not enrage_enabled:
+                # simulate_block_kill starts every block from a fresh Enrage state in this case
+                enrage_ch[b] = 0
+                enrage_cd[b] = 0
+            dead = cur_target[b] <= 0
+            if dead.any():
+                _finish_block(b[dead], hits[b[dead]])
+                again = np.concatenate([again, b[dead]])
+            return b[~dead], again
+        
+        fighting = np.arange(n)
+        _spawn(fighting)
+        pending = fighting
+        fighting = fighting[:0]
+        finished_runs = range(n)
+        step = 0
+        while True:
+            while pending.size:
+                ready, pending = _advance(pending)
+                fighting = np.concatenate([fighting, ready])
+            if not fighting.size:
+                break
+            step += 1
+            if should_stop is not None and step % BATCH_STOP_CHECK_STEPS == 0 and should_stop():
+                # Every unfinished run is mid-block here
+                finished_runs = np.setdiff1d(np.arange(n), fighting)
+                break
+            
+            b = fighting
+            # Enrage: spend a charge, or tick the cooldown and (re)trigger
+            is_enrage = enrage_ch[b] > 0
+            enrage_ch[b[is_enrage]] -= 1
+            ticking = b[~is_enrage]
+            enrage_cd[ticking] -= 1
+            trig = ticking[enrage_cd[ticking] <= 0]
+            enrage_ch[trig] = effective_enrage_charges
+            enrage_cd[trig] = effective_enrage_cooldown
+            enrage_ch[_instacharged(trig)] += effective_enrage_charges
+            
+            damage = np.where(is_enrage, cur_dmg_enrage[b], cur_dmg[b])
+            if use_crit:
+                u = rng.random((4, b.size))
+                mult = np.where(is_enrage, enrage_crit_mult, crit_damage_mult)
+                tier_mult = np.where(u[2] < super_crit_chance, np.where(u[3] < ultra_crit_chance, ultra_mult, super_mult), 1.0)
+                crit_damage = np.maximum(1.0, np.floor(damage * mult * tier_mult))
+                damage = np.where(u[1] < crit_chance, crit_damage, damage)
+                damage = np.where(u[0] < one_hit_chance, 999999.0, damage)
+            dealt[b] += damage
+            hits[b] += 1
+            
+            done = (dealt[b] >= cur_target[b]) | (hits[b] > 10000)
+            if done.any():
+                finished = b[done]
+                _finish_block(finished, hits[finished])
+                pending = finished
+                fighting = b[~done]
+        
+        frag_types = BLOCK_TYPES[1:]
+        results = []
+        for i in finished_runs:
+            frags = {bt: float(fragments[i, t]) for t, bt in enumerate(BLOCK_TYPES) if bt in frag_types}
+            results.append({
+                'floors_cleared': float(floors_cleared[i]) if floors_cleared[i] % 1 else int(floors_cleared[i]),
+                'max_stage_reached': int(max_stage[i]),
+                'starting_floor': starting_floor,
+                'fragments': frags,
+                'total_fragments': sum(frags.values()),
+                'xp_per_run': float(total_xp[i]),
+                'run_duration_seconds': max(1.0, float(total_hits[i])),
+                'total_hits': int(total_hits[i]),
+            })
+        end_states = {
+            'enrage_charges': enrage_ch, 'enrage_cooldown': enrage_cd, 'flurry_cooldown': flurry_cd,
+            'quake_charges': quake_ch, 'quake_cooldown': quake_cd,
+        }
+        return results, end_states
+    
     def run_comparison(self, stats: Dict, starting_floor: int,
                       num_simulations: int = 1000,
                       enrage_enabled: bool = False,
@@ -0,0 +1,408 @@
+"""
+Deterministic max-stage distribution solver for archaeology runs.
+
+Apart from the abilities, every random event in a run is independent of the
+stamina left: which blocks spawn, how many hits each block takes (one-hit,
+crit, super and ultra crit rolls) and which blocks drop a stamina mod. Instead
+of sampling runs, this module propagates the stamina distribution floor by
+floor:
+
+- Hits to kill a block: exact distribution from a DP over damage dealt.
+- Floor cost: the spawned block count is binomial over the 24 slots, and the
+  cost of n blocks is the n-fold convolution of the per-block hits distribution.
+- Stamina mods only add stamina during the floor (capped at max stamina), and
+  the floor is cleared if the stamina after mods covers the floor cost. Given
+  the block count, cost and mod gains are independent, so each block count is
+  a capped convolution followed by a shifted convolution.
+
+Mod gains are uniform(3, 10) in the simulator. On the stamina grid they are
+spread over the neighbouring grid points (mean preserved). Enrage follows
+simulate_block_kill: when it is disabled every block starts from an empty
+Enrage state (its first hit triggers the charges), which is exact. When it is
+enabled the state carries over between blocks, and each hit is enraged with
+the long-run share of enraged hits instead of tracking the cooldown phase
+(within ~1% of Monte Carlo on the average max stage). Flurry and Quake couple
+blocks within a floor and are not supported (callers fall back to Monte Carlo).
+
+XP, fragments and hits on a floor do not depend on stamina either (the last,
+failed floor counts in full, like in simulate_run), so their run averages are
+the expected floor yield weighted by the probability of reaching each floor.
+"""
+
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # The solver needs NumPy; callers fall back to Monte Carlo
+    np = None
+
+from .block_stats import get_block_mix_for_floor
+from .block_spawn_rates import get_spawn_table, BLOCK_TYPES
+from .monte_carlo_crit import MonteCarloCritSimulator
+
+
+# Stamina grid points per stamina point (mod gains are fractional)
+DEFAULT_RESOLUTION = 2
+
+# Stop once the probability of still running drops below this
+DEFAULT_MIN_MASS = 1e-12
+
+# Same safety limits as simulate_run / simulate_block_kill
+MAX_FLOORS = 1000
+MAX_BLOCK_HITS = 10001
+
+# Stamina mod gain range (random.uniform(3, 10) in simulate_run)
+STAMINA_MOD_GAIN_RANGE = (3, 10)
+
+FRAGMENT_TYPES = ('common', 'rare', 'epic', 'legendary', 'mythic')
+
+_MC = MonteCarloCritSimulator
+
+
+@dataclass
+class StageDistribution:
+    """Distribution of the max stage reached in an archaeology run"""
+    # (max_stage_reached, probability) sorted by stage
+    outcomes: List[Tuple[int, float]] = field(default_factory=list)
+    avg_max_stage: float = 0.0
+    avg_xp: float = 0.0
+    avg_fragments: Dict[str, float] = field(default_factory=dict)
+    avg_run_duration: float = 1.0
+
+    def probability_to_reach(self, stage: int) -> float:
+        """Probability that a run ends at or beyond `stage`"""
+        return sum(p for s, p in self.outcomes if s >= stage)
+
+    def stage_counts(self, runs: int) -> Dict[int, int]:
+        """
+        Express the distribution as max-stage counts of `runs` runs.
+
+        Counts come from `runs` evenly spaced quantiles, so they always add up
+        to `runs` and stages below 1/runs probability may not show up.
+        """
+        runs = max(1, int(runs))
+        counts: Dict[int, int] = {}
+        if not self.outcomes:
+            return counts
+        total = sum(p for _s, p in self.outcomes)
+        cumulative = 0.0
+        cell = 0
+        for i in range(runs):
+            u = (i + 0.5) / runs * total
+            while cell < len(self.outcomes) - 1 and cumulative + self.outcomes[cell][1] < u:
+                cumulative += self.outcomes[cell][1]
+                cell += 1
+            stage = self.outcomes[cell][0]
+            counts[stage] = counts.get(stage, 0) + 1
+        return counts
+
+    def to_summary(self, runs: int) -> Dict[str, object]:
+        """Same keys as mc_parallel.run_stage_sims_summary"""
+        counts = self.stage_counts(runs)
+        hours = self.avg_run_duration / 3600.0
+        return {
+            "avg_max_stage": float(self.avg_max_stage),
+            "fragments_per_hour": float(sum(self.avg_fragments.values()) / hours) if hours > 0 else 0.0,
+            "xp_per_hour": float(self.avg_xp / hours) if hours > 0 else 0.0,
+            "stage_counts": counts,
+            "max_stage_seen": int(max(counts)) if counts else 0,
+        }
+
+
+def exact_solver_supported(stats: Dict, flurry_enabled: bool = False, quake_enabled: bool = False) -> bool:
+    """Whether solve_stage_distribution can handle these stats/abilities"""
+    if np is None or flurry_enabled or quake_enabled:
+        return False
+    return stats.get('max_stamina', 0) > 0 and stats.get('total_damage', 0) > 0
+
+
+def _chance(p: float) -> float:
+    """Probability of `random.random() < p`"""
+    return min(1.0, max(0.0, p))
+
+
+def hit_damage_kernels(stats: Dict, block_armor: int, use_crit: bool) -> Tuple[float, tuple, tuple]:
+    """
+    Damage distribution of a single hit (simulate_hit_damage).
+
+    Returns (one_hit_probability, normal_kernel, enraged_kernel) with kernels
+    as ((damage, probability), ...) over the hits that are not one-hits.
+    """
+    effective_armor = max(0, block_armor - stats['armor_pen'])
+    base = max(1, int(stats['total_damage'] - effective_armor))
+    enrage_total = int(stats['total_damage'] * (1 + stats.get('enrage_damage_bonus', _MC.ENRAGE_DAMAGE_BONUS)))
+    enrage_base = max(1, enrage_total - effective_armor)
+    crit_mult = stats.get('crit_damage', 1.5)
+    enrage_crit_mult = crit_mult * (1 + stats.get('enrage_crit_damage_bonus', _MC.ENRAGE_CRIT_DAMAGE_BONUS))
+    if not use_crit:
+        return 0.0, ((base, 1.0),), ((enrage_base, 1.0),)
+
+    one_hit = _chance(stats.get('one_hit_chance', 0))
+    crit = _chance(stats.get('crit_chance', 0))
+    super_crit = max(0.0, min(1.0, stats.get('super_crit_chance', 0.0)))
+    ultra_crit = max(0.0, min(1.0, stats.get('ultra_crit_chance', 0.0)))
+    super_bonus = max(0.0, stats.get('super_crit_damage', 0.0))
+    super_mult = _MC.SUPER_CRIT_DMG_MULT_DEFAULT * (1.0 + super_bonus)
+    ultra_mult = _MC.ULTRA_CRIT_DMG_MULT_DEFAULT * (1.0 + super_bonus)
+
+    def _kernel(b: int, mult: float) -> tuple:
+        damages: Dict[int, float] = {}
+        for damage, prob in ((b, 1.0 - crit),
+                             (int(b * mult), crit * (1.0 - super_crit)),
+                             (int(b * mult * super_mult), crit * super_crit * (1.0 - ultra_crit)),
+                             (int(b * mult * ultra_mult), crit * super_crit * ultra_crit)):
+            if prob > 0:
+                damage = max(1, damage)
+                damages[damage] = damages.get(damage, 0.0) + prob * (1.0 - one_hit)
+        return tuple(sorted(damages.items()))
+
+    return one_hit, _kernel(base, crit_mult), _kernel(enrage_base, enrage_crit_mult)
+
+
+def _enrage_schedule_key(stats: Dict, enrage_enabled: bool) -> tuple:
+    """Hashable description of which hits of a block are enraged"""
+    cooldown_multiplier = _MC().get_ability_cooldown_multiplier(stats.get('misc_card_level', 0))
+    cooldown = int((_MC.ENRAGE_COOLDOWN + stats.get('enrage_cooldown', 0) + stats.get('ability_cooldown', 0))
+                   * cooldown_multiplier)
+    charges = _MC.ENRAGE_CHARGES + stats.get('avada_keda_duration_bonus', 0)
+    instacharge = _chance(stats.get('ability_instacharge', 0))
+    if enrage_enabled:
+        # The state carries over between blocks: use the long-run share of enraged hits
+        # (cycle: `cooldown` normal hits, then the charges)
+        expected_charges = charges * (1 + instacharge)
+        return ('stationary', expected_charges / (max(1, cooldown) + expected_charges))
+    return ('cycle', 0, 0, charges, cooldown, instacharge)
+
+
+@lru_cache(maxsize=1024)
+def enrage_probabilities(schedule_key: tuple) -> "np.ndarray":
+    """
+    e[k] = probability that hit k of a block is enraged.
+
+    ('stationary', p) enrages every hit with probability p.
+    ('cycle', charges_remaining, cooldown_left, charges, cooldown, instacharge)
+    follows simulate_block_kill's Enrage state machine from the given state.
+    Without Enrage, simulate_block_kill still starts every block from an empty
+    Enrage state, so its first hit triggers Enrage for the next hits.
+    """
+    if schedule_key[0] == 'stationary':
+        return np.full(MAX_BLOCK_HITS + 1, schedule_key[1])
+    _kind, charges_remaining, cooldown_left, charges, cooldown, instacharge = schedule_key
+    if instacharge <= 0:
+        # Deterministic: remaining charges, normal hits up to the trigger, then
+        # `charges` enraged + `cooldown` normal hits per cycle
+        e = np.zeros(MAX_BLOCK_HITS + 1)
+        e[1:charges_remaining + 1] = 1.0
+        start = charges_remaining + max(1, cooldown_left) + 1
+        if start <= MAX_BLOCK_HITS:
+            e[start:] = (np.arange(MAX_BLOCK_HITS + 1 - start) % (charges + max(1, cooldown))) < charges
+        return e
+    e = np.zeros(MAX_BLOCK_HITS + 1)
+    states = {(charges_remaining, cooldown_left): 1.0}  # (charges_remaining, cooldown) -> probability
+    for k in range(1, MAX_BLOCK_HITS + 1):
+        nxt: Dict[Tuple[int, int], float] = {}
+        for (ch, cd), prob in states.items():
+            if ch > 0:
+                e[k] += prob
+                outcomes = (((ch - 1, cd), 1.0),)
+            elif cd - 1 > 0:
+                outcomes = (((0, cd - 1), 1.0),)
+            else:
+                outcomes = (((charges, cooldown), 1.0 - instacharge), ((2 * charges, cooldown), instacharge))
+            for key, p in outcomes:
+                if p > 0:
+                    nxt[key] = nxt.get(key, 0.0) + prob * p
+        states = nxt
+    return e
+
+
+@lru_cache(maxsize=1024)
+def hits_to_kill_pmf(block_hp: int, one_hit: float, normal: tuple, enraged: tuple,
+                     schedule_key: tuple) -> "np.ndarray":
+    """p[k] = probability that simulate_block_kill takes k hits (Enrage per enrage_probabilities)"""
+    pmf = np.zeros(MAX_BLOCK_HITS + 1)
+    if block_hp <= 0:
+        pmf[0] = 1.0
+        return pmf
+    enrage = enrage_probabilities(schedule_key)
+    # alive[d] = P(d damage dealt so far and block still alive)
+    alive = np.zeros(block_hp)
+    alive[0] = 1.0
+    min_damage = min(normal[0][0], enraged[0][0])
+    for k in range(1, MAX_BLOCK_HITS + 1):
+        # After k-1 hits at least (k-1) * min_damage is dealt
+        lo = min(block_hp, (k - 1) * min_damage)
+        mass = alive[lo:].sum()
+        if mass < DEFAULT_MIN_MASS:
+            break
+        nxt = np.zeros(block_hp)
+        killed = one_hit * mass
+        for kernel, weight in ((normal, 1.0 - enrage[k]), (enraged, enrage[k])):
+            if weight <= 0:
+                continue
+            for damage, prob in kernel:
+                prob *= weight
+                if damage >= block_hp - lo:
+                    killed += prob * mass
+                    continue
+                nxt[lo + damage:] += prob * alive[lo:block_hp - damage]
+                killed += prob * alive[block_hp - damage:].sum()
+        pmf[k] = killed
+        alive = nxt
+    else:
+        pmf[MAX_BLOCK_HITS] += alive.sum()  # simulate_block_kill gives up here
+    return pmf
+
+
+def _gain_pmf(stamina_mod_chance: float, resolution: int) -> "np.ndarray":
+    """Stamina gained from one killed block, on the stamina grid"""
+    lo, hi = STAMINA_MOD_GAIN_RANGE
+    width = (hi - lo) * resolution
+    pmf = np.zeros(hi * resolution + 1)
+    pmf[0] = 1.0 - stamina_mod_chance
+    # Uniform density spread linearly onto grid points: half weight at the ends
+    spread = np.full(width + 1, 1.0 / width)
+    spread[[0, -1]] *= 0.5
+    pmf[lo * resolution:] += stamina_mod_chance * spread
+    return pmf
+
+
+def solve_stage_distribution(stats: Dict, starting_floor: int, use_crit: bool = True,
+                             enrage_enabled: bool = False, block_cards: Optional[Dict[str, int]] = None,
+                             resolution: int = DEFAULT_RESOLUTION,
+                             min_mass: float = DEFAULT_MIN_MASS) -> StageDistribution:
+    """
+    Solve the distribution of max stage reached for one run from `starting_floor`.
+
+    Same model as MonteCarloCritSimulator.simulate_run without Flurry/Quake
+    (see the module docstring for the approximations).
+
+    Args:
+        stats: Stats dict as passed to simulate_run
+        resolution: Stamina grid points per stamina point
+        min_mass: Stop once the probability of still running drops below this
+
+    Returns:
+        StageDistribution with outcomes and run averages
+    """
+    if np is None:
+        raise ImportError("solve_stage_distribution requires NumPy")
+    resolution = max(1, int(resolution))
+    max_stamina = stats['max_stamina']
+    size = int(math.floor(max_stamina * resolution)) + 1
+    max_hits = (size - 1) // resolution
+    schedule_key = _enrage_schedule_key(stats, enrage_enabled)
+    stamina_mod_chance = _chance(stats.get('stamina_mod_chance', 0))
+    gain = _gain_pmf(stamina_mod_chance, resolution) if stamina_mod_chance > 0 else None
+
+    fragment_mult = stats.get('fragment_mult', 1.0)
+    loot_mult = 1 + _chance(stats.get('loot_mod_chance', 0)) * (stats.get('loot_mod_multiplier', 3.5) - 1)
+    exp_mult = 1 + _chance(stats.get('exp_mod_chance', 0)) * (stats.get('exp_mod_gain', 4.0) - 1)
+    xp_scale = stats.get('xp_mult', 1.0) * stats.get('arch_xp_mult', 1.0) * exp_mult
+    card_levels = block_cards or {}
+
+    floor_cache: Dict[tuple, tuple] = {}
+
+    def _floor_model(floor: int):
+        """(cost spectra per block count, avg hits, avg xp, avg fragments) of a floor"""
+        mix = get_block_mix_for_floor(floor)
+        table = get_spawn_table(floor)
+        spawn = min(1.0, table.total_spawn_chance / 100.0)
+        blocks = []
+        start = 0.0
+        for code, cumulative in zip(table.type_codes, table.cumulative):
+            block_type = BLOCK_TYPES[code]
+            weight = spawn * (cumulative - start)
+            start = cumulative
+            block = mix.get(block_type)
+            if block is not None and weight > 0:
+                blocks.append((block_type, block, weight))
+        key = tuple((block_type, block.tier, weight) for block_type, block, weight in blocks)
+        if key in floor_cache:
+            return floor_cache[key]
+
+        present = sum(weight for _t, _b, weight in blocks)
+        per_block = np.zeros(max_hits + 1)
+        avg_hits = avg_xp = 0.0
+        avg_fragments = dict.fromkeys(FRAGMENT_TYPES, 0.0)
+        for block_type, block, weight in blocks:
+            card_level = card_levels.get(block_type, 0)
+            card_hp, card_xp = {1: (0.90, 1.10), 2: (0.80, 1.20)}.get(card_level, (1.0, 1.0))
+            # simulate_run applies the card HP reduction at spawn and simulate_block_kill again
+            block_hp = int(int(block.health * card_hp) * card_hp)
+            one_hit, normal, enraged = hit_damage_kernels(stats, block.armor, use_crit)
+            hits = hits_to_kill_pmf(block_hp, one_hit, normal, enraged, schedule_key)
+            # Blocks needing more hits than max stamina can never be paid for
+            per_block += (weight / present) * hits[:max_hits + 1]
+            avg_hits += weight * float(np.dot(np.arange(hits.size), hits))
+            if block_type != 'dirt':
+                avg_xp += weight * block.xp * card_xp * xp_scale
+                if block_type in avg_fragments:
+                    avg_fragments[block_type] += weight * block.fragment * fragment_mult * loot_mult
+
+        slots = _MC.SLOTS_PER_FLOOR
+        # Row n: P(n blocks) * reversed cost pmf of n blocks on the stamina grid
+        costs = np.zeros((slots + 1, size))
+        cost = np.zeros(max_hits + 1)
+        cost[0] = 1.0
+        for n in range(slots + 1):
+            if n > 0:
+                cost = np.convolve(cost, per_block)[:max_hits + 1]
+            costs[n, ::resolution] = math.comb(slots, n) * present ** n * (1 - present) ** (slots - n) * cost
+        model = (np.fft.rfft(costs[:, ::-1], nfft, axis=1), slots * avg_hits, slots * avg_xp,
+                 {t: slots * v for t, v in avg_fragments.items()})
+        floor_cache[key] = model
+        return model
+
+    # All convolutions of a floor run in the frequency domain, batched over the block count
+    nfft = 1 << max(2 * size - 2, size + STAMINA_MOD_GAIN_RANGE[1] * resolution * _MC.SLOTS_PER_FLOOR - 1).bit_length()
+    gain_spectra = None
+    if gain is not None:
+        gain_spectra = np.fft.rfft(gain, nfft) ** np.arange(_MC.SLOTS_PER_FLOOR + 1)[:, None]
+
+    stamina = np.zeros(size)
+    stamina[-1] = 1.0
+    ended: Dict[int, float] = {}
+    total_hits = total_xp = 0.0
+    total_fragments = dict.fromkeys(FRAGMENT_TYPES, 0.0)
+    floor = int(starting_floor)
+    for _ in range(MAX_FLOORS):
+        alive = float(stamina.sum())
+        if alive < min_mass:
+            break
+        cost_spectra, avg_hits, avg_xp, avg_fragments = _floor_model(floor)
+        total_hits += alive * avg_hits
+        total_xp += alive * avg_xp
+        for t, v in avg_fragments.items():
+            total_fragments[t] += alive * v
+
+        spectrum = np.fft.rfft(stamina, nfft)
+        if gain_spectra is not None:
+            # Mods add stamina during the floor, capped at max stamina (row n: n blocks killed)
+            available = np.fft.irfft(spectrum * gain_spectra, nfft, axis=1)
+            available[:, size - 1] += available[:, size:].sum(axis=1)
+            spectrum = np.fft.rfft(available[:, :size], nfft, axis=1)
+        # after[s] = sum_n P(n) * sum_h available_n[s + h] * cost_n[h]
+        after = np.fft.irfft((spectrum * cost_spectra).sum(axis=0), nfft)[size - 1:2 * size - 1]
+        after = np.maximum(after, 0.0)  # FFT rounding
+        ended[floor] = ended.get(floor, 0.0) + max(0.0, alive - float(after.sum()))
+        stamina = after
+        floor += 1
+    else:
+        ended[floor] = ended.get(floor, 0.0) + float(stamina.sum())
+
+    total = sum(ended.values()) or 1.0
+    result = StageDistribution()
+    for stage in sorted(ended):
+        prob = ended[stage] / total
+        if prob <= 0:
+            continue
+        result.outcomes.append((stage, prob))
+        result.avg_max_stage += stage * prob
+    result.avg_xp = total_xp / total
+    result.avg_fragments = {t: v / total for t, v in total_fragments.items()}
+    result.avg_run_duration = max(1.0, total_hits / total)
+    return result
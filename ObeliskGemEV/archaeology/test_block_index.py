@@ -0,0 +1,63 @@
+"""
+Test script to verify the dense floor -> block mix index matches the tier ranges
+"""
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.archaeology.block_stats import (
+    BLOCK_DATA, BLOCK_TYPES, MIX_STABLE_FROM, get_block_arrays, get_block_mix_for_floor,
+    get_tier_transition_floors,
+)
+
+
+def _scan_mix(floor):
+    """Highest tier per type whose floor range contains `floor` (the original lookup)"""
+    mix = {}
+    for block in BLOCK_DATA:
+        if block.floor_min <= floor <= block.floor_max:
+            current = mix.get(block.block_type)
+            if current is None or block.tier > current.tier:
+                mix[block.block_type] = block
+    return mix
+
+
+def test_index_matches_tier_ranges():
+    """Every floor around every tier transition resolves to the same blocks"""
+    floors = set(range(1, MIX_STABLE_FROM + 5)) | {100, 1000}
+    for transition in get_tier_transition_floors():
+        floors |= {transition - 1, transition, transition + 1}
+    for floor in sorted(f for f in floors if f >= 1):
+        assert get_block_mix_for_floor(floor) == _scan_mix(floor), floor
+    print("✓ Block mix index matches tier ranges")
+
+
+def test_block_arrays_match_mix():
+    """Struct-of-arrays view agrees with the per-floor mix"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("NumPy not installed, skipping")
+        return
+    arrays = get_block_arrays()
+    for floor in (1, 12, 35, MIX_STABLE_FROM, 500):
+        row = min(floor, MIX_STABLE_FROM)
+        mix = get_block_mix_for_floor(floor)
+        for col, block_type in enumerate(BLOCK_TYPES):
+            block = mix.get(block_type)
+            if block is None:
+                assert arrays.tier[row, col] == 0
+                continue
+            assert arrays.tier[row, col] == block.tier
+            assert arrays.health[row, col] == block.health
+            assert arrays.armor[row, col] == block.armor
+            assert arrays.xp[row, col] == block.xp
+            assert arrays.fragment[row, col] == block.fragment
+    print("✓ Block arrays match block mix")
+
+
+if __name__ == "__main__":
+    test_index_matches_tier_ranges()
+    test_block_arrays_match_mix()
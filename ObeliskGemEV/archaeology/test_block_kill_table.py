@@ -0,0 +1,71 @@
+"""
+Test script to verify table-sampled block kills against the per-hit loop
+"""
+import random
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.archaeology import monte_carlo_crit
+from ObeliskGemEV.archaeology.monte_carlo_crit import MonteCarloCritSimulator
+
+
+STATS = {
+    'total_damage': 36,
+    'armor_pen': 12,
+    'max_stamina': 150,
+    'crit_chance': 0.3,
+    'crit_damage': 2.4,
+    'one_hit_chance': 0.004,
+    'super_crit_chance': 0.1,
+    'ultra_crit_chance': 0.2,
+}
+
+
+def _kill_samples(min_blocks, start_state, blocks=20000):
+    """Mean hits and end-state frequencies of `blocks` kills of the same block"""
+    saved = monte_carlo_crit.KILL_TABLE_MIN_BLOCKS
+    monte_carlo_crit.KILL_TABLE_MIN_BLOCKS = min_blocks
+    try:
+        random.seed(7)
+        sim = MonteCarloCritSimulator()
+        total_hits = 0
+        end_states = {}
+        for _ in range(blocks):
+            state = dict(start_state)
+            hits, state = sim.simulate_block_kill(STATS, 400, 20, enrage_state=state)
+            total_hits += hits
+            end = (state['charges_remaining'], state['cooldown'])
+            end_states[end] = end_states.get(end, 0) + 1
+        return total_hits / blocks, {k: v / blocks for k, v in end_states.items()}, len(sim._kill_tables)
+    finally:
+        monte_carlo_crit.KILL_TABLE_MIN_BLOCKS = saved
+
+
+def test_table_matches_per_hit_loop():
+    """Hits and the Enrage state after the block should follow the same distribution"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("NumPy not installed, skipping")
+        return
+    print("=" * 60)
+    print("Block Kill Table vs Per-Hit Loop")
+    print("=" * 60)
+    for start_state in ({'charges_remaining': 0, 'cooldown': 0},
+                        {'charges_remaining': 3, 'cooldown': 60},
+                        {'charges_remaining': 0, 'cooldown': 5}):
+        table_hits, table_states, tables = _kill_samples(1, start_state)
+        loop_hits, loop_states, _ = _kill_samples(10 ** 9, start_state)
+        print(f"{start_state}: table {table_hits:.3f} hits, loop {loop_hits:.3f} hits")
+        assert tables > 0
+        assert abs(table_hits - loop_hits) < 0.05 * loop_hits
+        for end in set(table_states) | set(loop_states):
+            assert abs(table_states.get(end, 0.0) - loop_states.get(end, 0.0)) < 0.02
+    print("\n✓ Block kill table matches per-hit loop")
+
+
+if __name__ == "__main__":
+    test_table_matches_per_hit_loop()
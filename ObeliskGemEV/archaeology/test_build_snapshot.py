@@ -0,0 +1,117 @@
+"""
+Test script to verify the compiled build snapshot reproduces the analytic calculators
+"""
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.archaeology.block_spawn_rates import get_normalized_spawn_rates, get_total_spawn_probability
+from ObeliskGemEV.archaeology.block_stats import get_block_mix_for_floor
+from ObeliskGemEV.archaeology.headless import ArchBuild, HeadlessArchaeologySimulator
+
+
+def _build(**kwargs):
+    return HeadlessArchaeologySimulator(ArchBuild(
+        starting_floor=10,
+        skill_points={'strength': 20, 'agility': 10, 'perception': 5, 'intellect': 5, 'luck': 10},
+        gem_upgrades={},
+        fragment_upgrade_levels={'polychrome_bonus': 1, 'flurry_buff': 2},
+        misc_card_level=2,
+        block_cards={('common', 1): 3, ('rare', 1): 1},
+        avada_keda_enabled=True,
+        **kwargs,
+    ))
+
+
+def test_shared_snapshot_matches_fresh_compile():
+    """Reusing one snapshot across stages gives the same results as compiling per call"""
+    sim = _build()
+    stats = sim.get_total_stats()
+    snapshot = sim.compile_build_snapshot(stats)
+    for stage in (1, 5, 12, 30, 60):
+        assert sim.calculate_floors_per_run(stats, stage, snapshot=snapshot) == sim.calculate_floors_per_run(stats, stage)
+        assert sim.calculate_xp_per_run(stats, stage, snapshot=snapshot) == sim.calculate_xp_per_run(stats, stage)
+        assert sim.calculate_fragments_per_run(stats, stage, snapshot=snapshot) == sim.calculate_fragments_per_run(stats, stage)
+        assert sim.calculate_run_duration(stats, stage, snapshot=snapshot) == sim.calculate_run_duration(stats, stage)
+    print("✓ Shared snapshot matches per-call compile")
+
+
+def test_snapshot_follows_toggles_and_cards():
+    """Card HP/XP and the enrage toggle are captured at compile time"""
+    sim = _build(enrage_enabled=False)
+    stats = sim.get_total_stats()
+    snapshot = sim.compile_build_snapshot(stats)
+    assert not snapshot.enrage_active
+    assert snapshot.xp_multiplier('common', 1) == sim.get_block_xp_multiplier('common', tier=1)
+    assert snapshot.xp_multiplier('rare', 1) == 1.10
+    for block_type, tier in (('common', 1), ('rare', 1), ('dirt', 1)):
+        hp = sim.get_block_hp_with_card(100, block_type, tier=tier)
+        assert sim.calculate_hits_to_kill(stats, 100, 2, block_type, tier=tier) == snapshot.hits_to_kill(hp, 2)
+    # Later build changes do not leak into an existing snapshot
+    sim.block_cards[('rare', 1)] = 0
+    assert snapshot.xp_multiplier('rare', 1) == 1.10
+    assert sim.compile_build_snapshot(stats).xp_multiplier('rare', 1) == 1.0
+    enraged = _build(enrage_enabled=True)
+    assert enraged.compile_build_snapshot(enraged.get_total_stats()).enrage_proportion > 0
+    print("✓ Snapshot captures toggles and cards")
+
+
+def _reference_xp(sim, stats, floors, starting_floor):
+    """Floor-by-floor XP sum straight from the rate tables (the original XP walk)"""
+    exp_mod_factor = 1 + stats.get('exp_mod_chance', 0) * (sim.MOD_EXP_MULTIPLIER_AVG + stats.get('exp_mod_gain', 0) - 1)
+    total_xp = 0.0
+    for i in range(int(floors) + 1):
+        floor_mult = floors - int(floors) if i == int(floors) else 1.0
+        floor = starting_floor + i
+        block_mix = get_block_mix_for_floor(floor)
+        floor_xp = sum(
+            chance * block_mix[block_type].xp * sim.get_block_xp_multiplier(block_type, tier=block_mix[block_type].tier)
+            for block_type, chance in get_normalized_spawn_rates(floor).items() if block_type in block_mix
+        )
+        expected_blocks = sim.SLOTS_PER_FLOOR * get_total_spawn_probability(floor) / 100.0
+        total_xp += expected_blocks * floor_xp * stats['xp_mult'] * stats.get('arch_xp_mult', 1.0) * exp_mod_factor * floor_mult
+    return total_xp
+
+
+def test_run_metrics_single_walk():
+    """The fused evaluator agrees with the per-metric calculators and the original XP walk"""
+    sim = _build(enrage_enabled=True, flurry_enabled=True)
+    stats = sim.get_total_stats()
+    for stage in (1, 7, 20, 45):
+        metrics = sim.calculate_run_metrics(stats, stage)
+        assert metrics['floors'] == sim.calculate_floors_per_run(stats, stage)
+        assert metrics['run_duration'] == sim.calculate_run_duration(stats, stage)
+        assert metrics['fragments'] == sim.calculate_fragments_per_run(stats, stage)
+        assert abs(metrics['xp'] - _reference_xp(sim, stats, metrics['floors'], stage)) <= 1e-9 * max(1.0, metrics['xp'])
+    assert sim.eval_run_metrics(7) == sim.calculate_run_metrics(stats, 7)
+    print("✓ Fused run metrics match the per-metric calculators")
+
+
+def test_stage_scan_matches_run_metrics():
+    """The prefix-sum stage scan agrees with per-stage run metrics over the whole range"""
+    for strength in (2, 40):
+        sim = _build(enrage_enabled=True, flurry_enabled=True)
+        sim.skill_points['strength'] = strength
+        stats = sim.get_total_stats()
+        curves = sim.scan_stage_curves(stats, 80)
+        assert curves['stages'] == list(range(1, 81))
+        for i, stage in enumerate(curves['stages']):
+            metrics = sim.calculate_run_metrics(stats, stage)
+            assert abs(curves['floors'][i] - metrics['floors']) <= 1e-9 * max(1.0, metrics['floors'])
+            assert abs(curves['xp'][i] - metrics['xp']) <= 1e-9 * max(1.0, metrics['xp'])
+            assert curves['run_duration'][i] == metrics['run_duration']
+            for frag_type, frags in metrics['fragments'].items():
+                assert abs(curves['fragments'][frag_type][i] - frags) <= 1e-9 * max(1.0, frags)
+        best_stage, best_xp_per_hour = sim.find_optimal_stage_for_xp(stats, 80)
+        assert best_xp_per_hour == max(curves['xp_per_hour'])
+        assert curves['xp_per_hour'][best_stage - 1] == best_xp_per_hour
+    print("✓ Stage scan matches per-stage run metrics")
+
+
+if __name__ == "__main__":
+    test_shared_snapshot_matches_fresh_compile()
+    test_snapshot_follows_toggles_and_cards()
+    test_run_metrics_single_walk()
+    test_stage_scan_matches_run_metrics()
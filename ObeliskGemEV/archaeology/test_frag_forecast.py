@@ -0,0 +1,57 @@
+"""
+Test script to verify the branch-and-bound frag forecast matches exhaustive enumeration
+"""
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.archaeology.calculator import generate_distributions_capped, get_skill_point_cap
+from ObeliskGemEV.archaeology.headless import ArchBuild, HeadlessArchaeologySimulator
+
+SKILLS = ['strength', 'agility', 'perception', 'intellect', 'luck']
+
+
+def _exhaustive(sim, levels_ahead, target_frag_type):
+    """Best distribution by trying every capped distribution (the original forecast loop)"""
+    calc_stage = sim._get_calculation_stage()
+    best_value = sim._forecast_rates(sim.get_total_stats(), calc_stage, target_frag_type)[0]
+    best_dist = (0,) * len(SKILLS)
+    caps = [max(0, get_skill_point_cap(s) - sim.skill_points.get(s, 0)) for s in SKILLS]
+    count = 0
+    for dist in generate_distributions_capped(levels_ahead, caps):
+        count += 1
+        value = sim._forecast_rates(sim._stats_with_added_points(SKILLS, dist), calc_stage, target_frag_type)[0]
+        if value > best_value:
+            best_value, best_dist = value, dist
+    return best_dist, best_value, count
+
+
+def test_forecast_matches_exhaustive():
+    """Same distribution and frags/h as exhaustive search, with fewer evaluations"""
+    builds = [
+        ArchBuild(starting_floor=12, gem_upgrades={}, fragment_upgrade_levels={},
+                  skill_points={'strength': 5, 'agility': 5, 'perception': 0, 'intellect': 0, 'luck': 0}),
+        ArchBuild(starting_floor=25, gem_upgrades={}, fragment_upgrade_levels={'flurry_buff': 2},
+                  skill_points={'strength': 20, 'agility': 10, 'perception': 5, 'intellect': 5, 'luck': 10},
+                  enrage_enabled=False),
+    ]
+    for build in builds:
+        sim = HeadlessArchaeologySimulator(build)
+        for target in ('common', 'rare', 'epic'):
+            expected_dist, expected_value, count = _exhaustive(sim, 14, target)
+            result = sim.calculate_frag_forecast(14, target)
+            assert tuple(result['distribution'][s] for s in SKILLS) == expected_dist, (build.starting_floor, target)
+            assert result['frags_per_hour'] == expected_value
+
+            caps = [max(0, get_skill_point_cap(s) - sim.skill_points.get(s, 0)) for s in SKILLS]
+            current = sim._forecast_rates(sim.get_total_stats(), sim._get_calculation_stage(), target)[0]
+            evaluations = sim._search_frag_forecast(
+                SKILLS, caps, (), 14, sim._get_calculation_stage(), target, current)[3]
+            assert evaluations < count, (evaluations, count)
+    print("✓ Branch-and-bound forecast matches exhaustive search")
+
+
+if __name__ == "__main__":
+    test_forecast_matches_exhaustive()
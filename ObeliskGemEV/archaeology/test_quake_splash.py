@@ -0,0 +1,111 @@
+"""
+Test script to verify binomial Quake splash against rolling every hit
+"""
+import math
+import random
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.archaeology.monte_carlo_crit import MonteCarloCritSimulator
+
+
+def test_crit_table_is_binomial():
+    """Table steps should be the Binomial(hits, crit_chance) probabilities"""
+    sim = MonteCarloCritSimulator()
+    for hits, crit_chance in ((1, 0.3), (12, 0.3), (40, 0.85), (600, 0.05)):
+        cdf = sim._quake_crit_cdf(hits, crit_chance)
+        assert len(cdf) == hits + 1
+        assert abs(cdf[-1] - 1.0) < 1e-9
+        for k in (0, hits // 3, hits):
+            exact = math.comb(hits, k) * crit_chance ** k * (1 - crit_chance) ** (hits - k)
+            step = cdf[k] - (cdf[k - 1] if k else 0.0)
+            assert abs(step - exact) < 1e-9
+    print("✓ Quake crit table matches the binomial distribution")
+
+
+def _per_hit_splash(floor_hp, block_idx, hits, quake_damage, crit_chance, crit_damage_mult):
+    """The splash before the binomial shortcut: every other block rolls every hit"""
+    for other_idx, other_hp in enumerate(floor_hp):
+        if other_idx != block_idx and other_hp > 0:
+            total = 0
+            for _hit in range(hits):
+                if crit_chance > 0 and random.random() < crit_chance:
+                    total += int(quake_damage * crit_damage_mult)
+                else:
+                    total += quake_damage
+            floor_hp[other_idx] = max(0, other_hp - total)
+
+
+def test_splash_matches_per_hit_rolls():
+    """simulate_run's splash helper should give the same HP distribution as one roll per hit"""
+    sim = MonteCarloCritSimulator()
+    # Block 1 is being fought; block 0 is already dead, block 3 too. The others survive
+    # or die depending on the crits (9 hits deal 63-144)
+    floor = [0, 50, 80, 0, 100, 70, 130]
+    block_idx, hits, quake_damage, crit_damage_mult = 1, 9, 7, 2.3
+    samples = 20000
+    random.seed(11)
+    for crit_chance in (0.0, 0.35, 1.0):
+        splashed, rolled = {}, {}
+        for _ in range(samples):
+            hp = list(floor)
+            sim._apply_quake_splash(hp, block_idx, hits, quake_damage, crit_chance, crit_damage_mult)
+            assert hp[:block_idx + 1] == floor[:block_idx + 1]  # blocks behind are left alone
+            key = tuple(hp[block_idx + 1:])
+            splashed[key] = splashed.get(key, 0) + 1
+            hp = list(floor)
+            _per_hit_splash(hp, block_idx, hits, quake_damage, crit_chance, crit_damage_mult)
+            key = tuple(hp[block_idx + 1:])
+            rolled[key] = rolled.get(key, 0) + 1
+
+        if crit_chance in (0.0, 1.0):
+            # No randomness left: both must give the one and only outcome
+            assert splashed == rolled and len(splashed) == 1
+            continue
+        # Total variation distance between the two empirical distributions (per block)
+        for pos in range(len(floor) - block_idx - 1):
+            a, b = {}, {}
+            for key, count in splashed.items():
+                a[key[pos]] = a.get(key[pos], 0) + count
+            for key, count in rolled.items():
+                b[key[pos]] = b.get(key[pos], 0) + count
+            distance = sum(abs(a.get(d, 0) - b.get(d, 0)) for d in set(a) | set(b)) / (2 * samples)
+            print(f"crit {crit_chance}, block {block_idx + 1 + pos}: total variation distance {distance:.4f}")
+            assert distance < 0.025
+    print("✓ Binomial splash matches per-hit rolls")
+
+
+def test_quake_run_matches_per_hit_splash():
+    """A full simulate_run with Quake on clears as many floors as with the per-hit splash"""
+    stats = {'total_damage': 40, 'armor_pen': 5, 'max_stamina': 150, 'crit_chance': 0.3, 'crit_damage': 2.0}
+    runs = 1500
+    original = MonteCarloCritSimulator._apply_quake_splash
+
+    def _per_hit(self, floor_hp, block_idx, hits, quake_damage, crit_chance, crit_damage_mult):
+        _per_hit_splash(floor_hp, block_idx, hits, quake_damage, crit_chance, crit_damage_mult)
+
+    def _avg_stage(splash):
+        MonteCarloCritSimulator._apply_quake_splash = splash
+        try:
+            random.seed(5)
+            sim = MonteCarloCritSimulator()
+            floors = [sim.simulate_run(stats, 1, use_crit=True, quake_enabled=True) for _ in range(runs)]
+        finally:
+            MonteCarloCritSimulator._apply_quake_splash = original
+        mean = sum(floors) / runs
+        return mean, math.sqrt(sum((f - mean) ** 2 for f in floors) / (runs - 1) / runs)
+
+    binomial, binomial_se = _avg_stage(original)
+    per_hit, per_hit_se = _avg_stage(_per_hit)
+    print(f"Avg floors cleared: binomial {binomial:.3f}, per-hit {per_hit:.3f}")
+    assert abs(binomial - per_hit) < 5 * math.hypot(binomial_se, per_hit_se)
+    print("✓ simulate_run splash matches per-hit rolls")
+
+
+if __name__ == "__main__":
+    test_crit_table_is_binomial()
+    test_splash_matches_per_hit_rolls()
+    test_quake_run_matches_per_hit_splash()
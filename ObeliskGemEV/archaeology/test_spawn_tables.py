@@ -0,0 +1,64 @@
+"""
+Test script to verify the precomputed spawn tables match the spawn rates
+"""
+import random
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.archaeology.block_spawn_rates import (
+    BLOCK_TYPES, EMPTY_SLOT, get_normalized_spawn_rates, get_total_spawn_probability,
+    sample_floors_slot_types, sample_slot_types, spawn_block_for_slot,
+)
+
+
+def _reference_spawn(stage, rng):
+    """Per-slot sampling straight from the rate dicts (the original algorithm)"""
+    if rng.random() * 100.0 > get_total_spawn_probability(stage):
+        return None
+    rand = rng.random()
+    cumulative = 0.0
+    for block_type, spawn_chance in get_normalized_spawn_rates(stage).items():
+        cumulative += spawn_chance
+        if rand <= cumulative:
+            return block_type
+    return None
+
+
+def test_table_sampling_matches_reference():
+    """spawn_block_for_slot and sample_slot_types consume the same draws as the reference"""
+    for stage in (1, 3, 6, 11, 20, 35, 60, 99, 150):
+        ref_rng, rng, bulk_rng = random.Random(stage), random.Random(stage), random.Random(stage)
+        expected = [_reference_spawn(stage, ref_rng) for _ in range(240)]
+        assert [spawn_block_for_slot(stage, rng=rng) for _ in range(240)] == expected
+        codes = [code for _ in range(10) for code in sample_slot_types(stage, rng=bulk_rng)]
+        assert [None if c == EMPTY_SLOT else BLOCK_TYPES[c] for c in codes] == expected
+    print("✓ Table sampling matches reference draws")
+
+
+def test_bulk_sampling_distribution():
+    """Alias sampling over many floors reproduces spawn chance and type mix"""
+    try:
+        import numpy as np
+    except ImportError:
+        print("NumPy not installed, skipping")
+        return
+    stages = np.repeat([1, 11, 20, 80], 5000)
+    codes = sample_floors_slot_types(stages, rng=np.random.default_rng(7))
+    assert codes.shape == (stages.size, 24)
+    for stage in (1, 11, 20, 80):
+        floor_codes = codes[stages == stage]
+        spawned = floor_codes[floor_codes != EMPTY_SLOT]
+        assert abs(spawned.size / floor_codes.size - min(100.0, get_total_spawn_probability(stage)) / 100.0) < 0.01
+        mix = np.bincount(spawned, minlength=len(BLOCK_TYPES)) / spawned.size
+        rates = get_normalized_spawn_rates(stage)
+        for code, block_type in enumerate(BLOCK_TYPES):
+            assert abs(mix[code] - rates.get(block_type, 0.0)) < 0.01, (stage, block_type)
+    print("✓ Bulk sampling matches spawn rates")
+
+
+if __name__ == "__main__":
+    test_table_sampling_matches_reference()
+    test_bulk_sampling_distribution()
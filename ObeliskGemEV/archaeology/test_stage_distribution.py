@@ -0,0 +1,71 @@
+"""
+Test script to verify the max-stage solver against the Monte Carlo simulation
+"""
+import math
+import random
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.archaeology.monte_carlo_crit import MonteCarloCritSimulator
+from ObeliskGemEV.archaeology.stage_distribution import solve_stage_distribution
+
+
+STATS = {
+    'total_damage': 36,
+    'armor_pen': 12,
+    'max_stamina': 150,
+    'crit_chance': 0.3,
+    'crit_damage': 2.4,
+    'one_hit_chance': 0.004,
+    'super_crit_chance': 0.1,
+    'ultra_crit_chance': 0.2,
+    'stamina_mod_chance': 0.05,
+    'exp_mod_chance': 0.05,
+    'loot_mod_chance': 0.05,
+    'xp_mult': 1.25,
+    'fragment_mult': 1.2,
+}
+
+
+def test_solver_matches_monte_carlo():
+    """Solved means should sit within MC noise of a large batch run"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("NumPy not installed, skipping")
+        return
+    cards = {'common': 1, 'rare': 2}
+    dist = solve_stage_distribution(STATS, 1, block_cards=cards)
+
+    random.seed(2024)
+    runs = 20000
+    results = MonteCarloCritSimulator().simulate_runs_batch(STATS, 1, runs, block_cards=cards)
+    stages = [r['max_stage_reached'] for r in results]
+    mc_stage = sum(stages) / runs
+    se = math.sqrt(sum((s - mc_stage) ** 2 for s in stages) / (runs - 1) / runs)
+    mc_xp = sum(r['xp_per_run'] for r in results) / runs
+    mc_duration = sum(r['run_duration_seconds'] for r in results) / runs
+
+    print("=" * 60)
+    print("Stage Solver vs Monte Carlo")
+    print("=" * 60)
+    print(f"Solver: avg max stage {dist.avg_max_stage:.4f}, xp {dist.avg_xp:.3f}, {dist.avg_run_duration:.1f}s")
+    print(f"MC:     avg max stage {mc_stage:.4f} (+/- {se:.4f}), xp {mc_xp:.3f}, {mc_duration:.1f}s")
+
+    assert abs(sum(p for _s, p in dist.outcomes) - 1.0) < 1e-9
+    assert abs(dist.avg_max_stage - mc_stage) < 5 * se + 0.01
+    assert abs(dist.avg_xp - mc_xp) / mc_xp < 0.02
+    assert abs(dist.avg_run_duration - mc_duration) / mc_duration < 0.02
+    goal = int(round(dist.avg_max_stage)) + 1
+    assert abs(dist.probability_to_reach(goal) - sum(s >= goal for s in stages) / runs) < 0.02
+
+    summary = dist.to_summary(30)
+    assert sum(summary['stage_counts'].values()) == 30
+    print("\n✓ Stage solver matches Monte Carlo")
+
+
+if __name__ == "__main__":
+    test_solver_matches_monte_carlo()
@@ -0,0 +1,14 @@
+"""
+Shared pytest fixtures
+"""
+import pytest
+
+from ObeliskGemEV import result_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_result_cache(monkeypatch):
+    """Keep tests away from the user's on-disk MC cache (workers inherit the env var)"""
+    monkeypatch.setenv("OBELISK_MC_CACHE", "0")
+    monkeypatch.setattr(result_cache, "_cache", None)
+    monkeypatch.setattr(result_cache, "_cache_failed", False)
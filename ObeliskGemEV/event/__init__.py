@@ -8,13 +8,17 @@ Module structure:
 - stats.py: PlayerStats and EnemyStats dataclasses
 - constants.py: Upgrade data, costs, prestige requirements
 - simulation.py: Combat simulation and calculations
+- wave_distribution.py: Deterministic solver for the death wave/subwave distribution
 - utils.py: Utility functions (formatting, etc.)
 - gui_budget.py: Budget Optimizer panel
 - gui_love2d.py: Love2D Simulator panel
 - simulator.py: Main window with mode toggle
+
+Only the GUI modules (simulator.py, gui_*.py) import tkinter/PIL. They are loaded
+on first access of `EventSimulatorWindow`, so process-pool workers importing the
+simulation core stay lightweight.
 """
 
-from .simulator import EventSimulatorWindow
 from .stats import PlayerStats, EnemyStats
 from .constants import (
     UPGRADE_NAMES, GEM_UPGRADE_NAMES, PRESTIGE_UNLOCKED,
@@ -22,10 +26,15 @@ from .constants import (
     get_prestige_wave_requirement
 )
 from .simulation import (
-    apply_upgrades, simulate_event_run, run_full_simulation,
+    apply_upgrades, apply_upgrades_batch, upgrade_effect_vector, add_upgrade_levels, stats_from_effects,
+    simulate_event_run, run_full_simulation, run_full_simulation_batch,
+    make_event_rng, spawn_event_rngs, crn_event_rngs, run_full_simulation_crn,
     calculate_materials, calculate_upgrade_cost, calculate_total_costs,
     get_highest_wave_killed_in_x_hits, get_current_max_level, get_gem_max_level
 )
+from .wave_distribution import (
+    WaveDistribution, solve_wave_distribution, get_wave_distribution, run_full_simulation_exact
+)
 from .utils import format_number, avg_mult, resources_per_minute, format_time
 
 __all__ = [
@@ -49,8 +58,17 @@ __all__ = [
     
     # Simulation
     'apply_upgrades',
+    'apply_upgrades_batch',
+    'upgrade_effect_vector',
+    'add_upgrade_levels',
+    'stats_from_effects',
     'simulate_event_run',
     'run_full_simulation',
+    'run_full_simulation_batch',
+    'make_event_rng',
+    'spawn_event_rngs',
+    'crn_event_rngs',
+    'run_full_simulation_crn',
     'calculate_materials',
     'calculate_upgrade_cost',
     'calculate_total_costs',
@@ -58,9 +76,22 @@ __all__ = [
     'get_current_max_level',
     'get_gem_max_level',
     
+    # Wave distribution
+    'WaveDistribution',
+    'solve_wave_distribution',
+    'get_wave_distribution',
+    'run_full_simulation_exact',
+    
     # Utils
     'format_number',
     'avg_mult',
     'resources_per_minute',
     'format_time',
 ]
+
+
+def __getattr__(name):
+    if name == 'EventSimulatorWindow':
+        from .simulator import EventSimulatorWindow
+        return EventSimulatorWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -32,6 +32,7 @@ from .monte_carlo_optimizer import (
     monte_carlo_optimize_guided,
     MCOptimizationResult,
 )
+from .refresh_service import BackgroundEvaluator
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from ui_utils import get_resource_path, create_tooltip, calculate_tooltip_position
@@ -77,6 +78,10 @@ class BudgetOptimizerPanel:
 
         # Keep track of scheduled callbacks (avoid Tk "invalid command name" on close)
         self._auto_refresh_after_id = None
+
+        # Expected results / gem forecasts are simulated off the Tk thread
+        self._refresh_service = BackgroundEvaluator(lambda callback: self.window.after(0, callback))
+        self._gem_forecasts = {}  # idx -> wave improvement of +1 (last finished forecast)
         
         # Load currency icons
         self.currency_icons = {}
@@ -869,65 +874,16 @@ class BudgetOptimizerPanel:
             self.save_state()
     
     def _update_gem_display(self):
-        """Update gem upgrade display labels and calculate forecast (which +1 brings most benefit)"""
-        from .simulation import get_gem_max_level, apply_upgrades
-        from .stats import PlayerStats, EnemyStats
-        from .optimizer import UpgradeState, estimate_max_wave
+        """Update gem upgrade display labels; the +1 forecasts are recomputed in the background"""
+        from .simulation import get_gem_max_level
         
         prestige = self.budget_prestige_var.get()
         
-        # Calculate forecast for all gem upgrades to find the best one
-        forecast_values = {}  # idx -> wave_improvement
-        
         if hasattr(self, 'gem_display_frames'):
-            # Calculate base stats with current gem levels
-            base_state = UpgradeState()
-            for t in range(1, 5):
-                base_state.levels[t] = self.current_upgrade_levels[t].copy()
-            base_state.gem_levels = self.current_gem_levels.copy()
-            
-            player_base, enemy = apply_upgrades(
-                base_state.levels, PlayerStats(), EnemyStats(), prestige, base_state.gem_levels
-            )
-            
-            # Compute base wave once (used for all +1 tests)
-            try:
-                wave_base, _ = estimate_max_wave(player_base, enemy, runs=20)
-            except Exception:
-                wave_base = 0.0
-            
-            # Calculate wave improvement for each upgrade
-            for idx in range(4):
-                current_level = self.current_gem_levels[idx]
-                max_level = get_gem_max_level(prestige, idx)
-                
-                if current_level < max_level:
-                    # Test +1 level for this upgrade
-                    test_state = base_state.copy()
-                    test_state.gem_levels = test_state.gem_levels.copy()
-                    test_state.gem_levels[idx] += 1
-                    
-                    player_test, _ = apply_upgrades(
-                        test_state.levels, PlayerStats(), EnemyStats(), prestige, test_state.gem_levels
-                    )
-                    
-                    try:
-                        wave_test, _ = estimate_max_wave(player_test, enemy, runs=20)
-                        wave_improvement = wave_test - wave_base
-                        forecast_values[idx] = wave_improvement
-                    except:
-                        forecast_values[idx] = 0.0
-                else:
-                    forecast_values[idx] = -999  # Max level, not available
-            
-            # Find best upgrade (highest wave improvement)
-            best_idx = max(forecast_values.keys(), key=lambda i: forecast_values[i]) if forecast_values else None
-            
             # Update all gem displays
             for idx, gem_frame_data in enumerate(self.gem_display_frames):
                 if len(gem_frame_data) >= 4:
                     gem_frame, level_display, minus_btn, plus_btn = gem_frame_data[0], gem_frame_data[1], gem_frame_data[2], gem_frame_data[3]
-                    forecast_label = gem_frame_data[4] if len(gem_frame_data) >= 5 else None
                     
                     current_level = self.current_gem_levels[idx]
                     max_level = get_gem_max_level(prestige, idx)
@@ -938,38 +894,10 @@ class BudgetOptimizerPanel:
                     # Update button states
                     minus_btn.config(state=tk.NORMAL if current_level > 0 else tk.DISABLED)
                     plus_btn.config(state=tk.NORMAL if current_level < max_level else tk.DISABLED)
-                    
-                    # Update forecast display - besserer Kontrast
-                    if forecast_label is not None:
-                        # Keep background consistent with current widget styling
-                        try:
-                            forecast_bg = forecast_label.master.cget("background")
-                        except Exception:
-                            forecast_bg = forecast_label.cget("background")
-                        if current_level < max_level and idx in forecast_values:
-                            wave_improvement = forecast_values[idx]
-                            is_best = (idx == best_idx and wave_improvement > 0)
-                            
-                            if is_best:
-                                forecast_label.config(
-                                    text=f"⭐ +{wave_improvement:.1f} Wave (BEST)",
-                                    foreground="#1B5E20",  # Dunkles Grün für besseren Kontrast
-                                    background=forecast_bg,
-                                    font=("Arial", 7, "bold")
-                                )
-                            else:
-                                forecast_label.config(
-                                    text=f"+{wave_improvement:.1f} Wave",
-                                    foreground="#1A237E",  # Dunkles Blau für besseren Kontrast
-                                    background=forecast_bg,
-                                    font=("Arial", 7)
-                                )
-                        else:
-                            forecast_label.config(
-                                text="MAX",
-                                foreground="#424242",  # Dunkles Grau
-                                background=forecast_bg
-                            )
+            
+            # Show the last known forecasts until the new ones arrive
+            self._render_gem_forecasts()
+            self._request_background_refresh()
         
         # Also update old format if it exists
         if hasattr(self, 'gem_control_frames'):
@@ -987,6 +915,66 @@ class BudgetOptimizerPanel:
                         max_label = gem_controls[3]
                         max_label.config(text=f"/ {max_level}")
     
+    def _render_gem_forecasts(self):
+        """Show the forecast (which +1 brings most benefit) from self._gem_forecasts"""
+        from .simulation import get_gem_max_level
+        
+        if not hasattr(self, 'gem_display_frames'):
+            return
+        
+        prestige = self.budget_prestige_var.get()
+        forecast_values = self._gem_forecasts  # idx -> wave_improvement (-999 = max level)
+        
+        # Find best upgrade (highest wave improvement)
+        best_idx = max(forecast_values.keys(), key=lambda i: forecast_values[i]) if forecast_values else None
+        
+        for idx, gem_frame_data in enumerate(self.gem_display_frames):
+            forecast_label = gem_frame_data[4] if len(gem_frame_data) >= 5 else None
+            if forecast_label is None:
+                continue
+            
+            current_level = self.current_gem_levels[idx]
+            max_level = get_gem_max_level(prestige, idx)
+            
+            # Update forecast display - besserer Kontrast
+            # Keep background consistent with current widget styling
+            try:
+                forecast_bg = forecast_label.master.cget("background")
+            except Exception:
+                forecast_bg = forecast_label.cget("background")
+            if current_level >= max_level:
+                forecast_label.config(
+                    text="MAX",
+                    foreground="#424242",  # Dunkles Grau
+                    background=forecast_bg
+                )
+            elif forecast_values.get(idx, -999) > -999:
+                wave_improvement = forecast_values[idx]
+                is_best = (idx == best_idx and wave_improvement > 0)
+                
+                if is_best:
+                    forecast_label.config(
+                        text=f"⭐ +{wave_improvement:.1f} Wave (BEST)",
+                        foreground="#1B5E20",  # Dunkles Grün für besseren Kontrast
+                        background=forecast_bg,
+                        font=("Arial", 7, "bold")
+                    )
+                else:
+                    forecast_label.config(
+                        text=f"+{wave_improvement:.1f} Wave",
+                        foreground="#1A237E",  # Dunkles Blau für besseren Kontrast
+                        background=forecast_bg,
+                        font=("Arial", 7)
+                    )
+            else:
+                # Just left max level (e.g. prestige raised the cap); forecast still running
+                forecast_label.config(
+                    text="…",
+                    foreground="#424242",
+                    background=forecast_bg,
+                    font=("Arial", 7)
+                )
+    
     def _create_gem_tooltip(self, widget, idx: int, gem_name: str):
         """Create tooltip for gem upgrade showing current level and forecast"""
         def on_enter(event):
@@ -1111,7 +1099,7 @@ class BudgetOptimizerPanel:
     
     def _calculate_wave_probability_info(self, result, prestige: int) -> str:
         """Calculate probability information for reaching waves and prestige requirements"""
-        from .simulation import run_full_simulation
+        from .wave_distribution import run_full_simulation_exact
         from .constants import get_prestige_wave_requirement
         
         # Run more simulations for better probability estimate
@@ -1119,8 +1107,8 @@ class BudgetOptimizerPanel:
         enemy = result.enemy_stats
         estimated_wave = result.expected_wave
         
-        # Run 200 simulations for probability calculation
-        sim_results, avg_wave, avg_time = run_full_simulation(player, enemy, runs=200)
+        # 200 quantiles of the solved wave distribution for probability calculation
+        sim_results, avg_wave, avg_time = run_full_simulation_exact(player, enemy, runs=200)
         
         # Calculate probability of reaching estimated wave
         import math
@@ -1318,6 +1306,7 @@ class BudgetOptimizerPanel:
             except tk.TclError:
                 pass
         self._auto_refresh_after_id = None
+        self._refresh_service.close()
     
     def _update_player_stats(self):
         """Update player stats display based on current upgrade levels"""
@@ -1353,51 +1342,64 @@ class BudgetOptimizerPanel:
         self.update_player_stats_display(result, reference_wave, ehp_at_wave)
     
     def _update_expected_results(self):
-        """Update expected results display based on current upgrade levels"""
-        from .simulation import apply_upgrades, run_full_simulation
-        from .stats import PlayerStats, EnemyStats
-        
-        # Clear existing expected results
-        for widget in self.expected_results_container.winfo_children():
-            widget.destroy()
+        """Update expected results display based on current upgrade levels (computed in the background)"""
+        self._request_background_refresh()
+    
+    def _request_background_refresh(self):
+        """
+        Recompute expected results and gem forecasts off the Tk thread.
         
-        # Calculate player stats from current upgrades
-        player, enemy = apply_upgrades(
-            self.current_upgrade_levels,
-            PlayerStats(),
-            EnemyStats(),
-            self.budget_prestige_var.get(),
-            self.current_gem_levels
-        )
+        Bursts of calls (a click updates gems, stats and results) are coalesced
+        into one job; a job still running for an older state is cancelled.
+        """
+        if not self.expected_results_container.winfo_children():
+            tk.Label(self.expected_results_container, text="Calculating...",
+                     font=("Arial", 9), background="#E8F5E9", foreground="gray").pack(anchor="w", pady=1)
         
-        # Run simulation to get expected wave and time
-        sim_results, avg_wave, avg_time = run_full_simulation(player, enemy, runs=100)
+        # Snapshot on the Tk thread; the worker never touches widgets or Tk variables
+        levels = {tier: list(self.current_upgrade_levels[tier]) for tier in range(1, 5)}
+        gem_levels = list(self.current_gem_levels)
+        prestige = self.budget_prestige_var.get()
+        with_forecasts = hasattr(self, 'gem_display_frames')
         
-        # Calculate standard deviations
-        import math
-        waves_reached = [r[0] + (1 - r[1] * 0.2) for r in sim_results]  # Convert to decimal wave
-        times = [r[2] for r in sim_results]  # Extract times
+        def job(is_stale):
+            forecasts = None
+            if with_forecasts:
+                forecasts = _compute_gem_forecasts(levels, gem_levels, prestige, is_stale)
+                if forecasts is None:
+                    return None
+            return forecasts, _compute_expected_results(levels, gem_levels, prestige)
         
-        # Calculate SD for waves
-        if len(waves_reached) > 1:
-            wave_variance = sum((w - avg_wave) ** 2 for w in waves_reached) / len(waves_reached)
-            wave_sd = math.sqrt(wave_variance)
-        else:
-            wave_sd = 0.0
+        self._refresh_service.submit(job, self._on_background_refresh)
+    
+    def _on_background_refresh(self, result):
+        """Publish a finished background refresh (runs on the Tk thread)"""
+        try:
+            if not self.window.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        forecasts, expected = result
+        if forecasts is not None:
+            self._gem_forecasts = forecasts
+            self._render_gem_forecasts()
+        self._render_expected_results(expected)
+    
+    def _render_expected_results(self, expected):
+        """Show the results of _compute_expected_results"""
+        # Clear existing expected results
+        for widget in self.expected_results_container.winfo_children():
+            widget.destroy()
         
-        # Calculate SD for times
-        if len(times) > 1:
-            time_variance = sum((t - avg_time) ** 2 for t in times) / len(times)
-            time_sd = math.sqrt(time_variance)
-        else:
-            time_sd = 0.0
+        avg_wave = expected['avg_wave']
+        avg_time = expected['avg_time']
         
         # Build tooltip with SD
-        tooltip_text = f"Simulation Statistics ({len(sim_results)} runs):\n"
-        tooltip_text += f"  • Average Wave: {avg_wave:.1f} ± {wave_sd:.1f} (SD)\n"
-        tooltip_text += f"  • Average Time: {avg_time:.1f}s ± {time_sd:.1f}s (SD)\n"
-        tooltip_text += f"  • Min Wave: {min(waves_reached):.1f}\n"
-        tooltip_text += f"  • Max Wave: {max(waves_reached):.1f}"
+        tooltip_text = f"Simulation Statistics ({expected['runs']} runs):\n"
+        tooltip_text += f"  • Average Wave: {avg_wave:.1f} ± {expected['wave_sd']:.1f} (SD)\n"
+        tooltip_text += f"  • Average Time: {avg_time:.1f}s ± {expected['time_sd']:.1f}s (SD)\n"
+        tooltip_text += f"  • Min Wave: {expected['min_wave']:.1f}\n"
+        tooltip_text += f"  • Max Wave: {expected['max_wave']:.1f}"
         
         # Display expected results with tooltip
         header_frame = tk.Frame(self.expected_results_container, background="#E8F5E9")
@@ -2230,7 +2232,7 @@ class BudgetOptimizerPanel:
                 monte_carlo_optimize_guided,
             )
             from .optimizer import greedy_optimize, calculate_player_stats
-            from .simulation import run_full_simulation
+            from .simulation import run_full_simulation_batch
 
             algorithms = [
                 ("Old Random MC", "monte_carlo_optimize", "single-core random search"),
@@ -2296,7 +2298,7 @@ class BudgetOptimizerPanel:
                             )
                             # Evaluate greedy fairly with the same MC runs
                             player, enemy = calculate_player_stats(gres.upgrades, prestige)
-                            _r, wave, sim_time = run_full_simulation(player, enemy, runs=num_event_runs)
+                            _r, wave, sim_time = run_full_simulation_batch(player, enemy, runs=num_event_runs)
                             wave, sim_time = float(wave), float(sim_time)
                     except Exception as e:
                         error_holder["error"] = f"{algo_name} failed: {e}"
@@ -2777,6 +2779,7 @@ class BudgetOptimizerPanel:
                 f"Average Wave: {mc_res.statistics['mean_wave']:.1f} ± {mc_res.statistics['std_dev_wave']:.1f}",
                 f"Wave Range: {mc_res.statistics['min_wave']:.1f} - {mc_res.statistics['max_wave']:.1f}",
                 f"Median Wave: {mc_res.statistics['median_wave']:.1f}",
+                f"Duplicate candidates reused: {mc_res.statistics.get('dedup_hit_rate', 0.0):.0%}",
             ],
             breakpoints=[]
         )
@@ -2975,4 +2978,77 @@ class BudgetOptimizerPanel:
                                         font=("Arial", 9), background="#E8F5E9",
                                         foreground="#666666", justify=tk.LEFT)
             no_upgrades_label.pack(pady=20, padx=10)
-        
\ No newline at end of file
+        
+
+
+def _compute_gem_forecasts(levels, gem_levels, prestige, is_stale=lambda: False):
+    """
+    Wave improvement of +1 on each gem upgrade (-999 = max level).
+    
+    Tk-free (runs on the background refresh thread); returns None when
+    `is_stale()` reports that the state changed in the meantime.
+    """
+    from .simulation import get_gem_max_level, upgrade_effect_vector, stats_from_effects
+    from .optimizer import estimate_max_wave
+    
+    # Gems only change the final multipliers, so every +1 probe reuses the upgrade effects
+    effects = upgrade_effect_vector(levels)
+    player_base, enemy = stats_from_effects(effects, PlayerStats(), EnemyStats(), prestige, gem_levels)
+    
+    # Compute base wave once (used for all +1 tests)
+    try:
+        wave_base, _ = estimate_max_wave(player_base, enemy, runs=20)
+    except Exception:
+        wave_base = 0.0
+    
+    forecast_values = {}
+    for idx in range(4):
+        if is_stale():
+            return None
+        if gem_levels[idx] < get_gem_max_level(prestige, idx):
+            # Test +1 level for this upgrade
+            test_gems = list(gem_levels)
+            test_gems[idx] += 1
+            player_test, _ = stats_from_effects(effects, PlayerStats(), EnemyStats(), prestige, test_gems)
+            try:
+                wave_test, _ = estimate_max_wave(player_test, enemy, runs=20)
+                forecast_values[idx] = wave_test - wave_base
+            except Exception:
+                forecast_values[idx] = 0.0
+        else:
+            forecast_values[idx] = -999  # Max level, not available
+    return forecast_values
+
+
+def _compute_expected_results(levels, gem_levels, prestige):
+    """Expected wave/time (with SDs) for the Expected Results box; Tk-free"""
+    import math
+    from .wave_distribution import run_full_simulation_exact
+    
+    player, enemy = apply_upgrades(levels, PlayerStats(), EnemyStats(), prestige, gem_levels)
+    
+    # Run simulation to get expected wave and time
+    sim_results, avg_wave, avg_time = run_full_simulation_exact(player, enemy, runs=100)
+    
+    waves_reached = [r[0] + (1 - r[1] * 0.2) for r in sim_results]  # Convert to decimal wave
+    times = [r[2] for r in sim_results]  # Extract times
+    
+    # Calculate SDs
+    if len(waves_reached) > 1:
+        wave_sd = math.sqrt(sum((w - avg_wave) ** 2 for w in waves_reached) / len(waves_reached))
+    else:
+        wave_sd = 0.0
+    if len(times) > 1:
+        time_sd = math.sqrt(sum((t - avg_time) ** 2 for t in times) / len(times))
+    else:
+        time_sd = 0.0
+    
+    return {
+        'runs': len(sim_results),
+        'avg_wave': avg_wave,
+        'avg_time': avg_time,
+        'wave_sd': wave_sd,
+        'time_sd': time_sd,
+        'min_wave': min(waves_reached),
+        'max_wave': max(waves_reached),
+    }
@@ -4,12 +4,20 @@ Multiprocessing helpers for Event Monte Carlo optimization.
 Design goals:
 - Windows-safe (spawn) -> all worker entrypoints are top-level and pickleable.
 - Keep worker payload small and pickle-friendly (plain dict/list inputs).
-- Deterministic per-task RNG seeding (event simulator uses global `random`).
+- Batch-friendly: `run_event_sims_batch` evaluates many candidates per task.
+- Deterministic per-task RNG: each task gets its own Philox stream derived from
+  its seed, so results do not depend on worker count or scheduling.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+try:
+    from ..result_cache import cached_sums, merge_sums, result_key, store_sums
+except (ImportError, ValueError):
+    # When gui.py runs directly, event is not a package, so use absolute import
+    from result_cache import cached_sums, merge_sums, result_key, store_sums
 
 
 def run_event_sims_summary(
@@ -18,30 +26,154 @@ def run_event_sims_summary(
     gem_levels: List[int],
     prestige: int,
     runs: int,
-    seed: int,
+    seed: Optional[int] = None,
+    exact: bool = False,
+    rng: Any = None,
+    crn: bool = False,
+    antithetic: bool = False,
 ) -> Dict[str, Any]:
     """
     Run `runs` event simulations for a concrete upgrade state and return averages.
 
+    With `exact=True` the averages come from the deterministic wave solver
+    (no sampling noise, but a small folding bias; `runs`/`seed` only matter if
+    the solver falls back to MC).
+
+    `rng` overrides `seed` (e.g. a stream from spawn_event_rngs); otherwise a
+    fresh Philox stream is created from `seed`. Global `random` is not touched.
+
+    With `crn=True`, `seed` names a bank of per-run streams shared by every
+    state evaluated with that seed (common random numbers, optionally paired
+    with antithetic runs); `rng` is ignored.
+
+    Seeded calls (no explicit `rng`) are served from the on-disk result cache
+    when the same inputs were simulated before. CRN run i always replays stream i
+    of `seed`, so a CRN evaluation with fewer runs is a prefix of this one: its
+    cached sums are topped up with just the missing runs and merged.
+
     Returns dict:
       - avg_wave: float
       - avg_time: float
+      - std_wave: float (sample std of the per-run distance, 0 for a single run)
     """
-    import random
-
-    # Ensure deterministic, per-task RNG. The simulator uses the global `random` module.
-    random.seed(int(seed) & 0x7FFFFFFF)
+    runs = max(1, int(runs))
+    key = None
+    prefix_key = None
+    prefix = None
+    if rng is None and seed is not None:
+        key = result_key(
+            "event_sims", levels=levels, gem_levels=gem_levels or [0, 0, 0, 0], prestige=int(prestige),
+            runs=runs, seed=int(seed), exact=bool(exact), crn=bool(crn),
+            antithetic=bool(antithetic) and bool(crn),
+        )
+        sums = cached_sums(key)
+        if sums is not None:
+            return event_summary_from_sums(sums)
+        if crn and not exact:
+            # Longest CRN evaluation of these inputs so far (any run count)
+            prefix_key = result_key(
+                "event_sims_crn_prefix", levels=levels, gem_levels=gem_levels or [0, 0, 0, 0],
+                prestige=int(prestige), seed=int(seed), antithetic=bool(antithetic),
+            )
+            prefix = cached_sums(prefix_key)
+            if prefix is not None and prefix["runs"] > runs:
+                # Cannot be cut down to `runs`; simulate from scratch and keep the longer entry
+                prefix, prefix_key = None, None
+            elif prefix is not None and prefix["runs"] == runs:
+                store_sums(key, prefix)
+                return event_summary_from_sums(prefix)
 
     from .optimizer import UpgradeState, calculate_player_stats
-    from .simulation import run_full_simulation
+    from .simulation import BATCH_MIN_RUNS, make_event_rng, run_full_simulation_batch, run_full_simulation_crn
+    from .wave_distribution import run_full_simulation_exact
 
     state = UpgradeState()
     for tier in range(1, 5):
         state.levels[tier] = list(levels.get(tier, []))
     state.gem_levels = list(gem_levels or [0, 0, 0, 0])
 
+    if rng is None:
+        rng = make_event_rng(None if seed is None else int(seed), scalar=runs < BATCH_MIN_RUNS)
+
     player, enemy = calculate_player_stats(state, int(prestige))
-    _results, avg_wave, avg_time = run_full_simulation(player, enemy, runs=max(1, int(runs)))
+    if crn and not exact:
+        done = prefix["runs"] if prefix is not None else 0
+        _results, avg_wave, avg_time = run_full_simulation_crn(
+            player, enemy, runs=runs - done, seed=seed, antithetic=antithetic, first_run=done
+        )
+    else:
+        simulate = run_full_simulation_exact if exact else run_full_simulation_batch
+        _results, avg_wave, avg_time = simulate(player, enemy, runs=runs, rng=rng)
+
+    std_wave = 0.0
+    if len(_results) > 1:
+        var = sum((w + 1 - sw * 0.2 - avg_wave) ** 2 for w, sw, _t in _results) / (len(_results) - 1)
+        std_wave = var ** 0.5
+
+    if key is not None:
+        # Mergeable sums: run count, sum of distance/time, sum of squared distance
+        n = max(1, len(_results))
+        sums = {
+            "runs": n,
+            "wave": float(avg_wave) * n,
+            "time": float(avg_time) * n,
+            "wave_sq": std_wave ** 2 * (n - 1) + float(avg_wave) ** 2 * n,
+        }
+        if prefix is not None:
+            sums = merge_sums(prefix, sums)
+        store_sums(key, sums)
+        if prefix_key is not None:
+            store_sums(prefix_key, sums)
+        if prefix is not None:
+            return event_summary_from_sums(sums)
+    return {"avg_wave": float(avg_wave), "avg_time": float(avg_time), "std_wave": float(std_wave)}
+
 
-    return {"avg_wave": float(avg_wave), "avg_time": float(avg_time)}
+def event_summary_from_sums(sums: Dict[str, Any]) -> Dict[str, Any]:
+    """run_event_sims_summary result from (possibly merged) cached sums"""
+    n = sums["runs"]
+    avg_wave = sums["wave"] / n
+    var = (sums["wave_sq"] - avg_wave ** 2 * n) / (n - 1) if n > 1 else 0.0
+    return {"avg_wave": float(avg_wave), "avg_time": float(sums["time"] / n), "std_wave": float(max(0.0, var) ** 0.5)}
+
+
+def run_event_sims_batch(
+    *,
+    payloads: List[Dict[str, Any]],
+    prestige: int,
+    runs: int,
+    exact: bool = False,
+    crn: bool = False,
+    antithetic: bool = False,
+):
+    """
+    Evaluate several candidate states in one task (amortizes pickling/IPC per task).
+
+    Each payload is a dict with `levels`, `gem_levels` and `seed`; the remaining
+    arguments are shared and behave as in `run_event_sims_summary`.
+
+    Returns a float array of shape (len(payloads), 2) with rows (avg_wave, avg_time)
+    (a list of tuples if NumPy is unavailable). Rows of candidates that failed are NaN.
+    """
+    rows = []
+    for payload in payloads:
+        try:
+            out = run_event_sims_summary(
+                levels=payload["levels"],
+                gem_levels=payload["gem_levels"],
+                prestige=prestige,
+                runs=runs,
+                seed=payload.get("seed"),
+                exact=exact,
+                crn=crn,
+                antithetic=antithetic,
+            )
+            rows.append((out["avg_wave"], out["avg_time"]))
+        except Exception:
+            rows.append((float("nan"), float("nan")))
 
+    try:
+        import numpy as np
+    except ImportError:
+        return rows
+    return np.asarray(rows, dtype=np.float64).reshape(len(rows), 2)
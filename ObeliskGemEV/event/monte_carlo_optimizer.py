@@ -3,16 +3,33 @@ Monte Carlo Optimizer for Event Budget Optimizer.
 Generates random upgrade sequences and finds the best one through simulation.
 """
 
+import heapq
+import itertools
 import random
 import math
-from typing import Any, Dict, List, Tuple, Optional, Callable
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; stats are then computed one state at a time
+    np = None
+
 from .constants import COSTS, MAX_LEVELS, CAP_UPGRADES, PRESTIGE_UNLOCKED
 from .stats import PlayerStats, EnemyStats
-from .simulation import apply_upgrades, run_full_simulation
+from .simulation import (
+    BATCH_MIN_RUNS, apply_upgrades, apply_upgrades_batch, make_event_rng, run_full_simulation_batch,
+    run_full_simulation_crn,
+)
+from .wave_distribution import run_full_simulation_exact
 from .optimizer import UpgradeState, calculate_player_stats, get_max_level_with_caps, is_upgrade_unlocked
 
+try:
+    from ..worker_pool import acquire_worker_pool
+except (ImportError, ValueError):
+    # When gui.py runs directly, event is not a package, so use absolute import
+    from worker_pool import acquire_worker_pool
+
 
 @dataclass
 class MCOptimizationResult:
@@ -28,6 +45,127 @@ class MCOptimizationResult:
     statistics: Dict[str, float]  # mean, median, std_dev, etc.
 
 
+# Sampling bias of the candidate builder (same ordering intent as the greedy optimizer).
+# Used only to bias sampling; it does not guarantee optimality.
+_CANDIDATE_PRIORITY = {
+    1: {0: 100, 9: 95, 6: 90, 1: 80, 2: 70, 4: 65, 3: 60, 5: 50, 7: 40, 8: 30},
+    2: {2: 100, 0: 90, 1: 85, 4: 80, 3: 70, 5: 50, 6: 40},
+    3: {0: 100, 4: 95, 7: 90, 1: 85, 3: 80, 2: 60, 6: 50, 5: 40},
+    4: {4: 100, 7: 95, 1: 90, 3: 85, 0: 80, 2: 70, 5: 50, 6: 40},
+}
+
+# (tier, idx) -> [cost of level 0 -> 1, level 1 -> 2, ...], grown on demand
+_UPGRADE_COSTS: Dict[Tuple[int, int], List[int]] = {}
+
+
+def _next_upgrade_cost(tier: int, idx: int, level: int) -> int:
+    """round(COSTS * 1.25 ** level), cached per upgrade"""
+    table = _UPGRADE_COSTS.setdefault((tier, idx), [])
+    base_cost = COSTS[tier][idx]
+    while len(table) <= level:
+        table.append(round(base_cost * (1.25 ** len(table))))
+    return table[level]
+
+
+class _CandidateBuilder:
+    """
+    Incremental purchase loop for candidate generation.
+
+    Keeps every unlocked upgrade's next cost, max level and sampling score and
+    only refreshes what a purchase changes: the bought upgrade, the affordability
+    of its tier (the remaining budget only shrinks) and, when a cap upgrade is
+    bought, the max levels. Greedy picks come from a lazily invalidated heap.
+    `affordable()` lists options in the same order (and with the same scores) as
+    a full rescan, so seeded candidates are unchanged.
+    """
+
+    def __init__(self, budget: Dict[int, float], prestige: int, initial_state: UpgradeState):
+        self.state = initial_state.copy()
+        self.remaining = {tier: float(budget[tier]) for tier in range(1, 5)}
+        self._slots = [
+            (tier, idx)
+            for tier in range(1, 5)
+            for idx in range(len(COSTS[tier]))
+            if is_upgrade_unlocked(tier, idx, prestige)
+        ]
+        self._position = {slot: pos for pos, slot in enumerate(self._slots)}
+        self._tier_positions = {tier: [] for tier in range(1, 5)}
+        for pos, (tier, _idx) in enumerate(self._slots):
+            self._tier_positions[tier].append(pos)
+        self._max_level = [0] * len(self._slots)
+        self._option: List[Optional[Tuple[int, int, int, float]]] = [None] * len(self._slots)
+        self._ok = [False] * len(self._slots)
+        # Max-heap (by score) of affordable options for greedy picks
+        self._heap: List[Tuple[float, int, Tuple[int, int, int, float]]] = []
+        self._refresh_max_levels()
+        for pos in range(len(self._slots)):
+            self._refresh_option(pos)
+        self._affordable: Optional[list] = None
+        self._weights: Optional[List[float]] = None
+
+    def _refresh_max_levels(self) -> None:
+        for pos, (tier, idx) in enumerate(self._slots):
+            self._max_level[pos] = get_max_level_with_caps(tier, idx, self.state)
+
+    def _refresh_option(self, pos: int) -> None:
+        """Next-level option (tier, idx, cost, score) of one upgrade"""
+        tier, idx = self._slots[pos]
+        level = self.state.levels[tier][idx]
+        cost = _next_upgrade_cost(tier, idx, level)
+        option = self._option[pos]
+        if option is None or option[2] != cost:
+            # Bias: higher priority and better cost efficiency.
+            prio = float(_CANDIDATE_PRIORITY.get(tier, {}).get(idx, 10))
+            option = (tier, idx, cost, prio / (float(cost) + 1.0) ** 0.35)
+            self._option[pos] = option
+        ok = level < self._max_level[pos] and option[2] <= self.remaining[tier]
+        self._ok[pos] = ok
+        if ok:
+            # Stale heap entries (option replaced or no longer affordable) are skipped in best()
+            heapq.heappush(self._heap, (-option[3], pos, option))
+
+    def affordable(self) -> List[Tuple[int, int, int, float]]:
+        """(tier, idx, next_cost, score) of every upgrade that can be bought now"""
+        if self._affordable is None:
+            self._affordable = [self._option[pos] for pos, ok in enumerate(self._ok) if ok]
+        return self._affordable
+
+    def best(self) -> Optional[Tuple[int, int, int, float]]:
+        """Affordable option with the highest score (first in upgrade order on ties), or None"""
+        heap = self._heap
+        while heap:
+            _neg_score, pos, option = heap[0]
+            if self._ok[pos] and self._option[pos] is option:
+                return option
+            heapq.heappop(heap)
+        return None
+
+    def weights(self) -> List[float]:
+        """Sampling weights of affordable(), in the same order"""
+        if self._weights is None:
+            self._weights = [max(1e-6, option[3]) for option in self.affordable()]
+        return self._weights
+
+    def buy(self, tier: int, idx: int, cost: float) -> None:
+        """Buy one level of (tier, idx) for `cost`"""
+        self.state.levels[tier][idx] += 1
+        remaining = self.remaining[tier] - float(cost)
+        self.remaining[tier] = remaining
+        if idx == CAP_UPGRADES[tier] - 1 or (tier, idx) == (4, 6):
+            # Cap (or cap of caps) bought: max levels of other upgrades moved
+            self._refresh_max_levels()
+            for pos in range(len(self._slots)):
+                self._refresh_option(pos)
+        else:
+            self._refresh_option(self._position[(tier, idx)])
+            # Costs only grow and the budget only shrinks: just drop what became too expensive
+            for pos in self._tier_positions[tier]:
+                if self._ok[pos] and self._option[pos][2] > remaining:
+                    self._ok[pos] = False
+        self._affordable = None
+        self._weights = None
+
+
 def _build_candidate_state(
     budget: Dict[int, float],
     prestige: int,
@@ -41,153 +179,235 @@ def _build_candidate_state(
 
     This function is *fast* (no simulation) and only constructs a feasible state.
     """
-    state = initial_state.copy()
-    remaining = {tier: float(budget[tier]) for tier in range(1, 5)}
-
-    # Available upgrades (unlocked at this prestige)
-    available_upgrades = []
-    for tier in range(1, 5):
-        for idx in range(len(COSTS[tier])):
-            if is_upgrade_unlocked(tier, idx, prestige):
-                available_upgrades.append((tier, idx))
-
-    # A lightweight priority table (same ordering intent as greedy optimizer).
-    # This is used only to bias sampling; it does not guarantee optimality.
-    tier_priority_score = {
-        1: {0: 100, 9: 95, 6: 90, 1: 80, 2: 70, 4: 65, 3: 60, 5: 50, 7: 40, 8: 30},
-        2: {2: 100, 0: 90, 1: 85, 4: 80, 3: 70, 5: 50, 6: 40},
-        3: {0: 100, 4: 95, 7: 90, 1: 85, 3: 80, 2: 60, 6: 50, 5: 40},
-        4: {4: 100, 7: 95, 1: 90, 3: 85, 0: 80, 2: 70, 5: 50, 6: 40},
-    }
+    builder = _CandidateBuilder(budget, prestige, initial_state)
 
     max_iterations = 2000
     for _ in range(max_iterations):
-        affordable = []
-        for tier, idx in available_upgrades:
-            current_level = state.get_level(tier, idx)
-            max_level = get_max_level_with_caps(tier, idx, state)
-            if current_level >= max_level:
-                continue
-
-            base_cost = COSTS[tier][idx]
-            next_cost = round(base_cost * (1.25 ** current_level))
-            if next_cost <= remaining[tier]:
-                # Bias: higher priority and better cost efficiency.
-                prio = float(tier_priority_score.get(tier, {}).get(idx, 10))
-                eff = prio / (float(next_cost) + 1.0) ** 0.35
-                affordable.append((tier, idx, next_cost, eff))
-
-        if not affordable:
-            break
+        best = builder.best()
+        if best is None:
+            break  # Nothing affordable
 
         if epsilon_greedy > 0.0 and rng.random() >= epsilon_greedy:
             # Greedy step: pick best score.
-            tier, idx, cost, _ = max(affordable, key=lambda x: x[3])
+            tier, idx, cost, _ = best
         else:
             # Exploratory step: weighted pick by score.
-            weights = [max(1e-6, a[3]) for a in affordable]
-            tier, idx, cost, _ = rng.choices(affordable, weights=weights, k=1)[0]
+            tier, idx, cost, _ = rng.choices(builder.affordable(), weights=builder.weights(), k=1)[0]
 
-        state.set_level(tier, idx, state.get_level(tier, idx) + 1)
-        remaining[tier] -= float(cost)
+        builder.buy(tier, idx, cost)
 
-    return state
+    return builder.state
 
 
-def _evaluate_state_serial(
-    state: UpgradeState,
-    prestige: int,
-    *,
-    runs: int,
-    seed: int,
-) -> Tuple[float, float]:
-    """
-    Evaluate a candidate state using Monte Carlo simulation (serial fallback).
-    """
-    import random as _random
-
-    _random.seed(int(seed) & 0x7FFFFFFF)
-    player, enemy = calculate_player_stats(state, prestige)
-    _res, avg_wave, avg_time = run_full_simulation(player, enemy, runs=max(1, int(runs)))
-    return float(avg_wave), float(avg_time)
-
-
-def monte_carlo_optimize_guided(
+def _iter_candidates(
     budget: Dict[int, float],
     prestige: int,
-    initial_state: Optional[UpgradeState] = None,
-    num_runs: int = 2000,
-    progress_callback: Optional[Callable[[int, int, float, float], None]] = None,
-    event_runs_per_combination: int = 5,
-    *,
-    seed_base: Optional[int] = None,
-) -> MCOptimizationResult:
+    initial_state: UpgradeState,
+    n_candidates: int,
+    seed_base: int,
+):
     """
-    Guided single-core Monte Carlo optimization (no multiprocessing, no 2-phase refinement).
-
-    Differences vs old MC:
-    - Uses the same biased/epsilon-greedy candidate generation as the parallel optimizer.
-    - Includes a greedy seed candidate.
-
-    Differences vs new parallel MC:
-    - Evaluates *all* candidates with the full `event_runs_per_combination` (no screen+refine).
-    - Runs serially (single-core), but is deterministic if `seed_base` is provided.
+    Candidate states of the MC optimizers, generated lazily: the greedy solution
+    first (if it succeeds), then `n_candidates` sampled states (80% epsilon-greedy,
+    20% pure random; candidate i uses random.Random(seed_base + i)).
     """
-    import time
-
-    if initial_state is None:
-        initial_state = UpgradeState()
-
-    n_candidates = max(1, int(num_runs))
-    runs = max(1, int(event_runs_per_combination))
-
-    seed_base_local = int(seed_base) & 0x7FFFFFFF if seed_base is not None else (int(time.time() * 1000) & 0x7FFFFFFF)
-
-    candidates: List[UpgradeState] = []
     try:
         from .optimizer import greedy_optimize
 
         greedy_res = greedy_optimize(budget=budget, prestige=prestige, initial_state=initial_state)
-        candidates.append(greedy_res.upgrades.copy())
+        yield greedy_res.upgrades.copy()
     except Exception:
+        # If greedy fails for any reason, continue with stochastic candidates.
         pass
 
     for i in range(n_candidates):
-        rng = random.Random(seed_base_local + i)
-        eps = 0.20 if (i % 5 != 0) else 1.0
-        candidates.append(
-            _build_candidate_state(
-                budget,
-                prestige,
-                initial_state,
-                rng=rng,
-                epsilon_greedy=eps,
-            )
-        )
+        rng = random.Random(seed_base + i)
+        # Mix exploration and exploitation.
+        eps = 0.20 if (i % 5 != 0) else 1.0  # 80% of candidates are epsilon-greedy, 20% pure random
+        yield _build_candidate_state(budget, prestige, initial_state, rng=rng, epsilon_greedy=eps)
 
-    all_results: List[Tuple[UpgradeState, float, float]] = []
-    best_state = None
-    best_wave = -1.0
-    best_time = float("inf")
 
-    for idx, cand in enumerate(candidates, start=1):
-        wave, t = _evaluate_state_serial(cand, prestige, runs=runs, seed=seed_base_local + 10_000 + idx)
-        all_results.append((cand, wave, t))
+def _evaluate_state_serial(
+    state: UpgradeState,
+    prestige: int,
+    *,
+    runs: int,
+    seed: Optional[int],
+    exact: bool = False,
+    crn: bool = False,
+    antithetic: bool = False,
+    memo: Optional["_EvaluationMemo"] = None,
+    phase: str = "",
+) -> Tuple[float, float]:
+    """
+    Evaluate a candidate state using Monte Carlo simulation (serial fallback).
 
-        if wave > best_wave or (wave == best_wave and t < best_time):
-            best_wave = wave
-            best_time = t
-            best_state = cand.copy()
+    With `exact=True` the deterministic wave solver is used instead; `crn`/`antithetic`
+    behave as in `run_event_sims_summary`. `seed=None` draws from the global `random`.
 
-        if progress_callback:
-            try:
-                progress_callback(idx, len(candidates), wave, best_wave)
-            except Exception:
-                pass
+    With a `memo`, states whose stats were already simulated in the same `phase`
+    reuse those runs and only simulate the runs still missing.
+    """
+    if memo is None:
+        player, enemy = calculate_player_stats(state, prestige)
+        return _simulate_stats(player, enemy, runs=runs, seed=seed, exact=exact, crn=crn, antithetic=antithetic)
+
+    stats_key = memo.stats_key(state)
+    # CRN runs are only comparable with the same bank of streams, so they are never extended
+    context = (phase, seed, runs) if crn and not exact else phase
+    missing = memo.runs_needed(stats_key, runs, context)
+    if missing:
+        player, enemy = PlayerStats(*stats_key[0]), EnemyStats(*stats_key[1])
+        wave, t = _simulate_stats(player, enemy, runs=missing, seed=seed, exact=exact, crn=crn, antithetic=antithetic)
+        memo.record(stats_key, missing, wave, t, context)
+    return memo.average(stats_key, context)
+
+
+def _simulate_stats(
+    player: PlayerStats,
+    enemy: EnemyStats,
+    *,
+    runs: int,
+    seed: Optional[int],
+    exact: bool,
+    crn: bool,
+    antithetic: bool,
+) -> Tuple[float, float]:
+    """(avg_wave, avg_time) of `runs` event runs for concrete stats"""
+    if crn and not exact:
+        _res, avg_wave, avg_time = run_full_simulation_crn(
+            player, enemy, runs=max(1, int(runs)), seed=int(seed), antithetic=antithetic
+        )
+        return float(avg_wave), float(avg_time)
+    simulate = run_full_simulation_exact if exact else run_full_simulation_batch
+    runs = max(1, int(runs))
+    rng = make_event_rng(int(seed), scalar=runs < BATCH_MIN_RUNS) if seed is not None else None
+    _res, avg_wave, avg_time = simulate(player, enemy, runs=runs, rng=rng)
+    return float(avg_wave), float(avg_time)
 
-    waves = [r[1] for r in all_results]
-    times = [r[2] for r in all_results]
 
+class _EvaluationMemo:
+    """
+    Two-level memo shared by one optimizer run.
+
+    Level 1 maps a state (UpgradeState.key) to its (PlayerStats, EnemyStats)
+    tuples: many candidates are identical, and many distinct ones give identical
+    stats after apply_upgrades (capped or irrelevant upgrades). Level 2 maps
+    those stats to the runs simulated so far (run count, wave sum, time sum)
+    per `context`, so duplicates reuse - and if they need more runs, extend -
+    earlier evaluations. `group` fills level 1 for a whole candidate list with
+    one batched apply_upgrades call.
+
+    Contexts keep screening and refinement apart: refining with the screening
+    runs would carry the screening luck (that picked the top-K) into the final
+    ranking.
+    """
+
+    # Below this many new states the batch call costs more than it saves
+    PRIME_MIN_STATES = 16
+
+    def __init__(self, prestige: int):
+        self.prestige = prestige
+        self._stats: Dict[tuple, tuple] = {}
+        self._sums: Dict[Tuple[tuple, Any], List[float]] = {}
+        self.requests = 0
+        self.hits = 0
+
+    def stats_key(self, state: UpgradeState) -> tuple:
+        """(player fields, enemy fields) of `state` (PlayerStats(*key[0]) rebuilds the stats)"""
+        key = state.key()
+        stats_key = self._stats.get(key)
+        if stats_key is None:
+            player, enemy = calculate_player_stats(state, self.prestige)
+            # Flat numeric dataclasses: vars() is in field order and much cheaper than astuple
+            stats_key = (tuple(vars(player).values()), tuple(vars(enemy).values()))
+            self._stats[key] = stats_key
+        return stats_key
+
+    def prime(self, states: List[UpgradeState]) -> None:
+        """Compute the stats of all new `states` with one apply_upgrades_batch call"""
+        pending: Dict[tuple, UpgradeState] = {}
+        for state in states:
+            key = state.key()
+            if key not in self._stats:
+                pending.setdefault(key, state)
+        if np is None or len(pending) < self.PRIME_MIN_STATES:
+            return  # stats_key computes them one by one
+        keys = list(pending)
+        level_matrix = [[level for tier in range(1, 5) for level in pending[key].levels[tier]] for key in keys]
+        stats = apply_upgrades_batch(level_matrix, self.prestige, [pending[key].gem_levels for key in keys])
+        # tolist(): int columns stay int, so keys equal the ones stats_key builds
+        columns = {name: values.tolist() for name, values in stats.items()}
+        player_fields = [(columns.get(name), value) for name, value in vars(PlayerStats()).items()]
+        enemy_fields = [(columns.get(f"e_{name}"), value) for name, value in vars(EnemyStats()).items()]
+        for row, key in enumerate(keys):
+            self._stats[key] = (
+                tuple(base if column is None else column[row] for column, base in player_fields),
+                tuple(base if column is None else column[row] for column, base in enemy_fields),
+            )
+
+    def runs_needed(self, stats_key: tuple, runs: int, context: Any = None) -> int:
+        """Runs still to simulate for an evaluation with `runs` runs (0 = served from the memo)"""
+        self.requests += 1
+        sums = self._sums.get((stats_key, context))
+        done = int(sums[0]) if sums is not None else 0
+        if done >= runs:
+            self.hits += 1
+            return 0
+        return runs - done
+
+    def record(self, stats_key: tuple, runs: int, wave: float, time: float, context: Any = None) -> None:
+        sums = self._sums.setdefault((stats_key, context), [0, 0.0, 0.0])
+        sums[0] += runs
+        sums[1] += wave * runs
+        sums[2] += time * runs
+
+    def average(self, stats_key: tuple, context: Any = None) -> Tuple[float, float]:
+        runs, wave, time = self._sums[(stats_key, context)]
+        return wave / runs, time / runs
+
+    def group(self, candidates: List[UpgradeState], indices) -> Dict[int, List[int]]:
+        """
+        Group candidate indices by stats for batch submission: first index of each
+        group -> all of its indices. Every index after the first counts as a hit.
+        """
+        indices = list(indices)
+        self.prime([candidates[idx] for idx in indices])
+        first: Dict[tuple, int] = {}
+        groups: Dict[int, List[int]] = {}
+        for idx in indices:
+            groups.setdefault(self.join(first, candidates[idx], idx), []).append(idx)
+        return groups
+
+    def join(self, first: Dict[tuple, int], candidate: UpgradeState, idx: int) -> int:
+        """
+        Streaming form of `group`: index of the first candidate with the same
+        stats (registered in `first`), counting a hit if that is not `idx`.
+        """
+        rep = first.setdefault(self.stats_key(candidate), idx)
+        self.requests += 1
+        self.hits += rep != idx
+        return rep
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of evaluations served without simulating"""
+        return self.hits / self.requests if self.requests else 0.0
+
+
+def _build_mc_result(
+    budget: Dict[int, float],
+    prestige: int,
+    initial_state: UpgradeState,
+    best_state: Optional[UpgradeState],
+    best_wave: float,
+    best_time: float,
+    all_results: List[Tuple[UpgradeState, float, float]],
+    waves: List[float],
+    times: List[float],
+    dedup_hit_rate: float = 0.0,
+) -> MCOptimizationResult:
+    """Summary statistics, material accounting and result assembly shared by the MC optimizers."""
     waves_sorted = sorted(waves)
     times_sorted = sorted(times)
     n = len(waves)
@@ -237,6 +457,7 @@ def monte_carlo_optimize_guided(
         "mean_time": float(mean_time),
         "median_time": float(median_time),
         "std_dev_time": float(std_dev_time),
+        "dedup_hit_rate": float(dedup_hit_rate),
     }
 
     return MCOptimizationResult(
@@ -252,6 +473,324 @@ def monte_carlo_optimize_guided(
     )
 
 
+def monte_carlo_optimize_guided(
+    budget: Dict[int, float],
+    prestige: int,
+    initial_state: Optional[UpgradeState] = None,
+    num_runs: int = 2000,
+    progress_callback: Optional[Callable[[int, int, float, float], None]] = None,
+    event_runs_per_combination: int = 5,
+    *,
+    seed_base: Optional[int] = None,
+) -> MCOptimizationResult:
+    """
+    Guided single-core Monte Carlo optimization (no multiprocessing, no 2-phase refinement).
+
+    Differences vs old MC:
+    - Uses the same biased/epsilon-greedy candidate generation as the parallel optimizer.
+    - Includes a greedy seed candidate.
+
+    Differences vs new parallel MC:
+    - Evaluates *all* candidates with the full `event_runs_per_combination` (no screen+refine).
+    - Runs serially (single-core), but is deterministic if `seed_base` is provided.
+
+    Candidates with the same stats as an earlier one reuse its evaluation
+    (`statistics["dedup_hit_rate"]`).
+    """
+    import time
+
+    if initial_state is None:
+        initial_state = UpgradeState()
+
+    n_candidates = max(1, int(num_runs))
+    runs = max(1, int(event_runs_per_combination))
+
+    seed_base_local = int(seed_base) & 0x7FFFFFFF if seed_base is not None else (int(time.time() * 1000) & 0x7FFFFFFF)
+
+    candidates = list(_iter_candidates(budget, prestige, initial_state, n_candidates, seed_base_local))
+
+    all_results: List[Tuple[UpgradeState, float, float]] = []
+    best_state = None
+    best_wave = -1.0
+    best_time = float("inf")
+    memo = _EvaluationMemo(prestige)
+
+    for idx, cand in enumerate(candidates, start=1):
+        wave, t = _evaluate_state_serial(cand, prestige, runs=runs, seed=seed_base_local + 10_000 + idx, memo=memo)
+        all_results.append((cand, wave, t))
+
+        if wave > best_wave or (wave == best_wave and t < best_time):
+            best_wave = wave
+            best_time = t
+            best_state = cand.copy()
+
+        if progress_callback:
+            try:
+                progress_callback(idx, len(candidates), wave, best_wave)
+            except Exception:
+                pass
+
+    waves = [r[1] for r in all_results]
+    times = [r[2] for r in all_results]
+    return _build_mc_result(
+        budget, prestige, initial_state, best_state, best_wave, best_time, all_results, waves, times,
+        dedup_hit_rate=memo.hit_rate,
+    )
+
+
+# Racing scheduler (scheduler="racing"): each rung keeps at most 1/RACING_ETA of the
+# candidates and gives survivors RACING_ETA times more runs; candidates whose upper
+# confidence bound falls below the incumbent's lower bound are dropped early.
+RACING_ETA = 3
+RACING_Z = 2.0
+
+
+def _race_candidates(
+    candidates: List[UpgradeState],
+    prestige: int,
+    *,
+    first_runs: int,
+    max_runs: int,
+    task_seed: Callable[[int, int], int],
+    exact: bool,
+    crn: bool,
+    antithetic: bool,
+    progress: Callable[[int, int, float, float], None],
+    memo: "_EvaluationMemo",
+) -> Tuple[List[Tuple[int, float, float]], List[Tuple[UpgradeState, float, float]], Optional[int], float, float]:
+    """
+    Successive-halving race over `candidates` with confidence-bound elimination.
+
+    Candidates with identical stats race as one entrant (the first of them),
+    accumulating runs across rungs; its rung-0 averages are reported for all.
+
+    Returns (screening_scores, all_results, best_idx, best_wave, best_time) where
+    screening_scores/all_results hold the rung-0 averages (one entry per candidate)
+    and best_wave/best_time are the winner's averages over all of its runs.
+    """
+    import os
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    from .mc_parallel import run_event_sims_summary
+
+    max_workers = os.cpu_count() or 1
+    max_pending = max(2, max_workers * 2)
+
+    # Per-candidate running sums over individual event runs
+    n_runs: Dict[int, int] = {}
+    sum_wave: Dict[int, float] = {}
+    sumsq_wave: Dict[int, float] = {}
+    sum_time: Dict[int, float] = {}
+
+    screening_scores: List[Tuple[int, float, float]] = []
+    all_results: List[Tuple[UpgradeState, float, float]] = []
+
+    def _mean(idx: int) -> float:
+        return sum_wave[idx] / n_runs[idx]
+
+    def _record(rung: int, idx: int, runs: int, out: Dict[str, Any]) -> None:
+        wave = float(out.get("avg_wave", 0.0))
+        std = float(out.get("std_wave", 0.0))
+        t = float(out.get("avg_time", 0.0))
+        n_runs[idx] = n_runs.get(idx, 0) + runs
+        sum_wave[idx] = sum_wave.get(idx, 0.0) + wave * runs
+        sumsq_wave[idx] = sumsq_wave.get(idx, 0.0) + (runs - 1) * std * std + runs * wave * wave
+        sum_time[idx] = sum_time.get(idx, 0.0) + t * runs
+        if rung == 0:
+            for member in groups[idx]:
+                screening_scores.append((member, wave, t))
+                all_results.append((candidates[member], wave, t))
+
+    def _kwargs(rung: int, idx: int, runs: int) -> Dict[str, Any]:
+        s = candidates[idx]
+        return dict(
+            levels={tier: s.levels[tier].copy() for tier in range(1, 5)},
+            gem_levels=s.gem_levels.copy(),
+            prestige=prestige,
+            runs=runs,
+            seed=task_seed(rung * 100_000, idx),
+            exact=exact,
+            crn=crn,
+            antithetic=antithetic,
+        )
+
+    groups = memo.group(candidates, range(len(candidates)))
+    alive = list(groups)
+    runs = max(1, int(first_runs))
+    rung = 0
+    best_idx: Optional[int] = None
+    use_parallel = max_workers > 1
+    executor = acquire_worker_pool(max_workers) if use_parallel else None
+    try:
+        while alive:
+            completed = 0
+            best_wave_rung = -1.0
+
+            def _on_done(idx: int, out: Dict[str, Any]) -> None:
+                nonlocal completed, best_wave_rung
+                completed += 1
+                _record(rung, idx, runs, out)
+                best_wave_rung = max(best_wave_rung, float(out.get("avg_wave", 0.0)))
+                progress(completed, len(alive), float(out.get("avg_wave", 0.0)), best_wave_rung)
+
+            if executor is None:
+                for idx in alive:
+                    try:
+                        _on_done(idx, run_event_sims_summary(**_kwargs(rung, idx, runs)))
+                    except Exception:
+                        continue
+            else:
+                pending: Dict[Any, int] = {}
+                for idx in alive:
+                    pending[executor.submit(run_event_sims_summary, **_kwargs(rung, idx, runs))] = idx
+                    while len(pending) >= max_pending or (idx == alive[-1] and pending):
+                        done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
+                        for f in done:
+                            cand_idx = pending.pop(f)
+                            try:
+                                _on_done(cand_idx, f.result())
+                            except Exception:
+                                continue
+
+            # Candidates whose jobs failed drop out of the race
+            alive = [idx for idx in alive if idx in n_runs]
+            if not alive:
+                break
+
+            best_idx = max(alive, key=lambda i: (_mean(i), -sum_time[i] / n_runs[i]))
+            if len(alive) == 1 or exact or n_runs[best_idx] >= max_runs:
+                break
+
+            # A single run has no variance estimate (the bound would be 0 and only the
+            # luckiest runs would survive), so everyone advances until they have two
+            if min(n_runs[i] for i in alive) >= 2:
+                # Pooled per-run variance: individual estimates from a handful of runs are too noisy
+                variances = [
+                    max(0.0, (sumsq_wave[i] - n_runs[i] * _mean(i) ** 2) / (n_runs[i] - 1)) for i in alive
+                ]
+                pooled_var = sum(variances) / len(variances)
+
+                def _half_width(idx: int) -> float:
+                    return RACING_Z * math.sqrt(pooled_var / n_runs[idx])
+
+                incumbent_lcb = _mean(best_idx) - _half_width(best_idx)
+                contenders = [i for i in alive if _mean(i) + _half_width(i) >= incumbent_lcb]
+                contenders.sort(key=lambda i: (-_mean(i), sum_time[i] / n_runs[i]))
+                alive = contenders[: max(1, math.ceil(len(alive) / RACING_ETA))]
+
+            rung += 1
+            runs = max(1, min(runs * RACING_ETA, max_runs - n_runs[best_idx]))
+    finally:
+        if executor is not None:
+            try:
+                executor.shutdown(wait=False, cancel_futures=True)
+            except TypeError:
+                executor.shutdown(wait=False)
+
+    if best_idx is None:
+        return screening_scores, all_results, None, 0.0, 0.0
+    return (
+        screening_scores,
+        all_results,
+        best_idx,
+        _mean(best_idx),
+        sum_time[best_idx] / n_runs[best_idx],
+    )
+
+
+# Chunked evaluation: aim for tasks of roughly this many seconds each, so IPC and
+# future bookkeeping stay small relative to simulation time.
+CHUNK_TARGET_SECONDS = 0.05
+MAX_CHUNK_SIZE = 256
+
+
+def _evaluate_chunked(
+    executor: Any,
+    jobs: Iterable[Tuple[int, Dict[int, List[int]], List[int], int]],
+    *,
+    prestige: int,
+    runs: int,
+    exact: bool,
+    crn: bool,
+    antithetic: bool,
+    max_workers: int,
+    max_pending: int,
+    on_result: Callable[[int, float, float], None],
+    total_jobs: Optional[int] = None,
+) -> None:
+    """
+    Evaluate (cand_idx, levels, gem_levels, seed) jobs through `run_event_sims_batch`.
+
+    The first chunks hold a single candidate; afterwards the chunk size follows the
+    measured per-candidate cost (wall time x workers / candidates done), capped so
+    the tail of the job list still spreads over all workers.
+    `on_result(cand_idx, wave, time)` is called for every successful candidate.
+
+    `jobs` may be a lazy iterator: jobs are only pulled while fewer than
+    `max_pending` chunks are in flight, so generating them overlaps with the
+    workers. `total_jobs` (default len(jobs)) is an upper bound for the tail cap.
+    """
+    import time
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    from .mc_parallel import run_event_sims_batch
+
+    start = time.perf_counter()
+    done_candidates = 0
+    pending: Dict[Any, List[int]] = {}
+
+    def _collect() -> None:
+        nonlocal done_candidates
+        done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
+        for f in done:
+            cand_indices = pending.pop(f, None)
+            if cand_indices is None:
+                continue
+            done_candidates += len(cand_indices)
+            try:
+                rows = f.result()
+            except Exception:
+                continue
+            for cand_idx, (wave, t) in zip(cand_indices, rows):
+                wave, t = float(wave), float(t)
+                if math.isnan(wave):
+                    continue
+                on_result(cand_idx, wave, t)
+
+    if total_jobs is None:
+        total_jobs = len(jobs)
+    job_iter = iter(jobs)
+    pos = 0
+    while True:
+        chunk = 1
+        if done_candidates:
+            per_candidate = (time.perf_counter() - start) * max_workers / done_candidates
+            chunk = int(CHUNK_TARGET_SECONDS / max(per_candidate, 1e-6))
+        remaining = max(1, total_jobs - pos)
+        chunk = max(1, min(chunk, MAX_CHUNK_SIZE, math.ceil(remaining / max_workers)))
+
+        batch = list(itertools.islice(job_iter, chunk))
+        if not batch:
+            break
+        pos += len(batch)
+        fut = executor.submit(
+            run_event_sims_batch,
+            payloads=[{"levels": lv, "gem_levels": gl, "seed": sd} for _i, lv, gl, sd in batch],
+            prestige=prestige,
+            runs=runs,
+            exact=exact,
+            crn=crn,
+            antithetic=antithetic,
+        )
+        pending[fut] = [i for i, _lv, _gl, _sd in batch]
+
+        if len(pending) >= max_pending:
+            _collect()
+
+    while pending:
+        _collect()
+
+
 def monte_carlo_optimize_parallel(
     budget: Dict[int, float],
     prestige: int,
@@ -263,24 +802,45 @@ def monte_carlo_optimize_parallel(
     screening_runs_per_combination: Optional[int] = None,
     top_k_ratio: float = 0.20,
     seed_base: Optional[int] = None,
+    exact_screening: bool = False,
+    crn: bool = False,
+    antithetic: bool = False,
+    scheduler: str = "two_phase",
 ) -> MCOptimizationResult:
     """
     Best-quality Monte Carlo optimization using a parallel, two-phase approach.
 
     Phase 1 (screening):
-      - Generate `num_runs` candidate states cheaply (no simulation).
+      - Generate `num_runs` candidate states cheaply (no simulation), lazily: they
+        stream into the bounded submission window, so workers start right away.
       - Evaluate each with a small number of event runs (low variance, fast).
+      - Results are aggregated online; only a bounded top-K heap of states is kept.
 
     Phase 2 (refinement):
       - Re-evaluate only the top-K candidates with the full `event_runs_per_combination`.
+      - `all_results` holds these top-K screening results (best first); the summary
+        statistics still cover every screened candidate.
 
     Notes:
-    - Uses `ProcessPoolExecutor` (multi-core) when available; falls back to serial evaluation.
+    - Uses the shared worker pool (multi-core) when available; falls back to serial evaluation.
     - Candidate generation is "epsilon-greedy" biased (more signal than pure random).
+    - `exact_screening=True` screens with the deterministic wave solver instead of
+      a few MC runs: slower per candidate, but the top-K ranking has no sampling
+      noise (only the solver's small folding bias).
+    - `crn=True` evaluates every candidate against the same bank of per-run random
+      streams (one bank for screening, one for refinement), so rankings compare
+      upgrades rather than luck; `antithetic=True` additionally pairs each run with
+      its mirrored (1 - u) twin. Both allow far fewer runs per candidate.
+    - `scheduler="racing"` replaces the fixed screen/top-K split with successive
+      halving: every candidate starts with the screening runs, and only candidates
+      still statistically competitive with the incumbent get more (up to
+      `RACING_ETA * event_runs_per_combination` runs in total). `top_k_ratio` is unused.
+    - Candidates with identical stats (same state, or upgrades that do not change
+      the stats) are simulated once per phase; `statistics["dedup_hit_rate"]` is the
+      fraction of evaluations that reused another candidate's runs.
     """
     import os
     import time
-    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
     if initial_state is None:
         initial_state = UpgradeState()
@@ -293,40 +853,24 @@ def monte_carlo_optimize_parallel(
         else max(1, min(3, final_runs))
     )
 
-    # Build candidate pool (include a strong deterministic seed).
-    candidates: List[UpgradeState] = []
-    try:
-        from .optimizer import greedy_optimize
+    seed_base_local = int(seed_base) & 0x7FFFFFFF if seed_base is not None else (int(time.time() * 1000) & 0x7FFFFFFF)
 
-        greedy_res = greedy_optimize(budget=budget, prestige=prestige, initial_state=initial_state)
-        candidates.append(greedy_res.upgrades.copy())
-    except Exception:
-        # If greedy fails for any reason, continue with stochastic candidates.
-        pass
+    def _task_seed(phase_offset: int, idx: int) -> int:
+        # CRN: every candidate in a phase shares one bank of random streams
+        return seed_base_local + phase_offset + (0 if crn else idx)
 
-    seed_base_local = int(seed_base) & 0x7FFFFFFF if seed_base is not None else (int(time.time() * 1000) & 0x7FFFFFFF)
-    for i in range(n_candidates):
-        rng = random.Random(seed_base_local + i)
-        # Mix exploration and exploitation.
-        eps = 0.20 if (i % 5 != 0) else 1.0  # 80% of candidates are epsilon-greedy, 20% pure random
-        candidates.append(
-            _build_candidate_state(
-                budget,
-                prestige,
-                initial_state,
-                rng=rng,
-                epsilon_greedy=eps,
-            )
-        )
+    # Candidates are generated lazily (the greedy solution first, as a strong deterministic seed)
+    # and streamed into screening, so workers start on the first ones right away.
+    candidate_stream = _iter_candidates(budget, prestige, initial_state, n_candidates, seed_base_local)
+    planned = [n_candidates + 1]  # candidates in the stream (exact once it is exhausted)
+
+    memo = _EvaluationMemo(prestige)
 
     # Helper: submit payload for pickling
     def _payload(s: UpgradeState) -> Tuple[Dict[int, List[int]], List[int]]:
         levels = {tier: s.levels[tier].copy() for tier in range(1, 5)}
         return levels, s.gem_levels.copy()
 
-    # Phase 1: screening evaluation (parallel if possible)
-    all_results: List[Tuple[UpgradeState, float, float]] = []
-
     def _update_progress(done: int, total: int, current_wave: float, best_wave: float) -> None:
         if progress_callback:
             try:
@@ -334,11 +878,66 @@ def monte_carlo_optimize_parallel(
             except Exception:
                 pass
 
+    if scheduler == "racing":
+        # Every rung ranks all candidates, so racing needs the full pool
+        candidates = list(candidate_stream)
+        screening_scores, all_results, best_idx, best_wave, best_time = _race_candidates(
+            candidates,
+            prestige,
+            first_runs=screening_runs,
+            max_runs=max(screening_runs, final_runs * RACING_ETA),
+            task_seed=_task_seed,
+            exact=exact_screening,
+            crn=crn,
+            antithetic=antithetic,
+            progress=_update_progress,
+            memo=memo,
+        )
+        best_state = candidates[best_idx].copy() if best_idx is not None else initial_state
+        waves = [w for _idx, w, _t in screening_scores]
+        times = [t for _idx, _w, t in screening_scores]
+        return _build_mc_result(
+            budget, prestige, initial_state, best_state, best_wave, best_time, all_results, waves, times,
+            dedup_hit_rate=memo.hit_rate,
+        )
+    if scheduler != "two_phase":
+        raise ValueError(f"Unknown scheduler: {scheduler!r}")
+
+    # Phase 1: screening evaluation (parallel if possible), aggregated online:
+    # only the screening waves/times and a bounded top-K heap of states are kept.
     best_wave_screen = -1.0
     best_time_screen = float("inf")
     best_state_screen = None
 
-    screening_scores: List[Tuple[int, float, float]] = []  # (idx, wave, time)
+    waves: List[float] = []
+    times: List[float] = []
+    top_k_max = min(max(10, int(planned[0] * float(top_k_ratio))), planned[0])
+    # Min-heap on (wave, -time, -idx): the root is the weakest kept candidate
+    top_heap: List[Tuple[float, float, int, UpgradeState]] = []
+
+    def _on_screened(cand_idx: int, state: UpgradeState, wave: float, t: float) -> None:
+        nonlocal best_wave_screen, best_time_screen, best_state_screen
+        waves.append(wave)
+        times.append(t)
+        entry = (wave, -t, -cand_idx, state)
+        if len(top_heap) < top_k_max:
+            heapq.heappush(top_heap, entry)
+        elif entry[:3] > top_heap[0][:3]:
+            heapq.heapreplace(top_heap, entry)
+
+        if wave > best_wave_screen or (wave == best_wave_screen and t < best_time_screen):
+            best_wave_screen = wave
+            best_time_screen = t
+            best_state_screen = state.copy()
+
+        _update_progress(len(waves), planned[0], wave, best_wave_screen)
+
+    def _indexed_candidates():
+        count = 0
+        for idx, cand in enumerate(candidate_stream):
+            count += 1
+            yield idx, cand
+        planned[0] = count
 
     max_workers = os.cpu_count() or 1
     max_pending = max(2, max_workers * 2)
@@ -346,13 +945,12 @@ def monte_carlo_optimize_parallel(
     # Try process pool; fallback to serial if something goes wrong (Windows spawn edge cases).
     use_parallel = True
     try:
-        from .mc_parallel import run_event_sims_summary
+        from .mc_parallel import run_event_sims_batch  # noqa: F401
     except Exception:
         use_parallel = False
-        run_event_sims_summary = None  # type: ignore[assignment]
 
     if use_parallel:
-        executor = ProcessPoolExecutor(max_workers=max_workers)
+        executor = acquire_worker_pool(max_workers)
         executor_shutdown = False
 
         def _shutdown_executor(cancel_futures: bool) -> None:
@@ -367,102 +965,82 @@ def monte_carlo_optimize_parallel(
                 pass
             executor_shutdown = True
 
-        pending: Dict[Any, int] = {}
-        completed = 0
-        try:
-            for idx, cand in enumerate(candidates):
-                levels, gem_levels = _payload(cand)
-                fut = executor.submit(
-                    run_event_sims_summary,  # type: ignore[misc]
-                    levels=levels,
-                    gem_levels=gem_levels,
-                    prestige=prestige,
-                    runs=screening_runs,
-                    seed=seed_base_local + idx,
-                )
-                pending[fut] = idx
-
-                if len(pending) >= max_pending:
-                    done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
-                    for f in done:
-                        cand_idx = pending.pop(f, None)
-                        if cand_idx is None:
-                            continue
-                        completed += 1
-                        try:
-                            out = f.result()
-                            wave = float(out.get("avg_wave", 0.0))
-                            t = float(out.get("avg_time", 0.0))
-                        except Exception:
-                            continue
-
-                        screening_scores.append((cand_idx, wave, t))
-                        all_results.append((candidates[cand_idx], wave, t))
-
-                        if wave > best_wave_screen or (wave == best_wave_screen and t < best_time_screen):
-                            best_wave_screen = wave
-                            best_time_screen = t
-                            best_state_screen = candidates[cand_idx].copy()
-
-                        _update_progress(completed, len(candidates), wave, best_wave_screen)
-
-            while pending:
-                done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
-                for f in done:
-                    cand_idx = pending.pop(f, None)
-                    if cand_idx is None:
-                        continue
-                    completed += 1
-                    try:
-                        out = f.result()
-                        wave = float(out.get("avg_wave", 0.0))
-                        t = float(out.get("avg_time", 0.0))
-                    except Exception:
-                        continue
-
-                    screening_scores.append((cand_idx, wave, t))
-                    all_results.append((candidates[cand_idx], wave, t))
+        # One job per distinct stats; its result is reported for every candidate of the group.
+        # Members are held only until their group's result is in.
+        first: Dict[tuple, int] = {}
+        waiting: Dict[int, List[Tuple[int, UpgradeState]]] = {}
+        finished: Dict[int, Tuple[float, float]] = {}
+
+        def _screen_jobs():
+            for idx, cand in _indexed_candidates():
+                rep = memo.join(first, cand, idx)
+                if rep == idx:
+                    waiting[idx] = [(idx, cand)]
+                    yield (idx, *_payload(cand), _task_seed(0, idx))
+                elif rep in finished:
+                    _on_screened(idx, cand, *finished[rep])
+                else:
+                    waiting.setdefault(rep, []).append((idx, cand))
+
+        def _on_screened_group(rep_idx: int, wave: float, t: float) -> None:
+            finished[rep_idx] = (wave, t)
+            for cand_idx, cand in waiting.pop(rep_idx, ()):
+                _on_screened(cand_idx, cand, wave, t)
 
-                    if wave > best_wave_screen or (wave == best_wave_screen and t < best_time_screen):
-                        best_wave_screen = wave
-                        best_time_screen = t
-                        best_state_screen = candidates[cand_idx].copy()
-
-                    _update_progress(completed, len(candidates), wave, best_wave_screen)
+        try:
+            _evaluate_chunked(
+                executor,
+                _screen_jobs(),
+                prestige=prestige,
+                runs=screening_runs,
+                exact=exact_screening,
+                crn=crn,
+                antithetic=antithetic,
+                max_workers=max_workers,
+                max_pending=max_pending,
+                on_result=_on_screened_group,
+                total_jobs=planned[0],
+            )
         finally:
             _shutdown_executor(cancel_futures=False)
     else:
-        for idx, cand in enumerate(candidates):
-            wave, t = _evaluate_state_serial(cand, prestige, runs=screening_runs, seed=seed_base + idx)
-            screening_scores.append((idx, wave, t))
-            all_results.append((cand, wave, t))
-            if wave > best_wave_screen or (wave == best_wave_screen and t < best_time_screen):
-                best_wave_screen = wave
-                best_time_screen = t
-                best_state_screen = cand.copy()
-            _update_progress(idx + 1, len(candidates), wave, best_wave_screen)
+        for idx, cand in _indexed_candidates():
+            wave, t = _evaluate_state_serial(
+                cand,
+                prestige,
+                runs=screening_runs,
+                seed=_task_seed(0, idx),
+                exact=exact_screening,
+                crn=crn,
+                antithetic=antithetic,
+                memo=memo,
+                phase="screen",
+            )
+            _on_screened(idx, cand, wave, t)
 
     # Phase 2: refine top K with more runs
-    if not screening_scores:
+    all_results: List[Tuple[UpgradeState, float, float]] = []
+    if not waves:
         # Total failure; fall back to the initial state.
         best_state = initial_state
         best_wave = 0.0
         best_time = 0.0
     else:
-        screening_scores.sort(key=lambda x: (-x[1], x[2]))  # wave desc, time asc
-        top_k = max(10, int(len(screening_scores) * float(top_k_ratio)))
-        top_k = min(top_k, len(screening_scores))
-        top_indices = [idx for idx, _w, _t in screening_scores[:top_k]]
-
-        best_state = best_state_screen or candidates[top_indices[0]].copy()
+        top_k = max(10, int(len(waves) * float(top_k_ratio)))
+        top_k = min(top_k, len(waves), len(top_heap))
+        ranked = sorted(top_heap, reverse=True)[:top_k]  # wave desc, time asc
+        top_indices = [-neg_idx for _w, _neg_t, neg_idx, _s in ranked]
+        top_states = {-neg_idx: state for _w, _neg_t, neg_idx, state in ranked}
+        all_results = [(state, wave, -neg_t) for wave, neg_t, _neg_idx, state in ranked]
+        top_heap.clear()
+
+        best_state = best_state_screen or top_states[top_indices[0]].copy()
         best_wave = -1.0
         best_time = float("inf")
 
         if use_parallel:
-            # Re-open a new pool for refinement (simpler lifetime management)
-            from .mc_parallel import run_event_sims_summary  # type: ignore[no-redef]
-
-            executor = ProcessPoolExecutor(max_workers=max_workers)
+            # New session on the shared pool for refinement (simpler lifetime management)
+            executor = acquire_worker_pool(max_workers)
             executor_shutdown = False
 
             def _shutdown_executor(cancel_futures: bool) -> None:
@@ -477,137 +1055,60 @@ def monte_carlo_optimize_parallel(
                     pass
                 executor_shutdown = True
 
-            pending: Dict[Any, int] = {}
             completed = 0
-            try:
-                for j, cand_idx in enumerate(top_indices):
-                    cand = candidates[cand_idx]
-                    levels, gem_levels = _payload(cand)
-                    fut = executor.submit(
-                        run_event_sims_summary,
-                        levels=levels,
-                        gem_levels=gem_levels,
-                        prestige=prestige,
-                        runs=final_runs,
-                        seed=seed_base_local + 10_000 + j,
-                    )
-                    pending[fut] = cand_idx
-
-                    if len(pending) >= max_pending:
-                        done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
-                        for f in done:
-                            idx2 = pending.pop(f, None)
-                            if idx2 is None:
-                                continue
-                            completed += 1
-                            try:
-                                out = f.result()
-                                wave = float(out.get("avg_wave", 0.0))
-                                t = float(out.get("avg_time", 0.0))
-                            except Exception:
-                                continue
 
-                            if wave > best_wave or (wave == best_wave and t < best_time):
-                                best_wave = wave
-                                best_time = t
-                                best_state = candidates[idx2].copy()
-
-                            _update_progress(completed, top_k, wave, best_wave)
-
-                while pending:
-                    done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
-                    for f in done:
-                        idx2 = pending.pop(f, None)
-                        if idx2 is None:
-                            continue
-                        completed += 1
-                        try:
-                            out = f.result()
-                            wave = float(out.get("avg_wave", 0.0))
-                            t = float(out.get("avg_time", 0.0))
-                        except Exception:
-                            continue
-
-                        if wave > best_wave or (wave == best_wave and t < best_time):
-                            best_wave = wave
-                            best_time = t
-                            best_state = candidates[idx2].copy()
-
-                        _update_progress(completed, top_k, wave, best_wave)
+            def _on_refined(cand_idx: int, wave: float, t: float) -> None:
+                nonlocal completed, best_wave, best_time, best_state
+                completed += 1
+                if wave > best_wave or (wave == best_wave and t < best_time):
+                    best_wave = wave
+                    best_time = t
+                    best_state = top_states[cand_idx].copy()
+
+                _update_progress(completed, top_k, wave, best_wave)
+
+            refine_groups = memo.group(top_states, top_indices)
+
+            def _on_refined_group(rep_idx: int, wave: float, t: float) -> None:
+                for cand_idx in refine_groups[rep_idx]:
+                    _on_refined(cand_idx, wave, t)
+
+            try:
+                _evaluate_chunked(
+                    executor,
+                    [
+                        (cand_idx, *_payload(top_states[cand_idx]), _task_seed(10_000, j))
+                        for j, cand_idx in enumerate(top_indices)
+                        if cand_idx in refine_groups
+                    ],
+                    prestige=prestige,
+                    runs=final_runs,
+                    exact=False,
+                    crn=crn,
+                    antithetic=antithetic,
+                    max_workers=max_workers,
+                    max_pending=max_pending,
+                    on_result=_on_refined_group,
+                )
             finally:
                 _shutdown_executor(cancel_futures=False)
         else:
             for j, cand_idx in enumerate(top_indices):
-                cand = candidates[cand_idx]
-                wave, t = _evaluate_state_serial(cand, prestige, runs=final_runs, seed=seed_base_local + 10_000 + j)
+                cand = top_states[cand_idx]
+                wave, t = _evaluate_state_serial(
+                    cand, prestige, runs=final_runs, seed=_task_seed(10_000, j), crn=crn, antithetic=antithetic,
+                    memo=memo, phase="refine",
+                )
                 if wave > best_wave or (wave == best_wave and t < best_time):
                     best_wave = wave
                     best_time = t
                     best_state = cand.copy()
                 _update_progress(j + 1, top_k, wave, best_wave)
 
-    # Compute summary stats from screening results (stable, lots of samples)
-    waves = [w for _idx, w, _t in screening_scores]
-    times = [t for _idx, _w, t in screening_scores]
-    waves_sorted = sorted(waves)
-    times_sorted = sorted(times)
-    n = len(waves_sorted)
-
-    mean_wave = sum(waves) / n if n > 0 else 0.0
-    mean_time = sum(times) / n if n > 0 else 0.0
-
-    if n > 1:
-        wave_variance = sum((w - mean_wave) ** 2 for w in waves) / (n - 1)
-        time_variance = sum((t - mean_time) ** 2 for t in times) / (n - 1)
-        std_dev_wave = math.sqrt(wave_variance)
-        std_dev_time = math.sqrt(time_variance)
-    else:
-        std_dev_wave = 0.0
-        std_dev_time = 0.0
-
-    median_wave = waves_sorted[n // 2] if n > 0 else 0.0
-    median_time = times_sorted[n // 2] if n > 0 else 0.0
-    p5_wave = waves_sorted[int(n * 0.05)] if n > 0 else 0.0
-    p95_wave = waves_sorted[int(n * 0.95)] if n > 0 else 0.0
-
-    # Calculate materials spent for best_state
-    materials_spent = {tier: 0.0 for tier in range(1, 5)}
-    materials_remaining = {tier: float(budget[tier]) for tier in range(1, 5)}
-
-    for tier in range(1, 5):
-        for idx in range(len(COSTS[tier])):
-            initial_level = initial_state.get_level(tier, idx)
-            final_level = best_state.get_level(tier, idx)
-            for level in range(initial_level, final_level):
-                cost = round(COSTS[tier][idx] * (1.25 ** level))
-                materials_spent[tier] += cost
-                materials_remaining[tier] -= cost
-
-    player, enemy = calculate_player_stats(best_state, prestige)
-
-    statistics = {
-        "mean_wave": float(mean_wave),
-        "median_wave": float(median_wave),
-        "std_dev_wave": float(std_dev_wave),
-        "min_wave": float(min(waves) if waves else 0.0),
-        "max_wave": float(max(waves) if waves else 0.0),
-        "p5_wave": float(p5_wave),
-        "p95_wave": float(p95_wave),
-        "mean_time": float(mean_time),
-        "median_time": float(median_time),
-        "std_dev_time": float(std_dev_time),
-    }
-
-    return MCOptimizationResult(
-        best_state=best_state,
-        best_wave=float(best_wave),
-        best_time=float(best_time),
-        materials_spent=materials_spent,
-        materials_remaining=materials_remaining,
-        player_stats=player,
-        enemy_stats=enemy,
-        all_results=all_results,
-        statistics=statistics,
+    # Summary stats come from the screening results (stable, lots of samples)
+    return _build_mc_result(
+        budget, prestige, initial_state, best_state, best_wave, best_time, all_results, waves, times,
+        dedup_hit_rate=memo.hit_rate,
     )
 
 
@@ -615,7 +1116,8 @@ def generate_random_upgrade_sequence(
     budget: Dict[int, float],
     prestige: int,
     initial_state: UpgradeState,
-    event_runs: int = 5
+    event_runs: int = 5,
+    memo: Optional[_EvaluationMemo] = None,
 ) -> Tuple[UpgradeState, float, float]:
     """Generate a random upgrade sequence and simulate it"""
     """
@@ -625,19 +1127,12 @@ def generate_random_upgrade_sequence(
         budget: Available materials per tier
         prestige: Current prestige level
         initial_state: Starting upgrade state
+        memo: Optional evaluation memo; sequences ending in already simulated stats reuse those runs
     
     Returns:
         (final_state, reached_wave, run_time)
     """
-    state = initial_state.copy()
-    remaining = {tier: budget[tier] for tier in range(1, 5)}
-    
-    # Collect all available upgrades
-    available_upgrades = []
-    for tier in range(1, 5):
-        for idx in range(len(COSTS[tier])):
-            if is_upgrade_unlocked(tier, idx, prestige):
-                available_upgrades.append((tier, idx))
+    builder = _CandidateBuilder(budget, prestige, initial_state)
     
     # Randomly buy upgrades until budget exhausted
     max_iterations = 1000
@@ -646,37 +1141,21 @@ def generate_random_upgrade_sequence(
     while iteration < max_iterations:
         iteration += 1
         
-        # Filter upgrades we can afford and haven't maxed
-        affordable = []
-        for tier, idx in available_upgrades:
-            current_level = state.get_level(tier, idx)
-            max_level = get_max_level_with_caps(tier, idx, state)
-            
-            if current_level >= max_level:
-                continue
-            
-            base_cost = COSTS[tier][idx]
-            next_cost = round(base_cost * (1.25 ** current_level))
-            
-            if next_cost <= remaining[tier]:
-                affordable.append((tier, idx, next_cost))
-        
+        # Upgrades we can afford and haven't maxed
+        affordable = builder.affordable()
         if not affordable:
             break  # Can't afford anything
         
         # Randomly select one upgrade to buy
-        tier, idx, cost = random.choice(affordable)
-        
-        # Buy it
-        current_level = state.get_level(tier, idx)
-        state.set_level(tier, idx, current_level + 1)
-        remaining[tier] -= cost
+        tier, idx, cost, _ = random.choice(affordable)
+        builder.buy(tier, idx, cost)
+    
+    state = builder.state
     
     # Simulate the final state (fewer runs for speed - events have less variance)
     try:
-        player, enemy = calculate_player_stats(state, prestige)
         # Events have less variance (only block/crit RNG), so fewer sims needed
-        sim_results, avg_wave, avg_time = run_full_simulation(player, enemy, runs=event_runs)
+        avg_wave, avg_time = _evaluate_state_serial(state, prestige, runs=event_runs, seed=None, memo=memo)
     except Exception as e:
         # Fallback if simulation fails
         print(f"Warning: Simulation failed in generate_random_upgrade_sequence: {e}")
@@ -717,12 +1196,13 @@ def monte_carlo_optimize(
     best_state = None
     best_wave = -1
     best_time = float('inf')
+    memo = _EvaluationMemo(prestige)
     
     for run_num in range(1, num_runs + 1):
         # Generate random sequence and simulate
         try:
             state, wave, time = generate_random_upgrade_sequence(
-                budget, prestige, initial_state, event_runs_per_combination
+                budget, prestige, initial_state, event_runs_per_combination, memo=memo
             )
         except Exception as e:
             print(f"Error in generate_random_upgrade_sequence (run {run_num}): {e}")
@@ -807,6 +1287,7 @@ def monte_carlo_optimize(
         'mean_time': mean_time,
         'median_time': median_time,
         'std_dev_time': std_dev_time,
+        'dedup_hit_rate': memo.hit_rate,
     }
     
     return MCOptimizationResult(
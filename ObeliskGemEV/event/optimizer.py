@@ -12,9 +12,10 @@ from .constants import (
     UPGRADE_SHORT_NAMES, PRESTIGE_BONUS_BASE, get_prestige_wave_requirement
 )
 from .stats import PlayerStats, EnemyStats
+from .wave_distribution import exact_solver_supported, get_wave_distribution
 from .simulation import (
-    apply_upgrades, get_enemy_hp_at_wave, calculate_hits_to_kill,
-    run_full_simulation, calculate_materials,
+    apply_upgrades, upgrade_effect_vector, add_upgrade_levels, stats_from_effects, get_enemy_hp_at_wave, calculate_hits_to_kill,
+    run_full_simulation_batch, calculate_materials,
     calculate_damage_breakpoints, calculate_breakpoint_efficiency
 )
 
@@ -45,6 +46,10 @@ class UpgradeState:
     def set_level(self, tier: int, idx: int, level: int):
         """Set upgrade level"""
         self.levels[tier][idx] = level
+    
+    def key(self) -> Tuple[Tuple[int, ...], ...]:
+        """Hashable canonical form (equal states give equal keys)"""
+        return tuple(tuple(self.levels[tier]) for tier in range(1, 5)) + (tuple(self.gem_levels),)
 
 
 @dataclass
@@ -103,9 +108,14 @@ def calculate_player_stats(state: UpgradeState, prestige: int) -> Tuple[PlayerSt
 def estimate_max_wave(player: PlayerStats, enemy: EnemyStats, runs: int = 100) -> Tuple[float, float]:
     """
     Estimate the maximum wave reachable with given stats.
+    Uses the wave solver (deterministic but approximate, ~0.1-0.4 s per new
+    build, cached per build); `runs` is only used for the Monte Carlo fallback.
     Returns (avg_wave, avg_time)
     """
-    results, avg_wave, avg_time = run_full_simulation(player, enemy, runs)
+    if exact_solver_supported(player, enemy):
+        dist = get_wave_distribution(player, enemy)
+        return dist.avg_distance, dist.avg_time
+    results, avg_wave, avg_time = run_full_simulation_batch(player, enemy, runs)
     return avg_wave, avg_time
 
 
@@ -121,7 +131,8 @@ def calculate_breakpoint_value_for_upgrade(
     idx: int,
     prestige: int,
     enemy: EnemyStats,
-    max_wave: int
+    max_wave: int,
+    effects: Optional[List[int]] = None
 ) -> float:
     """
     Calculate the breakpoint value of buying this upgrade.
@@ -136,6 +147,7 @@ def calculate_breakpoint_value_for_upgrade(
         prestige: Current prestige level
         enemy: Enemy stats
         max_wave: Maximum wave to analyze (typically estimated max wave)
+        effects: upgrade_effect_vector(state.levels), if the caller keeps it current
     
     Returns:
         Breakpoint value score (higher = better)
@@ -143,18 +155,19 @@ def calculate_breakpoint_value_for_upgrade(
     from .simulation import get_enemy_hp_at_wave, calculate_hits_to_kill_with_crit
     
     # Get current stats
-    player_current, _ = calculate_player_stats(state, prestige)
+    if effects is None:
+        effects = upgrade_effect_vector(state.levels)
+    player_current, _ = stats_from_effects(effects, PlayerStats(), EnemyStats(), prestige, state.gem_levels)
     
-    # Simulate buying this upgrade
-    state_test = state.copy()
-    current_level = state_test.get_level(tier, idx)
-    max_level = get_max_level_with_caps(tier, idx, state_test)
+    current_level = state.get_level(tier, idx)
+    max_level = get_max_level_with_caps(tier, idx, state)
     
     if current_level >= max_level:
         return 0.0  # Can't buy more
     
-    state_test.set_level(tier, idx, current_level + 1)
-    player_after, _ = calculate_player_stats(state_test, prestige)
+    # Simulate buying this upgrade (only its effect columns change)
+    effects_after = add_upgrade_levels(list(effects), tier, idx, 1)
+    player_after, _ = stats_from_effects(effects_after, PlayerStats(), EnemyStats(), prestige, state.gem_levels)
     
     # Calculate ATK increase
     atk_increase = player_after.atk - player_current.atk
@@ -327,6 +340,8 @@ def greedy_optimize(
     }
     
     # Greedy loop: buy best available upgrade until budget exhausted
+    # (effect vector kept in sync with state, so stats per probe are O(1) to update)
+    effects = upgrade_effect_vector(state.levels)
     max_iterations = 1000
     iteration = 0
     
@@ -359,13 +374,11 @@ def greedy_optimize(
                 # Adjust priority based on current needs
                 effective_score = priority
                 
-                player, _ = calculate_player_stats(state, prestige)
-                
                 # Breakpoint-aware scoring: Calculate value across all waves
                 if category in ["atk", "atk_hp", "atk_speed"]:
                     # Calculate breakpoint value for ATK upgrades
                     bp_value = calculate_breakpoint_value_for_upgrade(
-                        state, tier, idx, prestige, enemy, max_wave_for_analysis
+                        state, tier, idx, prestige, enemy, max_wave_for_analysis, effects
                     )
                     # Scale breakpoint value to score (normalize to 0-100 range)
                     effective_score += min(100, bp_value * 0.1)  # Scale factor may need tuning
@@ -396,6 +409,7 @@ def greedy_optimize(
         
         tier, idx, cost = best_buy
         state.levels[tier][idx] += 1
+        add_upgrade_levels(effects, tier, idx, 1)
         remaining[tier] -= cost
         spent[tier] += cost
     
@@ -0,0 +1,111 @@
+"""
+Background evaluation service for UI refreshes.
+
+The budget panel recomputes expected results and gem forecasts after every
+click and on its auto-refresh timer. Those simulations must not run on the Tk
+thread, so they are handed to a single worker thread instead.
+
+Design goals:
+- Coalescing: a job only starts after `debounce_seconds` without a newer
+  request, so a burst of clicks results in one evaluation of the final state.
+- Latest wins: every submit supersedes older jobs. A queued job is replaced,
+  an in-flight one sees `is_stale()` turn True (jobs check it between steps)
+  and its result is dropped.
+- Tk-free: results are handed to `publish`, which the UI points at
+  `window.after(0, ...)` so the callback runs on the Tk thread.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+# Job: takes an `is_stale()` check, returns the result passed to on_result
+Job = Callable[[Callable[[], bool]], Any]
+
+
+class BackgroundEvaluator:
+    """One worker thread running the most recently submitted job"""
+
+    def __init__(self, publish: Callable[[Callable[[], None]], None], debounce_seconds: float = 0.15):
+        self._publish = publish
+        self.debounce_seconds = max(0.0, float(debounce_seconds))
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._pending: Optional[Tuple[int, Job, Callable[[Any], None]]] = None
+        self._due = 0.0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def generation(self) -> int:
+        """Id of the latest request (results of older ones are dropped)"""
+        return self._generation
+
+    def submit(self, job: Job, on_result: Callable[[Any], None]) -> int:
+        """Queue `job` (superseding any older one); returns its generation"""
+        with self._cond:
+            if self._closed:
+                return self._generation
+            self._generation += 1
+            self._pending = (self._generation, job, on_result)
+            self._due = time.monotonic() + self.debounce_seconds
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="budget-refresh", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return self._generation
+
+    def cancel(self) -> None:
+        """Drop the queued job and mark the in-flight one stale"""
+        with self._cond:
+            self._generation += 1
+            self._pending = None
+
+    def close(self) -> None:
+        """Cancel everything and let the worker exit (results are no longer published)"""
+        with self._cond:
+            self._closed = True
+            self._generation += 1
+            self._pending = None
+            self._cond.notify()
+
+    def is_current(self, generation: int) -> bool:
+        return not self._closed and generation == self._generation
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._pending is not None:
+                        wait = self._due - time.monotonic()
+                        if wait <= 0:
+                            break
+                    else:
+                        wait = None
+                    self._cond.wait(wait)
+                if self._closed:
+                    return
+                generation, job, on_result = self._pending
+                self._pending = None
+
+            def is_stale(generation=generation) -> bool:
+                return not self.is_current(generation)
+
+            try:
+                result = job(is_stale)
+            except Exception:
+                # A failed refresh just leaves the previous results on screen
+                continue
+            if is_stale():
+                continue
+
+            def deliver(generation=generation, on_result=on_result, result=result) -> None:
+                # A newer request may have arrived while this was queued on the UI thread
+                if self.is_current(generation):
+                    on_result(result)
+
+            try:
+                self._publish(deliver)
+            except Exception:
+                # UI is gone (e.g. Tk window destroyed)
+                pass
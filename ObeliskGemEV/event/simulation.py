@@ -5,10 +5,15 @@ Combat simulation, upgrade application, and calculations.
 
 import random
 import copy
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch engine falls back to the scalar loop
+    np = None
 
 from .stats import PlayerStats, EnemyStats
-from .constants import COSTS, CAP_UPGRADES, MAX_LEVELS
+from .constants import COSTS, CAP_UPGRADES, MAX_LEVELS, UPGRADE_EFFECTS
 
 
 def round_number(number: float, precision: int = 0) -> float:
@@ -16,6 +21,175 @@ def round_number(number: float, precision: int = 0) -> float:
     return round(number, precision)
 
 
+def make_event_rng(seed: Optional[int] = None, scalar: bool = False):
+    """
+    Create an independent RNG for the event simulator.
+    
+    Uses NumPy's counter-based Philox generator when available (falls back to
+    random.Random). Anything with a `.random()` method can be passed as `rng`
+    to the simulate/run functions; the NumPy generator also drives the batch engine.
+    
+    With `scalar=True` (the stream only feeds simulate_event_run, e.g. fewer than
+    BATCH_MIN_RUNS runs) a random.Random seeded from the seed's SeedSequence is
+    returned instead: one Generator.random() call per draw costs about twice as much.
+    """
+    if seed is not None:
+        seed = int(seed) & 0xFFFFFFFFFFFFFFFF  # Philox needs a non-negative seed
+    if np is None:
+        return random.Random(seed)
+    if scalar:
+        return _scalar_rng(np.random.SeedSequence(seed))
+    return np.random.Generator(np.random.Philox(seed))
+
+
+def _scalar_rng(seed_seq) -> random.Random:
+    """random.Random seeded with 128 bits of a NumPy SeedSequence"""
+    return random.Random(int.from_bytes(seed_seq.generate_state(4, np.uint32).tobytes(), "little"))
+
+
+def spawn_event_rngs(seed: Optional[int], count: int, scalar: bool = False) -> list:
+    """
+    Create `count` statistically independent RNG streams from one seed.
+    
+    Stream i only depends on (seed, i), so results are identical no matter how
+    the streams are distributed over threads or worker processes. `scalar`
+    works as in make_event_rng.
+    """
+    if seed is not None:
+        seed = int(seed) & 0xFFFFFFFFFFFFFFFF
+    if np is None:
+        base = random.Random(seed)
+        return [random.Random(base.getrandbits(64)) for _ in range(count)]
+    children = np.random.SeedSequence(seed).spawn(count)
+    if scalar:
+        return [_scalar_rng(child) for child in children]
+    return [np.random.Generator(np.random.Philox(child)) for child in children]
+
+
+class AntitheticRNG:
+    """RNG wrapper returning 1 - u for every uniform u of the wrapped stream"""
+    
+    def __init__(self, rng):
+        self._rng = rng
+    
+    def random(self) -> float:
+        return 1.0 - self._rng.random()
+
+
+def crn_event_rngs(seed: Optional[int], runs: int, antithetic: bool = False) -> list:
+    """
+    Per-run RNG streams for common-random-numbers (CRN) comparisons.
+    
+    Run i always draws from stream i of `seed`, so every upgrade state evaluated
+    with the same seed sees the same crit/block luck run by run and only the
+    stats differ. With `antithetic=True`, runs are paired: run 2k+1 replays the
+    stream of run 2k mirrored (1 - u), cancelling part of the luck within a pair.
+    """
+    runs = max(0, int(runs))
+    # Every stream drives a single simulate_event_run
+    if not antithetic:
+        return spawn_event_rngs(seed, runs, scalar=True)
+    pairs = (runs + 1) // 2
+    # Two identical copies of each base stream: one plain, one mirrored
+    plain = spawn_event_rngs(seed, pairs, scalar=True)
+    mirrored = spawn_event_rngs(seed, pairs, scalar=True)
+    streams = []
+    for k in range(pairs):
+        streams.append(plain[k])
+        streams.append(AntitheticRNG(mirrored[k]))
+    return streams[:runs]
+
+
+# Linear effect model of the upgrades (built from constants.UPGRADE_EFFECTS).
+# Every upgrade adds a fixed amount per level to a few raw stats; prestige and
+# gem multipliers are applied at the end (stats_from_effects). A build is an
+# integer effect vector over EFFECT_COLUMNS:
+# - integer stats (atk, health, crit, ...) get one column holding their exact sum
+# - float stats get one column per upgrade holding its level; they are replayed
+#   as base + per_level * level in upgrade order, like the game's modifyStat
+#   calls, so the result is bit-identical to the Lua/previous float sums.
+# Integer vectors make incremental updates (add_upgrade_levels) and the NumPy
+# batch form (apply_upgrades_batch) exact.
+
+
+def _build_effect_model():
+    """(EFFECT_COLUMNS, slot effects) from UPGRADE_EFFECTS"""
+    slots = tuple((tier, idx) for tier in range(1, 5) for idx in range(len(MAX_LEVELS[tier])))
+    
+    def parse(spec):
+        for name, value in zip(spec[0::2], spec[1::2]):
+            if name in ("cap", "cap_of_caps"):
+                continue  # Cap upgrades have no direct stat effect
+            if name == "prestige_bonus":
+                yield ("player", "prestige_bonus_scale"), value
+            elif name.startswith("e_"):
+                yield ("enemy", name[2:]), value
+            else:
+                yield ("player", name), value
+    
+    float_stats = {stat for tier, idx in slots for stat, value in parse(UPGRADE_EFFECTS[tier][idx])
+                   if isinstance(value, float)}
+    columns = []  # (side, field, per_level); per_level None = summed integer stat
+    int_columns = {}
+    slot_effects = {}
+    for tier, idx in slots:
+        effects = []
+        for stat, value in parse(UPGRADE_EFFECTS[tier][idx]):
+            if stat in float_stats:
+                columns.append(stat + (value,))
+                effects.append((len(columns) - 1, 1))
+            else:
+                if stat not in int_columns:
+                    columns.append(stat + (None,))
+                    int_columns[stat] = len(columns) - 1
+                effects.append((int_columns[stat], value))
+        slot_effects[(tier, idx)] = tuple(effects)
+    return slots, tuple(columns), slot_effects
+
+
+# UPGRADE_SLOTS: column order of the level matrix in apply_upgrades_batch, (tier, idx)
+UPGRADE_SLOTS, EFFECT_COLUMNS, _SLOT_EFFECTS = _build_effect_model()
+_effect_matrix = None  # (len(UPGRADE_SLOTS), len(EFFECT_COLUMNS)) int64, built on first batch call
+
+
+def upgrade_effect_vector(upgrades: Dict[int, List[int]]) -> List[int]:
+    """Effect vector (EFFECT_COLUMNS order) of all upgrade levels"""
+    vector = [0] * len(EFFECT_COLUMNS)
+    for tier, levels in upgrades.items():
+        for idx, level in enumerate(levels):
+            if level:
+                for column, per_level in _SLOT_EFFECTS.get((tier, idx), ()):
+                    vector[column] += per_level * level
+    return vector
+
+
+def add_upgrade_levels(vector: List[int], tier: int, idx: int, delta: int = 1) -> List[int]:
+    """Update `vector` in place for `delta` more levels of one upgrade (O(1)); returns `vector`"""
+    for column, per_level in _SLOT_EFFECTS.get((tier, idx), ()):
+        vector[column] += per_level * delta
+    return vector
+
+
+def stats_from_effects(vector: List[int], player: PlayerStats, enemy: EnemyStats,
+                       prestiges: int, gem_ups: List[int]) -> Tuple[PlayerStats, EnemyStats]:
+    """Apply an effect vector to base stats, then the prestige and gem multipliers"""
+    # Shallow copies: the stats dataclasses only hold numbers
+    p = copy.copy(player)
+    e = copy.copy(enemy)
+    for (side, name, per_level), value in zip(EFFECT_COLUMNS, vector):
+        if value:
+            target = p if side == "player" else e
+            setattr(target, name, getattr(target, name) + (value if per_level is None else per_level * value))
+    
+    # Apply prestige and gem multipliers
+    p.atk = round_number(p.atk * (1 + p.prestige_bonus_scale * prestiges) * (1 + 0.1 * gem_ups[0]))
+    p.health = round_number(p.health * (1 + p.prestige_bonus_scale * prestiges) * (1 + 0.1 * gem_ups[1]))
+    p.game_speed = p.game_speed + gem_ups[2]
+    p.x2_money = p.x2_money + gem_ups[3]
+    
+    return p, e
+
+
 def apply_upgrades(upgrades: Dict[int, List[int]], player: PlayerStats, 
                    enemy: EnemyStats, prestiges: int, gem_ups: List[int]) -> Tuple[PlayerStats, EnemyStats]:
     """Apply all upgrades to player and enemy stats
@@ -30,79 +204,72 @@ def apply_upgrades(upgrades: Dict[int, List[int]], player: PlayerStats,
     Returns:
         Tuple of (modified_player, modified_enemy)
     """
-    p = copy.deepcopy(player)
-    e = copy.deepcopy(enemy)
-    
-    # Tier 1 upgrades (cost: Mat 1 / Coins)
-    if 1 in upgrades:
-        u = upgrades[1]
-        p.atk += u[0]  # +1 Atk Dmg
-        p.health += 2 * u[1]  # +2 Max Hp
-        p.atk_speed += 0.02 * u[2]  # +0.02 Atk Spd
-        p.walk_speed += 0.03 * u[3]  # +0.03 Move Spd
-        p.game_speed += 0.02 * u[4]  # +2% Event Game Spd (matches Lua original: 0.02*j)
-        p.crit += u[5]  # +1% Crit Chance
-        p.crit_dmg += 0.1 * u[5]  # +0.10 Crit Dmg
-        p.atk += u[6]  # +1 Atk Dmg
-        p.health += 2 * u[6]  # +2 Max Hp
-        # u[7] is cap upgrade (no direct stat effect)
-        p.prestige_bonus_scale += 0.01 * u[8]  # +1% Prestige Bonus
-        p.health += 3 * u[9]  # +3 Max Hp
-        p.atk += 3 * u[9]  # +3 Atk Dmg
-    
-    # Tier 2 upgrades (cost: Mat 2)
-    if 2 in upgrades:
-        u = upgrades[2]
-        p.health += 3 * u[0]  # +3 Max Hp
-        e.atk_speed -= 0.02 * u[1]  # -0.02 Enemy Atk Spd
-        e.atk -= u[2]  # -1 Enemy Atk Dmg (VERY STRONG early game!)
-        e.crit -= u[3]  # -1% Enemy Crit Chance
-        e.crit_dmg -= 0.10 * u[3]  # -0.10 Enemy Crit Dmg
-        p.atk += u[4]  # +1 Atk Dmg
-        p.atk_speed += 0.01 * u[4]  # +0.01 Atk Spd
-        # u[5] is cap upgrade (no direct stat effect)
-        p.prestige_bonus_scale += 0.02 * u[6]  # +2% Prestige Bonus
-    
-    # Tier 3 upgrades (cost: Mat 3)
-    if 3 in upgrades:
-        u = upgrades[3]
-        p.atk += 2 * u[0]  # +2 Atk Dmg
-        p.atk_speed += 0.02 * u[1]  # +0.02 Atk Spd
-        p.crit += u[2]  # +1% Crit Chance
-        p.game_speed += 0.03 * u[3]  # +3% Event Game Spd (matches Lua original: 0.03*j)
-        p.atk += 3 * u[4]  # +3 Atk Dmg
-        p.health += 3 * u[4]  # +3 Max Hp
-        # u[5] is cap upgrade (no direct stat effect)
-        p.x5_money += 3 * u[6]  # +3% 5x Drop Chance
-        p.health += 5 * u[7]  # +5 Max Hp
-        p.atk_speed += 0.03 * u[7]  # +0.03 Atk Spd
-    
-    # Tier 4 upgrades (cost: Mat 4)
-    if 4 in upgrades:
-        u = upgrades[4]
-        p.block_chance += 0.01 * u[0]  # +1% Block Chance
-        p.health += 5 * u[1]  # +5 Max Hp
-        p.crit_dmg += 0.1 * u[2]  # +0.10 Crit Dmg
-        e.crit_dmg -= 0.1 * u[2]  # -0.10 Enemy Crit Dmg
-        p.atk_speed += 0.02 * u[3]  # +0.02 Atk Spd
-        p.walk_speed += 0.02 * u[3]  # +0.02 Move Spd
-        p.atk += 4 * u[4]  # +4 Atk Dmg
-        p.health += 4 * u[4]  # +4 Max Hp
-        # u[5] is cap upgrade (no direct stat effect)
-        # u[6] is cap of cap upgrade (no direct stat effect)
-        p.health += 10 * u[7]  # +10 Max Hp
-        p.atk_speed += 0.05 * u[7]  # +0.05 Atk Spd
+    return stats_from_effects(upgrade_effect_vector(upgrades), player, enemy, prestiges, gem_ups)
+
+
+def apply_upgrades_batch(level_matrix, prestiges: int, gem_ups,
+                         player: Optional[PlayerStats] = None, enemy: Optional[EnemyStats] = None):
+    """
+    Batched apply_upgrades for N builds (requires NumPy).
     
-    # Apply prestige and gem multipliers
-    p.atk = round_number(p.atk * (1 + p.prestige_bonus_scale * prestiges) * (1 + 0.1 * gem_ups[0]))
-    p.health = round_number(p.health * (1 + p.prestige_bonus_scale * prestiges) * (1 + 0.1 * gem_ups[1]))
-    p.game_speed = p.game_speed + gem_ups[2]
-    p.x2_money = p.x2_money + gem_ups[3]
+    Args:
+        level_matrix: (N, len(UPGRADE_SLOTS)) upgrade levels, columns in UPGRADE_SLOTS order
+        prestiges: Prestige count shared by all builds
+        gem_ups: 4 gem levels shared by all builds, or an (N, 4) matrix
+        player/enemy: Base stats (defaults: PlayerStats() / EnemyStats())
+    
+    Returns:
+        Dict stat -> length-N array for every stat apply_upgrades changes
+        ("atk", ..., "x2_money" for the player, "e_atk", ... for the enemy).
+        Values equal apply_upgrades exactly; stats_from_batch builds the dataclasses.
+    """
+    global _effect_matrix
+    if np is None:
+        raise RuntimeError("apply_upgrades_batch requires NumPy")
+    if _effect_matrix is None:
+        matrix = np.zeros((len(UPGRADE_SLOTS), len(EFFECT_COLUMNS)), dtype=np.int64)
+        for row, slot in enumerate(UPGRADE_SLOTS):
+            for column, per_level in _SLOT_EFFECTS[slot]:
+                matrix[row, column] = per_level
+        _effect_matrix = matrix
+    player = player if player is not None else PlayerStats()
+    enemy = enemy if enemy is not None else EnemyStats()
+    
+    # One integer matmul gives the effect vectors of all builds
+    vectors = np.asarray(level_matrix, dtype=np.int64) @ _effect_matrix
+    gems = np.broadcast_to(np.asarray(gem_ups, dtype=np.int64), (vectors.shape[0], 4))
+    
+    # Same per-column operations (and order) as stats_from_effects
+    stats = {}
+    for column, (side, name, per_level) in enumerate(EFFECT_COLUMNS):
+        key = name if side == "player" else f"e_{name}"
+        if key not in stats:
+            stats[key] = getattr(player if side == "player" else enemy, name)
+        values = vectors[:, column]
+        stats[key] = stats[key] + (values if per_level is None else per_level * values)
     
+    # Apply prestige and gem multipliers
+    scale = 1 + stats["prestige_bonus_scale"] * prestiges
+    stats["atk"] = np.round(stats["atk"] * scale * (1 + 0.1 * gems[:, 0]))
+    stats["health"] = np.round(stats["health"] * scale * (1 + 0.1 * gems[:, 1]))
+    stats["game_speed"] = stats["game_speed"] + gems[:, 2]
+    stats["x2_money"] = player.x2_money + gems[:, 3]
+    return stats
+
+
+def stats_from_batch(stats: Dict[str, "np.ndarray"], row: int, player: Optional[PlayerStats] = None,
+                     enemy: Optional[EnemyStats] = None) -> Tuple[PlayerStats, EnemyStats]:
+    """(PlayerStats, EnemyStats) of build `row` of an apply_upgrades_batch result"""
+    p = copy.copy(player) if player is not None else PlayerStats()
+    e = copy.copy(enemy) if enemy is not None else EnemyStats()
+    for key, values in stats.items():
+        target, name = (e, key[2:]) if key.startswith("e_") else (p, key)
+        # .item(): int64 columns (crit, x2_money, ...) give ints like apply_upgrades
+        setattr(target, name, values[row].item())
     return p, e
 
 
-def simulate_event_run(player: PlayerStats, enemy: EnemyStats) -> Tuple[int, int, float]:
+def simulate_event_run(player: PlayerStats, enemy: EnemyStats, rng=None) -> Tuple[int, int, float]:
     """
     Simulate a single event run.
     
@@ -110,11 +277,16 @@ def simulate_event_run(player: PlayerStats, enemy: EnemyStats) -> Tuple[int, int
     Player attacks enemies, enemies attack back.
     Run ends when player HP reaches 0.
     
+    Args:
+        rng: Optional RNG with a `.random()` method (see make_event_rng).
+            Defaults to the global `random` module.
+    
     Returns: (wave, subwave, time_in_seconds)
         - wave: The wave number where player died
         - subwave: The sub-wave (5=first enemy, 1=last enemy)
         - time: Total time of the run in seconds
     """
+    rand = (rng if rng is not None else random).random
     player_hp = player.health
     time = 0.0
     p_atk_prog = 0.0  # Player attack progress (0 to 1)
@@ -153,13 +325,13 @@ def simulate_event_run(player: PlayerStats, enemy: EnemyStats) -> Tuple[int, int
                     
                     # Enemy crit check
                     enemy_crit_chance = enemy.crit + wave
-                    if enemy_crit_chance > 0 and random.random() * 100 <= enemy_crit_chance:
+                    if enemy_crit_chance > 0 and rand() * 100 <= enemy_crit_chance:
                         enemy_crit_mult = enemy.crit_dmg + enemy.crit_dmg_scaling * wave
                         if enemy_crit_mult > 1:
                             dmg = round_number(dmg * enemy_crit_mult)
                     
                     # Block check
-                    if player.block_chance > 0 and random.random() <= player.block_chance:
+                    if player.block_chance > 0 and rand() <= player.block_chance:
                         dmg = 0
                     
                     player_hp -= dmg
@@ -173,7 +345,7 @@ def simulate_event_run(player: PlayerStats, enemy: EnemyStats) -> Tuple[int, int
                     dmg = player.atk
                     
                     # Player crit check
-                    if player.crit > 0 and random.random() * 100 <= player.crit:
+                    if player.crit > 0 and rand() * 100 <= player.crit:
                         dmg = round_number(player.atk * player.crit_dmg)
                     
                     enemy_hp -= dmg
@@ -191,10 +363,11 @@ def simulate_event_run(player: PlayerStats, enemy: EnemyStats) -> Tuple[int, int
     return wave, final_subwave, time
 
 
-def simulate_event_run_realtime(player: PlayerStats, enemy: EnemyStats):
+def simulate_event_run_realtime(player: PlayerStats, enemy: EnemyStats, rng=None):
     """
     Generator function for real-time event simulation.
     Yields events for visualization: attacks, damage, movement, wave changes.
+    `rng` works as in simulate_event_run.
     
     Yields dicts with event type and data:
     - {'type': 'wave_start', 'wave': int, 'subwave': int, 'enemy_hp': int}
@@ -204,6 +377,8 @@ def simulate_event_run_realtime(player: PlayerStats, enemy: EnemyStats):
     - {'type': 'walking', 'time': float}
     - {'type': 'run_end', 'wave': int, 'subwave': int, 'time': float}
     """
+    rand = (rng if rng is not None else random).random
+    
     # Safety checks
     if player.game_speed <= 0:
         player.game_speed = 1.0
@@ -274,14 +449,14 @@ def simulate_event_run_realtime(player: PlayerStats, enemy: EnemyStats):
                     
                     # Enemy crit check
                     enemy_crit_chance = enemy.crit + wave
-                    if enemy_crit_chance > 0 and random.random() * 100 <= enemy_crit_chance:
+                    if enemy_crit_chance > 0 and rand() * 100 <= enemy_crit_chance:
                         enemy_crit_mult = enemy.crit_dmg + enemy.crit_dmg_scaling * wave
                         if enemy_crit_mult > 1:
                             dmg = round_number(dmg * enemy_crit_mult)
                             is_crit = True
                     
                     # Block check
-                    if player.block_chance > 0 and random.random() <= player.block_chance:
+                    if player.block_chance > 0 and rand() <= player.block_chance:
                         dmg = 0
                         is_blocked = True
                     
@@ -329,7 +504,7 @@ def simulate_event_run_realtime(player: PlayerStats, enemy: EnemyStats):
                     is_crit = False
                     
                     # Player crit check
-                    if player.crit > 0 and random.random() * 100 <= player.crit:
+                    if player.crit > 0 and rand() * 100 <= player.crit:
                         dmg = round_number(player.atk * player.crit_dmg)
                         is_crit = True
                     
@@ -472,7 +647,7 @@ def simulate_event_run_realtime(player: PlayerStats, enemy: EnemyStats):
 
 
 def run_full_simulation(player: PlayerStats, enemy: EnemyStats, 
-                        runs: int = 1000) -> Tuple[List[Tuple[int, int, float]], float, float]:
+                        runs: int = 1000, rng=None) -> Tuple[List[Tuple[int, int, float]], float, float]:
     """
     Run multiple event simulations and return statistics.
     
@@ -480,6 +655,7 @@ def run_full_simulation(player: PlayerStats, enemy: EnemyStats,
         player: Player stats
         enemy: Enemy stats  
         runs: Number of simulation runs
+        rng: Optional RNG shared by all runs (see make_event_rng)
     
     Returns: (sorted_results, avg_distance, avg_time)
         - sorted_results: List of (wave, subwave, time) sorted by distance
@@ -491,7 +667,7 @@ def run_full_simulation(player: PlayerStats, enemy: EnemyStats,
     total_time = 0.0
     
     for _ in range(runs):
-        wave, subwave, time = simulate_event_run(player, enemy)
+        wave, subwave, time = simulate_event_run(player, enemy, rng)
         results.append((wave, subwave, time))
         total_distance += wave + 1 - (subwave * 0.2)
         total_time += time
@@ -503,6 +679,173 @@ def run_full_simulation(player: PlayerStats, enemy: EnemyStats,
     return results, avg_distance, avg_time
 
 
+def run_full_simulation_crn(player: PlayerStats, enemy: EnemyStats, runs: int = 1000,
+                            seed: Optional[int] = 0, antithetic: bool = False, first_run: int = 0
+                            ) -> Tuple[List[Tuple[int, int, float]], float, float]:
+    """
+    run_full_simulation with common random numbers (see crn_event_rngs).
+    
+    Two upgrade states simulated with the same `seed` use identical per-run
+    random streams, so the difference between their results is mostly the
+    effect of the upgrades, not of luck.
+    
+    `first_run` skips the streams of runs already simulated: runs k..k+runs-1
+    of a seed continue an earlier evaluation of runs 0..k-1 exactly.
+    
+    Returns: (sorted_results, avg_distance, avg_time) - same as run_full_simulation
+    """
+    runs = max(1, int(runs))
+    first_run = max(0, int(first_run))
+    results = []
+    total_distance = 0.0
+    total_time = 0.0
+    
+    for rng in crn_event_rngs(seed, first_run + runs, antithetic)[first_run:]:
+        wave, subwave, time = simulate_event_run(player, enemy, rng)
+        results.append((wave, subwave, time))
+        total_distance += wave + 1 - (subwave * 0.2)
+        total_time += time
+    
+    results.sort(key=lambda x: x[0] + 1 - x[1] * 0.2)
+    return results, total_distance / runs, total_time / runs
+
+
+# Below this many runs the per-step NumPy overhead outweighs the vectorization gain.
+BATCH_MIN_RUNS = 100
+
+
+def run_full_simulation_batch(player: PlayerStats, enemy: EnemyStats,
+                              runs: int = 1000, rng=None) -> Tuple[List[Tuple[int, int, float]], float, float]:
+    """
+    Vectorized version of run_full_simulation.
+    
+    Advances all runs in lockstep as NumPy arrays: every step, each active run
+    resolves exactly one attack (same rules as simulate_event_run). Runs whose
+    player died (or hit the wave limit) drop out of the active set.
+    
+    Results follow the same distribution as the scalar path, but not the same
+    random stream (crit/block rolls are drawn for all active runs and masked).
+    
+    Args:
+        player: Player stats
+        enemy: Enemy stats
+        runs: Number of simulation runs
+        rng: Optional numpy.random.Generator (e.g. from make_event_rng; a
+            random.Random seeds a Generator). If None, one is seeded from the
+            global `random` module so random.seed() keeps runs reproducible.
+    
+    Returns: (sorted_results, avg_distance, avg_time) - same as run_full_simulation
+    """
+    runs = int(runs)
+    if np is None or runs < BATCH_MIN_RUNS:
+        return run_full_simulation(player, enemy, runs, rng)
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    elif not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng.getrandbits(64))  # e.g. a scalar stream from make_event_rng
+    
+    max_waves = 1000
+    max_combat_iterations = 10000
+    p_spd = player.atk_speed
+    p_crit_dmg = round_number(player.atk * player.crit_dmg)
+    walk_time = player.default_walk_time / player.walk_speed
+    
+    # Final results, indexed by original run number
+    out_wave = np.zeros(runs, dtype=np.int64)
+    out_subwave = np.zeros(runs, dtype=np.int64)
+    out_time = np.zeros(runs, dtype=np.float64)
+    
+    # Per-run state (compacted to active runs only)
+    run_idx = np.arange(runs)
+    player_hp = np.full(runs, float(player.health))
+    time = np.zeros(runs)
+    p_atk_prog = np.zeros(runs)
+    e_atk_prog = np.zeros(runs)
+    wave = np.ones(runs, dtype=np.int64)
+    subwave = np.full(runs, 5, dtype=np.int64)
+    enemy_hp = np.full(runs, float(enemy.base_health + enemy.health_scaling * 1))
+    combat_iterations = np.zeros(runs, dtype=np.int64)
+    
+    while run_idx.size:
+        fighting = (enemy_hp > 0) & (player_hp > 0) & (combat_iterations < max_combat_iterations)
+        
+        # One attack per fighting run
+        e_spd = enemy.atk_speed + wave * 0.02
+        p_atk_time_left = (1 - p_atk_prog) / p_spd
+        e_atk_time_left = (1 - e_atk_prog) / e_spd
+        enemy_first = fighting & (p_atk_time_left > e_atk_time_left)
+        player_first = fighting & ~enemy_first
+        
+        rolls = rng.random((2, run_idx.size))
+        
+        # Enemy damage (crit, then block)
+        e_dmg = np.maximum(1, np.round(enemy.atk + wave * enemy.atk_scaling))
+        e_crit_chance = enemy.crit + wave
+        e_crit_mult = enemy.crit_dmg + enemy.crit_dmg_scaling * wave
+        e_crit = (e_crit_chance > 0) & (rolls[0] * 100 <= e_crit_chance) & (e_crit_mult > 1)
+        e_dmg = np.where(e_crit, np.round(e_dmg * e_crit_mult), e_dmg)
+        if player.block_chance > 0:
+            e_dmg = np.where(rolls[1] <= player.block_chance, 0, e_dmg)
+        
+        # Player damage (crit)
+        if player.crit > 0:
+            p_dmg = np.where(rolls[0] * 100 <= player.crit, p_crit_dmg, player.atk)
+        else:
+            p_dmg = np.full(run_idx.size, float(player.atk))
+        
+        e_step = e_atk_time_left / e_spd
+        p_step = p_atk_time_left / p_spd
+        p_atk_prog += np.where(enemy_first, e_step * p_spd, 0.0) - player_first
+        e_atk_prog += np.where(player_first, p_step * e_spd, 0.0) - enemy_first
+        player_hp -= np.where(enemy_first, e_dmg, 0)
+        enemy_hp -= np.where(player_first, p_dmg, 0)
+        time += np.where(enemy_first, e_step, np.where(player_first, p_step, 0.0))
+        combat_iterations += fighting
+        
+        # Enemy fight over: walk, then either die here or move to the next enemy
+        ended = (enemy_hp <= 0) | (player_hp <= 0) | (combat_iterations >= max_combat_iterations)
+        if not ended.any():
+            continue
+        time += np.where(ended, walk_time, 0.0)
+        dead = ended & (player_hp <= 0)
+        advance = ended & ~dead
+        subwave -= advance
+        wave_done = advance & (subwave == 0)
+        capped = wave_done & (wave >= max_waves)
+        next_wave = wave_done & ~capped
+        wave += next_wave
+        subwave[next_wave] = 5
+        respawn = advance & ~capped
+        enemy_hp[respawn] = enemy.base_health + enemy.health_scaling * wave[respawn]
+        combat_iterations[respawn] = 0
+        
+        finished = dead | capped
+        if finished.any():
+            fin_idx = run_idx[finished]
+            out_wave[fin_idx] = wave[finished]
+            out_subwave[fin_idx] = np.where(dead[finished], subwave[finished], 0)
+            out_time[fin_idx] = time[finished] / player.game_speed
+            
+            keep = ~finished
+            run_idx = run_idx[keep]
+            player_hp = player_hp[keep]
+            time = time[keep]
+            p_atk_prog = p_atk_prog[keep]
+            e_atk_prog = e_atk_prog[keep]
+            wave = wave[keep]
+            subwave = subwave[keep]
+            enemy_hp = enemy_hp[keep]
+            combat_iterations = combat_iterations[keep]
+    
+    distance = out_wave + 1 - out_subwave * 0.2
+    results = list(zip(out_wave.tolist(), out_subwave.tolist(), out_time.tolist()))
+    results.sort(key=lambda x: x[0] + 1 - x[1] * 0.2)
+    avg_distance = float(distance.sum()) / runs
+    avg_time = float(out_time.sum()) / runs
+    
+    return results, avg_distance, avg_time
+
+
 def calculate_materials(wave: int, player: PlayerStats) -> Tuple[float, float, float, float]:
     """Calculate materials gained from reaching a wave
     
@@ -0,0 +1,137 @@
+"""
+Test script to verify the vectorized batch engine matches the scalar event simulation
+"""
+import math
+import random
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.event.simulation import (
+    apply_upgrades, run_full_simulation, run_full_simulation_batch,
+    make_event_rng, spawn_event_rngs, run_full_simulation_crn
+)
+from ObeliskGemEV.event.stats import PlayerStats, EnemyStats
+
+
+def _mean_and_se(values):
+    n = len(values)
+    mean = sum(values) / n
+    var = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, math.sqrt(var / n)
+
+
+def test_batch_matches_scalar_statistically():
+    """Batch and scalar engines should produce the same wave/time distribution"""
+    # Build with player crit, enemy crit reductions and block so every roll path is exercised
+    upgrades = {
+        1: [5, 5, 3, 2, 0, 5, 2, 0, 0, 1],
+        2: [3, 2, 3, 2, 1, 0, 0],
+        3: [0, 0, 2, 0, 0, 0, 0, 0],
+        4: [5, 0, 1, 0, 0, 0, 0, 0],
+    }
+    player, enemy = apply_upgrades(upgrades, PlayerStats(), EnemyStats(), 3, [0, 0, 0, 0])
+    runs = 3000
+
+    random.seed(12345)
+    scalar_results, scalar_avg_distance, scalar_avg_time = run_full_simulation(player, enemy, runs)
+    random.seed(54321)
+    batch_results, batch_avg_distance, batch_avg_time = run_full_simulation_batch(player, enemy, runs)
+
+    print("=" * 60)
+    print("Batch vs Scalar Event Simulation")
+    print("=" * 60)
+    print(f"Scalar: avg distance {scalar_avg_distance:.3f}, avg time {scalar_avg_time:.1f}s")
+    print(f"Batch:  avg distance {batch_avg_distance:.3f}, avg time {batch_avg_time:.1f}s")
+
+    # Same output shape
+    assert len(batch_results) == runs
+    assert all(isinstance(w, int) and isinstance(s, int) for w, s, _t in batch_results)
+    assert batch_results == sorted(batch_results, key=lambda x: x[0] + 1 - x[1] * 0.2)
+
+    # Means agree within 5 combined standard errors
+    for idx, label in ((None, "distance"), (2, "time")):
+        if idx is None:
+            scalar_vals = [w + 1 - s * 0.2 for w, s, _t in scalar_results]
+            batch_vals = [w + 1 - s * 0.2 for w, s, _t in batch_results]
+        else:
+            scalar_vals = [r[idx] for r in scalar_results]
+            batch_vals = [r[idx] for r in batch_results]
+        m1, se1 = _mean_and_se(scalar_vals)
+        m2, se2 = _mean_and_se(batch_vals)
+        z = abs(m1 - m2) / max(1e-12, math.hypot(se1, se2))
+        print(f"  {label}: z = {z:.2f}")
+        assert z < 5.0, f"{label} mean differs: scalar {m1:.3f} vs batch {m2:.3f} (z={z:.2f})"
+
+    # Death (wave, subwave) histograms agree (total variation distance)
+    def _histogram(results):
+        counts = {}
+        for w, s, _t in results:
+            counts[(w, s)] = counts.get((w, s), 0) + 1
+        return counts
+
+    h1 = _histogram(scalar_results)
+    h2 = _histogram(batch_results)
+    tvd = 0.5 * sum(abs(h1.get(k, 0) - h2.get(k, 0)) for k in set(h1) | set(h2)) / runs
+    print(f"  total variation distance: {tvd:.3f}")
+    assert tvd < 0.08, f"death distribution differs (TVD={tvd:.3f})"
+
+
+def test_batch_is_reproducible():
+    """Seeding the global RNG makes the batch engine deterministic"""
+    player, enemy = PlayerStats(crit=10, block_chance=0.05), EnemyStats()
+    random.seed(7)
+    first = run_full_simulation_batch(player, enemy, 500)
+    random.seed(7)
+    second = run_full_simulation_batch(player, enemy, 500)
+    assert first == second
+
+
+def test_explicit_rng_is_isolated_from_global_random():
+    """Runs driven by an explicit rng ignore (and leave alone) the global RNG"""
+    player, enemy = PlayerStats(crit=10, block_chance=0.05), EnemyStats()
+    random.seed(1)
+    first = run_full_simulation(player, enemy, 50, rng=make_event_rng(42))
+    after_first = random.random()
+    random.seed(2)
+    second = run_full_simulation(player, enemy, 50, rng=make_event_rng(42))
+    assert first == second
+    random.seed(1)
+    assert random.random() == after_first
+
+    # Spawned streams are reproducible per index and differ between indices
+    streams_a = spawn_event_rngs(9, 3)
+    streams_b = spawn_event_rngs(9, 3)
+    results_a = [run_full_simulation_batch(player, enemy, 200, rng=r) for r in streams_a]
+    results_b = [run_full_simulation_batch(player, enemy, 200, rng=r) for r in streams_b]
+    assert results_a == results_b
+    assert results_a[0] != results_a[1]
+
+    # Scalar streams (random.Random) are reproducible too and still seed the batch engine
+    assert run_full_simulation(player, enemy, 20, rng=make_event_rng(42, scalar=True)) == \
+        run_full_simulation(player, enemy, 20, rng=make_event_rng(42, scalar=True))
+    assert run_full_simulation_batch(player, enemy, 200, rng=make_event_rng(5, scalar=True)) == \
+        run_full_simulation_batch(player, enemy, 200, rng=make_event_rng(5, scalar=True))
+
+
+def test_crn_shares_luck_between_states():
+    """Under CRN, a useless stat change cannot change any run's outcome"""
+    base = PlayerStats(crit=10, block_chance=0.05)
+    tweaked = PlayerStats(crit=10, block_chance=0.05, x2_money=3)  # no combat effect
+    enemy = EnemyStats()
+    plain = run_full_simulation_crn(base, enemy, 20, seed=11)
+    assert plain == run_full_simulation_crn(tweaked, enemy, 20, seed=11)
+    assert plain != run_full_simulation_crn(base, enemy, 20, seed=12)
+
+    mirrored = run_full_simulation_crn(base, enemy, 20, seed=11, antithetic=True)
+    assert len(mirrored[0]) == 20
+    assert mirrored == run_full_simulation_crn(tweaked, enemy, 20, seed=11, antithetic=True)
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar_statistically()
+    test_batch_is_reproducible()
+    test_explicit_rng_is_isolated_from_global_random()
+    test_crn_shares_luck_between_states()
@@ -0,0 +1,51 @@
+"""
+Test script to verify the incremental candidate builder against a full rescan
+"""
+import random
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.event.constants import COSTS
+from ObeliskGemEV.event.monte_carlo_optimizer import _CandidateBuilder
+from ObeliskGemEV.event.optimizer import UpgradeState, get_max_level_with_caps, is_upgrade_unlocked
+
+
+def _rescan(state, remaining, prestige):
+    """(tier, idx, cost) of every affordable upgrade, recomputed from scratch"""
+    options = []
+    for tier in range(1, 5):
+        for idx in range(len(COSTS[tier])):
+            if not is_upgrade_unlocked(tier, idx, prestige):
+                continue
+            level = state.get_level(tier, idx)
+            cost = round(COSTS[tier][idx] * (1.25 ** level))
+            if level < get_max_level_with_caps(tier, idx, state) and cost <= remaining[tier]:
+                options.append((tier, idx, cost))
+    return options
+
+
+def test_builder_matches_rescan():
+    """Affordable options and the greedy pick stay correct through random purchases (incl. caps)"""
+    rng = random.Random(3)
+    budget = {1: 2e6, 2: 3e5, 3: 8e4, 4: 3e4}
+    for prestige in (2, 10, 25):
+        builder = _CandidateBuilder(budget, prestige, UpgradeState())
+        steps = 0
+        while builder.affordable():
+            options = builder.affordable()
+            assert [o[:3] for o in options] == _rescan(builder.state, builder.remaining, prestige)
+            assert builder.best() == max(options, key=lambda o: o[3])
+            tier, idx, cost, _ = rng.choice(options)
+            builder.buy(tier, idx, cost)
+            steps += 1
+        assert builder.best() is None
+        assert _rescan(builder.state, builder.remaining, prestige) == []
+        print(f"Prestige {prestige}: {steps} purchases checked")
+    print("✓ Incremental builder matches a full rescan")
+
+
+if __name__ == "__main__":
+    test_builder_matches_rescan()
@@ -0,0 +1,67 @@
+"""
+Test script to verify candidate deduplication in the event MC optimizers
+"""
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.event.monte_carlo_optimizer import (
+    _EvaluationMemo, _evaluate_state_serial, monte_carlo_optimize_guided, monte_carlo_optimize_parallel,
+)
+from ObeliskGemEV.event.optimizer import UpgradeState
+
+
+def _state(tier1_levels):
+    state = UpgradeState()
+    state.levels[1] = list(tier1_levels)
+    return state
+
+
+def test_distinct_states_with_equal_stats_share_runs():
+    """+1 Atk and +2 Hp bought separately equal the combined upgrade"""
+    split = _state([1, 1, 0, 0, 0, 0, 0, 0, 0, 0])
+    combined = _state([0, 0, 0, 0, 0, 0, 1, 0, 0, 0])
+    other = _state([2, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+    memo = _EvaluationMemo(prestige=1)
+
+    assert split.key() != combined.key()
+    assert memo.stats_key(split) == memo.stats_key(combined)
+    assert memo.group([split, combined, split.copy(), other], range(4)) == {0: [0, 1, 2], 3: [3]}
+    assert memo.hit_rate == 0.5
+
+    memo = _EvaluationMemo(prestige=1)
+    first = _evaluate_state_serial(split, 1, runs=4, seed=7, memo=memo, phase="screen")
+    assert _evaluate_state_serial(combined, 1, runs=4, seed=8, memo=memo, phase="screen") == first
+    # More runs extend the earlier evaluation; another phase starts from scratch
+    assert memo.runs_needed(memo.stats_key(combined), 10, "screen") == 6
+    assert memo.runs_needed(memo.stats_key(combined), 10, "refine") == 10
+    print("✓ Equal stats share one evaluation")
+
+
+def test_guided_optimizer_reports_hit_rate():
+    """Duplicate candidates are reused and still reported once per candidate"""
+    budget = {1: 2000.0, 2: 800.0, 3: 300.0, 4: 100.0}
+    result = monte_carlo_optimize_guided(budget, 1, num_runs=60, event_runs_per_combination=3, seed_base=1)
+    print(f"Dedup hit rate: {result.statistics['dedup_hit_rate']:.0%}")
+    assert len(result.all_results) == 61
+    assert 0.0 < result.statistics['dedup_hit_rate'] < 1.0
+    print("✓ Guided optimizer reuses duplicate candidates")
+
+
+def test_parallel_optimizer_streams_into_top_k():
+    """Streamed screening keeps only the top-K states, best first"""
+    budget = {1: 2000.0, 2: 800.0, 3: 300.0, 4: 100.0}
+    result = monte_carlo_optimize_parallel(budget, 1, num_runs=80, event_runs_per_combination=3, seed_base=1)
+    waves = [wave for _state, wave, _time in result.all_results]
+    assert len(waves) == 16  # 20% of 81 candidates
+    assert waves == sorted(waves, reverse=True)
+    assert result.best_wave > 0
+    print("✓ Parallel optimizer keeps a bounded top-K")
+
+
+if __name__ == "__main__":
+    test_distinct_states_with_equal_stats_share_runs()
+    test_guided_optimizer_reports_hit_rate()
+    test_parallel_optimizer_streams_into_top_k()
@@ -0,0 +1,66 @@
+"""
+Test script to verify the linear upgrade effect model behind apply_upgrades
+"""
+import random
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.event.constants import MAX_LEVELS
+from ObeliskGemEV.event.simulation import (
+    UPGRADE_SLOTS, add_upgrade_levels, apply_upgrades, apply_upgrades_batch,
+    stats_from_batch, stats_from_effects, upgrade_effect_vector,
+)
+from ObeliskGemEV.event.stats import PlayerStats, EnemyStats
+
+
+def _random_levels(rng):
+    return {tier: [rng.randint(0, m) for m in MAX_LEVELS[tier]] for tier in range(1, 5)}
+
+
+def test_matches_sequential_sums():
+    """Spot check against the game's formulas (modifyStat order, then multipliers)"""
+    levels = {1: [3, 2, 4, 1, 0, 2, 1, 0, 5, 1], 2: [1, 2, 3, 1, 2, 0, 4], 3: [0] * 8, 4: [1, 0, 2, 0, 0, 0, 0, 1]}
+    player, enemy = apply_upgrades(levels, PlayerStats(), EnemyStats(), 4, [2, 1, 0, 1])
+    pbs = 0.1 + 0.01 * 5 + 0.02 * 4
+    assert player.prestige_bonus_scale == pbs
+    assert player.atk == round((10 + 3 + 1 + 3 + 2) * (1 + pbs * 4) * (1 + 0.1 * 2))
+    assert player.health == round((100 + 4 + 2 + 3 + 3 + 10) * (1 + pbs * 4) * (1 + 0.1 * 1))
+    assert player.atk_speed == 1.0 + 0.02 * 4 + 0.01 * 2 + 0.05 * 1
+    assert player.crit_dmg == 2.0 + 0.1 * 2 + 0.1 * 2
+    assert player.x2_money == 1 and isinstance(player.crit, int)
+    assert enemy.atk == 2.5 - 3 and enemy.crit == -1
+    assert enemy.crit_dmg == 1.0 - 0.10 * 1 - 0.1 * 2
+    print("✓ Effect model matches the sequential formulas")
+
+
+def test_incremental_and_batch_are_exact():
+    """+1 via add_upgrade_levels and the NumPy batch give the same stats as apply_upgrades"""
+    rng = random.Random(7)
+    builds = [_random_levels(rng) for _ in range(200)]
+    for levels in builds[:50]:
+        tier, idx = rng.choice(UPGRADE_SLOTS)
+        effects = add_upgrade_levels(upgrade_effect_vector(levels), tier, idx, 1)
+        levels[tier][idx] += 1
+        assert stats_from_effects(effects, PlayerStats(), EnemyStats(), 3, [1, 2, 0, 0]) == \
+            apply_upgrades(levels, PlayerStats(), EnemyStats(), 3, [1, 2, 0, 0])
+    print("✓ Incremental updates are exact")
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("NumPy not installed, skipping batch check")
+        return
+    matrix = [[levels[tier][idx] for tier, idx in UPGRADE_SLOTS] for levels in builds]
+    stats = apply_upgrades_batch(matrix, 5, [1, 0, 1, 2])
+    for row, levels in enumerate(builds):
+        expected = apply_upgrades(levels, PlayerStats(), EnemyStats(), 5, [1, 0, 1, 2])
+        assert stats_from_batch(stats, row) == expected
+    print("✓ Batch form matches apply_upgrades")
+
+
+if __name__ == "__main__":
+    test_matches_sequential_sums()
+    test_incremental_and_batch_are_exact()
@@ -0,0 +1,36 @@
+"""
+Test script to verify the successive-halving racing scheduler
+"""
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.event.monte_carlo_optimizer import monte_carlo_optimize_parallel
+
+
+def test_single_screening_run_does_not_eliminate():
+    """With one screening run there is no variance yet, so every entrant reaches rung 1"""
+    budget = {1: 2000.0, 2: 800.0, 3: 300.0, 4: 100.0}
+    rung_sizes = []
+
+    def _progress(done, total, _wave, _best):
+        if done == 1:
+            rung_sizes.append(total)
+
+    result = monte_carlo_optimize_parallel(
+        budget, 1, num_runs=40, event_runs_per_combination=3, progress_callback=_progress,
+        screening_runs_per_combination=1, seed_base=3, scheduler="racing",
+    )
+    print(f"Rung sizes: {rung_sizes}")
+    assert len(rung_sizes) >= 2
+    assert rung_sizes[1] == rung_sizes[0]
+    assert all(later <= earlier for earlier, later in zip(rung_sizes, rung_sizes[1:]))
+    assert len(result.all_results) == 41
+    assert result.best_wave > 0
+    print("✓ Racing waits for a variance estimate before eliminating")
+
+
+if __name__ == "__main__":
+    test_single_screening_run_does_not_eliminate()
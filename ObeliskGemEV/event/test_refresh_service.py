@@ -0,0 +1,67 @@
+"""
+Test script to verify the budget panel's background refresh service
+"""
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.event.refresh_service import BackgroundEvaluator
+
+
+def _make_evaluator(debounce_seconds):
+    """Evaluator whose published callbacks are collected instead of sent to Tk"""
+    published = queue.Queue()
+    return BackgroundEvaluator(published.put, debounce_seconds=debounce_seconds), published
+
+
+def _drain(published, timeout=2.0):
+    """Run the next published callback like the Tk thread would"""
+    published.get(timeout=timeout)()
+
+
+def test_burst_is_coalesced():
+    """Five quick submits evaluate only the last state"""
+    evaluator, published = _make_evaluator(0.05)
+    calls, results = [], []
+    for value in range(5):
+        evaluator.submit(lambda is_stale, v=value: calls.append(v) or v * 10, results.append)
+    _drain(published)
+    evaluator.close()
+    assert calls == [4], calls
+    assert results == [40], results
+    print("✓ Burst of submits runs one job")
+
+
+def test_stale_in_flight_job_is_dropped():
+    """A job superseded while running is told it is stale and never published"""
+    evaluator, published = _make_evaluator(0.0)
+    started, release = threading.Event(), threading.Event()
+    seen_stale, results = [], []
+
+    def slow_job(is_stale):
+        started.set()
+        release.wait(2.0)
+        seen_stale.append(is_stale())
+        return "old"
+
+    evaluator.submit(slow_job, results.append)
+    assert started.wait(2.0)
+    evaluator.submit(lambda is_stale: "new", results.append)
+    release.set()
+    _drain(published)
+    time.sleep(0.05)
+    evaluator.close()
+    assert seen_stale == [True]
+    assert results == ["new"], results
+    assert published.empty()
+    print("✓ Stale in-flight job is cancelled")
+
+
+if __name__ == "__main__":
+    test_burst_is_coalesced()
+    test_stale_in_flight_job_is_dropped()
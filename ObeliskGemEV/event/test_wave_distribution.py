@@ -0,0 +1,88 @@
+"""
+Test script to verify the deterministic wave solver against Monte Carlo
+"""
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# The solver needs NumPy (an optional dependency)
+pytest.importorskip("numpy")
+
+from ObeliskGemEV.event.simulation import apply_upgrades, run_full_simulation_batch
+from ObeliskGemEV.event.stats import PlayerStats, EnemyStats
+from ObeliskGemEV.event.wave_distribution import solve_wave_distribution
+
+
+def test_solver_matches_monte_carlo():
+    """Solved mean distance/time should sit within MC noise of a large batch run"""
+    upgrades = {
+        1: [5, 5, 3, 2, 0, 5, 2, 0, 0, 1],
+        2: [3, 2, 3, 2, 1, 0, 0],
+        3: [0, 0, 2, 0, 0, 0, 0, 0],
+        4: [5, 0, 1, 0, 0, 0, 0, 0],
+    }
+    player, enemy = apply_upgrades(upgrades, PlayerStats(), EnemyStats(), 3, [0, 0, 0, 0])
+    dist = solve_wave_distribution(player, enemy)
+
+    random.seed(2024)
+    runs = 20000
+    results, mc_distance, mc_time = run_full_simulation_batch(player, enemy, runs)
+    distances = [w + 1 - s * 0.2 for w, s, _t in results]
+    var = sum((d - mc_distance) ** 2 for d in distances) / (runs - 1)
+    se = math.sqrt(var / runs)
+
+    print("=" * 60)
+    print("Wave Solver vs Monte Carlo")
+    print("=" * 60)
+    print(f"Solver: avg distance {dist.avg_distance:.4f}, avg time {dist.avg_time:.1f}s")
+    print(f"MC:     avg distance {mc_distance:.4f} (+/- {se:.4f}), avg time {mc_time:.1f}s")
+
+    assert abs(sum(p for _w, _s, p, _t in dist.outcomes) - 1.0) < 1e-9
+    assert abs(dist.avg_distance - mc_distance) < 5 * se + 0.01
+    assert abs(dist.avg_time - mc_time) / mc_time < 0.02
+
+
+def test_solver_bias_on_late_wave_build():
+    """State folding biases a late-wave build, but only by a fraction of a percent"""
+    upgrades = {
+        1: [25, 25, 15, 12, 10, 15, 12, 5, 5, 5],
+        2: [12, 10, 10, 8, 6, 5, 5],
+        3: [5, 5, 5, 4, 3, 3, 2, 2],
+        4: [12, 5, 5, 3, 2, 2, 1, 1],
+    }
+    player, enemy = apply_upgrades(upgrades, PlayerStats(), EnemyStats(), 3, [0, 0, 0, 0])
+    dist = solve_wave_distribution(player, enemy)
+
+    random.seed(7)
+    runs = 20000
+    results, mc_distance, _mc_time = run_full_simulation_batch(player, enemy, runs)
+    distances = [w + 1 - s * 0.2 for w, s, _t in results]
+    se = math.sqrt(sum((d - mc_distance) ** 2 for d in distances) / (runs - 1) / runs)
+
+    print(f"Late build: solver {dist.avg_distance:.4f}, MC {mc_distance:.4f} (+/- {se:.4f})")
+    assert mc_distance > 25
+    assert abs(dist.avg_distance - mc_distance) < 0.0025 * mc_distance + 4 * se
+
+
+def test_solver_deterministic_build():
+    """Without any randomness the solver returns a single certain outcome"""
+    player, enemy = PlayerStats(), EnemyStats()
+    dist = solve_wave_distribution(player, enemy)
+    random.seed(1)
+    results, _avg_distance, _avg_time = run_full_simulation_batch(player, enemy, 200)
+    assert len(dist.outcomes) == 1
+    wave, subwave, prob, _t = dist.outcomes[0]
+    assert prob == 1.0
+    assert {(w, s) for w, s, _t in results} == {(wave, subwave)}
+
+
+if __name__ == "__main__":
+    test_solver_matches_monte_carlo()
+    test_solver_bias_on_late_wave_build()
+    test_solver_deterministic_build()
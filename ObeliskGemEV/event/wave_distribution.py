@@ -0,0 +1,377 @@
+"""
+Deterministic (approximate) wave-distribution solver for the event combat model.
+
+Enemy HP, attack, crit chance and attack speed are deterministic functions of
+the wave, and the attack timeline of a fight only depends on the attack
+progress carried in from the previous enemy. The only randomness in a run is
+player crit, enemy crit and block. Instead of sampling runs, this module
+propagates probability mass enemy by enemy:
+
+- Player crits only decide on which hit the enemy dies (kill-hit table per wave).
+- Enemy crit/block only decide the damage of each enemy attack, so the HP
+  distribution is updated by convolving with a 3-point damage kernel.
+- Every distinct attack-progress state carried into the next enemy keeps its
+  own HP distribution. Progress values use the simulator's exact float math,
+  so identical timelines merge and nothing is rounded.
+
+The progress map is chaotic (tiny progress differences change who attacks
+first a few enemies later), so the number of distinct states grows quickly.
+Only the `max_states` most likely states are kept; the rest are folded into
+their nearest kept state. That folding is an approximation with a small,
+build-dependent bias: at the default cap the average wave lands within ~0.25%
+of a large Monte Carlo run (0.02-0.05 waves on wave 20-30 builds, which can be
+well outside the MC standard error). Raising the cap does not shrink the bias
+monotonically; it only falls inside MC noise around 512 states, at several
+times the cost.
+
+A solve takes roughly 0.1-0.4 s per build (more for late-wave builds), so
+results are cached per build. The answer is deterministic - the same stats
+always give the same value - so two builds are compared without MC noise,
+but not without the folding bias; treat differences of a few hundredths of a
+wave as ties.
+"""
+
+import math
+from dataclasses import dataclass, field, astuple
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # The solver needs NumPy; callers fall back to Monte Carlo
+    np = None
+
+from .stats import PlayerStats, EnemyStats
+from .simulation import round_number, run_full_simulation_batch
+
+
+# Attack-progress states kept between enemies (accuracy vs speed)
+DEFAULT_MAX_STATES = 64
+
+# Stop once the probability of still being alive drops below this
+DEFAULT_MIN_MASS = 1e-12
+
+# Same safety limit as simulate_event_run
+MAX_COMBAT_ITERATIONS = 10000
+
+
+@dataclass
+class WaveDistribution:
+    """Distribution of where an event run ends"""
+    # (wave, subwave, probability, avg_time) sorted by distance (wave + 1 - subwave * 0.2)
+    outcomes: List[Tuple[int, int, float, float]] = field(default_factory=list)
+    avg_distance: float = 0.0
+    avg_time: float = 0.0
+
+    def probability_to_reach(self, distance: float) -> float:
+        """Probability that a run ends at or beyond `distance` (decimal wave)"""
+        return sum(p for w, s, p, _t in self.outcomes if w + 1 - s * 0.2 >= distance)
+
+    def to_simulation_results(self, runs: int = 1000) -> Tuple[List[Tuple[int, int, float]], float, float]:
+        """
+        Express the distribution in the same format as run_full_simulation.
+
+        `sorted_results` holds `runs` evenly spaced quantiles of the
+        distribution, while avg_distance/avg_time are the solver's means.
+        """
+        runs = max(1, int(runs))
+        results = []
+        if self.outcomes:
+            cumulative = []
+            total = 0.0
+            for _w, _s, p, _t in self.outcomes:
+                total += p
+                cumulative.append(total)
+            cell = 0
+            for i in range(runs):
+                u = (i + 0.5) / runs * total
+                while cell < len(cumulative) - 1 and cumulative[cell] < u:
+                    cell += 1
+                wave, subwave, _p, avg_time = self.outcomes[cell]
+                results.append((wave, subwave, avg_time))
+        return results, self.avg_distance, self.avg_time
+
+
+def _chance(p: float) -> float:
+    """Probability of `random.random() <= p` (uniform on [0, 1))"""
+    return min(1.0, max(0.0, p))
+
+
+def exact_solver_supported(player: PlayerStats, enemy: EnemyStats) -> bool:
+    """Whether solve_wave_distribution can handle these stats"""
+    if np is None:
+        return False
+    if player.atk_speed <= 0 or player.walk_speed <= 0 or player.game_speed <= 0:
+        return False
+    # Enemies must be killable, otherwise fights only end at the combat iteration limit
+    crit_chance = _chance(player.crit / 100.0) if player.crit > 0 else 0.0
+    hits = []
+    if crit_chance < 1:
+        hits.append(player.atk)
+    if crit_chance > 0:
+        hits.append(round_number(player.atk * player.crit_dmg))
+    return min(hits) > 0
+
+
+def _enemy_survival_table(enemy_hp: float, atk: float, crit_hit: float, crit_chance: float) -> "np.ndarray":
+    """
+    q[j] = probability that the enemy is still alive after j player hits.
+
+    The last entry is 0 (the enemy is always dead after that many hits).
+    """
+    hits = [h for h, possible in ((atk, crit_chance < 1), (crit_hit, crit_chance > 0)) if possible]
+    max_hits = max(1, int(math.ceil(enemy_hp / min(hits))))
+    q = np.zeros(max_hits + 1)
+    q[0] = 1.0
+    # alive[c] = P(c crits so far and enemy still alive)
+    alive = np.zeros(max_hits + 1)
+    alive[0] = 1.0
+    crits = np.arange(max_hits + 1)
+    for j in range(1, max_hits + 1):
+        nxt = alive * (1 - crit_chance)
+        nxt[1:] += alive[:-1] * crit_chance
+        dealt = crits * crit_hit + (j - crits) * atk
+        nxt[(dealt >= enemy_hp) | (crits > j)] = 0.0
+        alive = nxt
+        q[j] = alive.sum()
+    q[max_hits] = 0.0
+    return q
+
+
+def _take_hit(mass: "np.ndarray", kernel: List[Tuple[int, float]]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Apply one enemy attack to rows of damage-taken distributions.
+
+    Column t = damage taken so far; columns past the end are dead.
+    Returns (alive_mass, dead_mass_per_row).
+    """
+    width = mass.shape[1]
+    out = np.zeros_like(mass)
+    dead = np.zeros(mass.shape[0])
+    for dmg, prob in kernel:
+        if prob <= 0:
+            continue
+        if dmg <= 0:
+            out += prob * mass
+        elif dmg >= width:
+            dead += prob * mass.sum(axis=1)
+        else:
+            out[:, dmg:] += prob * mass[:, :width - dmg]
+            dead += prob * mass[:, width - dmg:].sum(axis=1)
+    return out, dead
+
+
+def solve_wave_distribution(player: PlayerStats, enemy: EnemyStats, max_waves: int = 1000,
+                            max_states: int = DEFAULT_MAX_STATES,
+                            min_mass: float = DEFAULT_MIN_MASS) -> WaveDistribution:
+    """
+    Compute the distribution of death wave/subwave and the expected run time.
+
+    Follows the same rules as simulate_event_run (including its timing
+    formulas) but propagates probabilities instead of sampling.
+
+    Args:
+        player: Player stats
+        enemy: Enemy stats
+        max_waves: Wave limit (same as the simulator's safety limit)
+        max_states: Attack-progress states kept between enemies
+        min_mass: Stop once the survival probability drops below this
+
+    Returns:
+        WaveDistribution
+
+    Raises:
+        ValueError: If the stats are not supported (see exact_solver_supported)
+    """
+    if not exact_solver_supported(player, enemy):
+        raise ValueError("Wave solver does not support these stats (or NumPy is missing)")
+
+    width = int(math.ceil(player.health))  # Damage taken 0..width-1 means alive
+    if width <= 0:
+        return WaveDistribution(outcomes=[(0, 0, 1.0, 0.0)], avg_distance=1.0, avg_time=0.0)
+
+    p_spd = player.atk_speed
+    walk_time = player.default_walk_time / player.walk_speed
+    p_crit_chance = _chance(player.crit / 100.0) if player.crit > 0 else 0.0
+    p_crit_hit = round_number(player.atk * player.crit_dmg)
+    block = _chance(player.block_chance) if player.block_chance > 0 else 0.0
+
+    # Progress states: (player progress, enemy progress) carried into the next enemy, with
+    # damage-taken mass and time-weighted mass per state. Column t = damage taken so far.
+    keys = np.zeros((1, 2))
+    mass = np.zeros((1, width))
+    mass[0, 0] = 1.0
+    time_mass = np.zeros((1, width))
+
+    outcomes: Dict[Tuple[int, int], List[float]] = {}
+    wave = 0
+
+    while mass.shape[0] and wave < max_waves and mass.sum() > min_mass:
+        wave += 1
+        e_spd = enemy.atk_speed + wave * 0.02
+        enemy_hp = enemy.base_health + enemy.health_scaling * wave
+
+        dmg = max(1, round_number(enemy.atk + wave * enemy.atk_scaling))
+        e_crit_chance = enemy.crit + wave
+        e_crit = _chance(e_crit_chance / 100.0) if e_crit_chance > 0 else 0.0
+        e_crit_mult = enemy.crit_dmg + enemy.crit_dmg_scaling * wave
+        crit_dmg = round_number(dmg * e_crit_mult) if e_crit_mult > 1 else dmg
+        kernel = [(0, block),
+                  (int(dmg), (1 - block) * (1 - e_crit)),
+                  (int(crit_dmg), (1 - block) * e_crit)]
+
+        # Kill-hit table (None: enemy spawns dead)
+        survival = _enemy_survival_table(enemy_hp, player.atk, p_crit_hit, p_crit_chance) if enemy_hp > 0 else None
+
+        for subwave in range(5, 0, -1):
+            if not mass.shape[0]:
+                break
+
+            if survival is None:
+                # Enemy spawns dead: no fight, just walk
+                time_mass = time_mass + walk_time * mass
+                continue
+
+            n_states = mass.shape[0]
+            p_prog = keys[:, 0].copy()
+            e_prog = keys[:, 1].copy()
+            hits = np.zeros(n_states, dtype=np.int64)
+            iterations = np.zeros(n_states, dtype=np.int64)
+            active = np.ones(n_states, dtype=bool)
+            exit_keys, exit_mass, exit_time = [], [], []
+            death_prob = 0.0
+            death_time = 0.0
+
+            while active.any():
+                rows = np.flatnonzero(active)
+                p_left = (1 - p_prog[rows]) / p_spd
+                e_left = (1 - e_prog[rows]) / e_spd
+                enemy_first = p_left > e_left
+
+                # Enemy attacks
+                er = rows[enemy_first]
+                if er.size:
+                    step = e_left[enemy_first] / e_spd
+                    p_prog[er] += step * p_spd
+                    e_prog[er] -= 1
+                    alive_q = survival[hits[er]]
+                    m = mass[er]
+                    tm = time_mass[er] + step[:, None] * m
+                    m, dead = _take_hit(m, kernel)
+                    tm, dead_time = _take_hit(tm, kernel)
+                    death_prob += float((dead * alive_q).sum())
+                    death_time += float(((dead_time + walk_time * dead) * alive_q).sum())
+                    mass[er] = m
+                    time_mass[er] = tm
+
+                # Player attacks
+                pr = rows[~enemy_first]
+                if pr.size:
+                    step = p_left[~enemy_first] / p_spd
+                    e_prog[pr] += step * e_spd
+                    p_prog[pr] -= 1
+                    time_mass[pr] += step[:, None] * mass[pr]
+                    killed = survival[hits[pr]] - survival[hits[pr] + 1]
+                    kr = pr[killed > 0]
+                    if kr.size:
+                        killed = killed[killed > 0][:, None]
+                        exit_keys.append(np.stack([p_prog[kr], e_prog[kr]], axis=1))
+                        exit_mass.append(mass[kr] * killed)
+                        exit_time.append((time_mass[kr] + walk_time * mass[kr]) * killed)
+                    hits[pr] += 1
+                    active[pr[hits[pr] >= survival.size - 1]] = False
+
+                iterations[rows] += 1
+                capped = rows[iterations[rows] >= MAX_COMBAT_ITERATIONS]
+                if capped.size:
+                    # Fight ends at the iteration limit with the enemy still alive
+                    alive_q = survival[hits[capped]][:, None]
+                    exit_keys.append(np.stack([p_prog[capped], e_prog[capped]], axis=1))
+                    exit_mass.append(mass[capped] * alive_q)
+                    exit_time.append((time_mass[capped] + walk_time * mass[capped]) * alive_q)
+                    active[capped] = False
+
+                # Rows with (almost) no surviving mass stop early
+                emptied = rows[mass[rows].sum(axis=1) < min_mass * 1e-3]
+                active[emptied] = False
+
+            if death_prob > 0:
+                cell = outcomes.setdefault((wave, subwave), [0.0, 0.0])
+                cell[0] += death_prob
+                cell[1] += death_time
+
+            if not exit_keys:
+                keys = np.zeros((0, 2))
+                mass = np.zeros((0, width))
+                time_mass = np.zeros((0, width))
+                break
+
+            # Merge exits with identical progress (same attack timeline from here on)
+            new_keys = np.concatenate(exit_keys)
+            all_mass = np.concatenate(exit_mass)
+            all_time = np.concatenate(exit_time)
+            keys, inverse = np.unique(new_keys, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            order = np.argsort(inverse, kind="stable")
+            starts = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0])
+            mass = np.add.reduceat(all_mass[order], starts, axis=0)
+            time_mass = np.add.reduceat(all_time[order], starts, axis=0)
+
+            # Keep the most likely states; fold the rest into their nearest kept state
+            if keys.shape[0] > max_states:
+                order = np.argsort(-mass.sum(axis=1))
+                kept, folded = order[:max_states], order[max_states:]
+                for chunk in range(0, folded.size, 1024):
+                    part = folded[chunk:chunk + 1024]
+                    dist = ((keys[part][:, None, :] - keys[kept][None, :, :]) ** 2).sum(axis=2)
+                    nearest = kept[np.argmin(dist, axis=1)]
+                    np.add.at(mass, nearest, mass[part])
+                    np.add.at(time_mass, nearest, time_mass[part])
+                keys, mass, time_mass = keys[kept], mass[kept], time_mass[kept]
+
+    # Runs still alive at the wave limit end there (the simulator returns subwave 0)
+    remaining = float(mass.sum()) if wave >= max_waves else 0.0
+    if remaining > 0:
+        cell = outcomes.setdefault((wave, 0), [0.0, 0.0])
+        cell[0] += remaining
+        cell[1] += float(time_mass.sum())
+
+    ordered = sorted(outcomes.items(), key=lambda kv: kv[0][0] + 1 - kv[0][1] * 0.2)
+    total = sum(v[0] for _k, v in ordered) or 1.0
+    result = WaveDistribution()
+    for (w, s), (prob, t_mass) in ordered:
+        if prob <= 0:
+            continue
+        result.outcomes.append((w, s, prob / total, t_mass / prob / player.game_speed))
+        result.avg_distance += (w + 1 - s * 0.2) * prob / total
+        result.avg_time += t_mass / total / player.game_speed
+    return result
+
+
+@lru_cache(maxsize=512)
+def _solve_cached(player_key: tuple, enemy_key: tuple) -> WaveDistribution:
+    return solve_wave_distribution(PlayerStats(*player_key), EnemyStats(*enemy_key))
+
+
+def get_wave_distribution(player: PlayerStats, enemy: EnemyStats) -> WaveDistribution:
+    """
+    Cached solve_wave_distribution with default settings.
+
+    Stats are plain dataclasses, so identical builds (e.g. re-evaluating the
+    same upgrade state) are only solved once per process.
+    """
+    return _solve_cached(astuple(player), astuple(enemy))
+
+
+def run_full_simulation_exact(player: PlayerStats, enemy: EnemyStats,
+                              runs: int = 1000, rng=None) -> Tuple[List[Tuple[int, int, float]], float, float]:
+    """
+    Drop-in replacement for run_full_simulation backed by the wave solver.
+
+    avg_distance/avg_time come from the solver (deterministic, approximate); sorted_results
+    are `runs` evenly spaced quantiles. Falls back to Monte Carlo (using `rng`)
+    if the stats are not supported by the solver.
+    """
+    if not exact_solver_supported(player, enemy):
+        return run_full_simulation_batch(player, enemy, runs, rng)
+    return get_wave_distribution(player, enemy).to_simulation_results(runs)
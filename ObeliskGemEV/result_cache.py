@@ -0,0 +1,217 @@
+"""
+Persistent on-disk cache for Monte Carlo summary results.
+
+The optimizers re-evaluate identical inputs all the time (running the Stage
+Optimizer twice, changing an unrelated setting, Dirichlet and local-refinement
+samples that coincide). Seeded MC tasks are deterministic, so their results can
+be reused across runs and app restarts.
+
+Design goals:
+- Content-addressed: the key is a hash of the canonical JSON of all inputs
+  (stats, floor, ability flags, cards, run count, seed, ...).
+- Values are aggregated sums (+ run count), so entries can be merged with
+  `merge_sums` (e.g. a CRN evaluation topped up with more runs) and turned back
+  into averages by the caller.
+- Size-bounded: least recently used entries are evicted beyond `max_entries`
+  (checked every `PRUNE_INTERVAL` inserts).
+- Version-stamped: entries written by different simulation code are dropped.
+- Best-effort and Tk-free: workers open it directly; any SQLite/OS error
+  disables the cache for the process instead of failing the simulation.
+
+Set OBELISK_MC_CACHE=0 to disable it (inherited by spawned workers).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    from .app_paths import get_install_dir, get_save_dir
+    from .build_info import APP_VERSION
+except ImportError:
+    # When gui.py runs directly, the app folder is on sys.path instead of the package
+    from app_paths import get_install_dir, get_save_dir
+    from build_info import APP_VERSION
+
+
+CACHE_FILE_NAME = "mc_result_cache.sqlite3"
+# Entries kept on disk (least recently used are evicted beyond this)
+MAX_CACHE_ENTRIES = 20000
+# Inserts between two eviction passes (capped at a tenth of max_entries)
+PRUNE_INTERVAL = 256
+# Bump when the layout of stored values changes
+CACHE_FORMAT = 1
+# Sources whose contents stamp the cache: editing any of them invalidates all entries
+SIMULATION_SOURCES = (
+    "archaeology/block_spawn_rates.py",
+    "archaeology/block_stats.py",
+    "archaeology/mc_parallel.py",
+    "archaeology/monte_carlo_crit.py",
+    "archaeology/stage_distribution.py",
+    "event/constants.py",
+    "event/mc_parallel.py",
+    "event/optimizer.py",
+    "event/simulation.py",
+    "event/stats.py",
+    "event/wave_distribution.py",
+)
+
+_code_version: Optional[str] = None
+_cache: Optional["ResultCache"] = None
+_cache_failed = False
+
+
+def simulation_code_version() -> str:
+    """
+    Hash of the simulation sources (falls back to APP_VERSION in the frozen EXE,
+    where the .py files are not shipped).
+    """
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256(f"format={CACHE_FORMAT};app={APP_VERSION}".encode())
+        root = get_install_dir()
+        for name in SIMULATION_SOURCES:
+            try:
+                digest.update(name.encode() + b"\0" + (root / name).read_bytes())
+            except OSError:
+                digest.update(name.encode() + b"\0missing")
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-ready form where equal inputs always serialize identically"""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        value = value.item()  # NumPy scalar
+    if isinstance(value, bool) or value is None or isinstance(value, (int, str)):
+        return value
+    if isinstance(value, float):
+        # 3.0 and 3 give the same simulation, so they share a key
+        return int(value) if value.is_integer() else value
+    return str(value)
+
+
+def result_key(kind: str, **inputs: Any) -> str:
+    """Content hash of a simulation task (`kind` separates the different task types)"""
+    payload = json.dumps([kind, _canonical(inputs)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def merge_sums(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Add two cached sum dicts (nested dicts such as stage counts are added per key)"""
+    merged = dict(a)
+    for key, value in b.items():
+        if isinstance(value, dict):
+            merged[key] = merge_sums(merged.get(key, {}), value)
+        else:
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+class ResultCache:
+    """SQLite-backed key -> sums store with LRU eviction and a code-version stamp"""
+
+    def __init__(self, path: Path, max_entries: int = MAX_CACHE_ENTRIES, version: Optional[str] = None):
+        self.path = Path(path)
+        self.max_entries = max(1, int(max_entries))
+        self.version = version or simulation_code_version()
+        self.prune_interval = max(1, min(PRUNE_INTERVAL, self.max_entries // 10))
+        self._puts_since_prune = 0
+        # Autocommit; several worker processes may share the file
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Losing the last few entries on a power cut is fine for a cache; skip the fsync per write
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, version TEXT NOT NULL, value TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        # Entries of other simulation code can never be hit again
+        self._conn.execute("DELETE FROM results WHERE version != ?", (self.version,))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached sums for `key`, or None (also marks the entry as recently used)"""
+        row = self._conn.execute(
+            "SELECT value FROM results WHERE key = ? AND version = ?", (key, self.version)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, sums: Dict[str, Any]) -> None:
+        """Store `sums` under `key` (least recently used entries beyond max_entries are evicted in batches)"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (key, version, value, last_used) VALUES (?, ?, ?, ?)",
+            (key, self.version, json.dumps(sums, separators=(",", ":")), time.time()),
+        )
+        # Counting is a table scan, so eviction only runs once per batch of inserts
+        # (the file may briefly hold up to prune_interval - 1 extra entries)
+        self._puts_since_prune += 1
+        if self._puts_since_prune >= self.prune_interval:
+            self.prune()
+
+    def prune(self) -> None:
+        """Evict the least recently used entries beyond max_entries"""
+        self._puts_since_prune = 0
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,)
+            )
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Process-wide cache under get_save_dir(), or None if disabled/unavailable"""
+    global _cache, _cache_failed
+    if _cache is None and not _cache_failed:
+        if os.environ.get("OBELISK_MC_CACHE", "1") == "0":
+            return None
+        try:
+            _cache = ResultCache(get_save_dir() / CACHE_FILE_NAME)
+        except (sqlite3.Error, OSError):
+            _cache_failed = True
+    return _cache
+
+
+def cached_sums(key: str) -> Optional[Dict[str, Any]]:
+    """Best-effort lookup: None on a miss or if the cache is unavailable"""
+    global _cache, _cache_failed
+    cache = get_result_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except (sqlite3.Error, ValueError):
+        _cache, _cache_failed = None, True
+        return None
+
+
+def store_sums(key: str, sums: Dict[str, Any]) -> None:
+    """Best-effort store (errors disable the cache for this process)"""
+    global _cache, _cache_failed
+    cache = get_result_cache()
+    if cache is None:
+        return
+    try:
+        cache.put(key, sums)
+    except sqlite3.Error:
+        _cache, _cache_failed = None, True
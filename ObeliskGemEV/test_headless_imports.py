@@ -0,0 +1,74 @@
+"""
+Test script to verify the simulation core (and pool workers) run without the GUI stack
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.worker_pool import WARM_MODULES
+
+# Measured ~0.1 s for the worker modules (was ~0.4 s with the GUI); generous for slow CI machines
+IMPORT_BUDGET_SECONDS = 1.5
+GUI_MODULES = ("tkinter", "PIL", "matplotlib")
+CORE_MODULES = WARM_MODULES + ("archaeology.headless", "archaeology.calculator", "event.monte_carlo_optimizer", "result_cache")
+
+
+def _import_in_fresh_interpreter(modules):
+    code = (
+        "import importlib, json, sys, time\n"
+        "t = time.perf_counter()\n"
+        f"for name in {list(modules)!r}:\n"
+        "    importlib.import_module(name)\n"
+        "elapsed = time.perf_counter() - t\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'gui': [m for m in {GUI_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(Path(__file__).parent.parent),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_core_imports_without_gui():
+    """Worker and headless modules must not pull in tkinter/PIL and stay within the import budget"""
+    result = _import_in_fresh_interpreter(["ObeliskGemEV." + name for name in CORE_MODULES])
+    print(f"Core import: {result['elapsed']:.3f}s, GUI modules loaded: {result['gui']}")
+    assert result["gui"] == []
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
+
+
+def test_spawned_workers_skip_gui():
+    """Spawn workers re-run the entry script (gui.py) as __mp_main__; that must not load the GUI"""
+    code = (
+        "import json, multiprocessing, sys\n"
+        "sys.path.insert(0, 'ObeliskGemEV')\n"
+        "multiprocessing.set_start_method('spawn')  # Windows / PyInstaller EXE\n"
+        "import gui\n"
+        "sys.modules['__main__'] = gui  # as if started with `python gui.py`\n"
+        "from worker_pool import acquire_worker_pool, shutdown_worker_pool\n"
+        "executor = acquire_worker_pool(1)\n"
+        "probe = '[m for m in %r if m in __import__(\"sys\").modules] + [__import__(\"sys\").modules[\"__mp_main__\"].__file__]'\n"
+        f"fut = executor.submit(eval, probe % ({GUI_MODULES!r},))\n"
+        "print(json.dumps(fut.result(timeout=60)))\n"
+        "executor.shutdown()\n"
+        "shutdown_worker_pool(wait=True)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(Path(__file__).parent.parent),
+        capture_output=True, text=True, check=True, timeout=120,
+    )
+    *gui_loaded, main_file = json.loads(out.stdout.strip().splitlines()[-1])
+    print(f"Worker __mp_main__: {main_file}, GUI modules loaded: {gui_loaded}")
+    assert Path(main_file).name == "gui.py"
+    assert gui_loaded == []
+
+
+if __name__ == "__main__":
+    test_core_imports_without_gui()
+    test_spawned_workers_skip_gui()
@@ -0,0 +1,110 @@
+"""
+Test script to verify the on-disk Monte Carlo result cache
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV import result_cache
+from ObeliskGemEV.result_cache import ResultCache, merge_sums, result_key
+
+
+def test_keys_are_canonical():
+    """Dict order, tuple vs list and 3 vs 3.0 must not change the key"""
+    a = result_key("t", stats={'total_damage': 30, 'crit_chance': 0.25}, cards=('common', 1), seed=1)
+    b = result_key("t", seed=1, cards=['common', 1], stats={'crit_chance': 0.25, 'total_damage': 30.0})
+    assert a == b
+    assert a != result_key("t", stats={'total_damage': 31, 'crit_chance': 0.25}, cards=('common', 1), seed=1)
+    assert a != result_key("u", stats={'total_damage': 30, 'crit_chance': 0.25}, cards=('common', 1), seed=1)
+    assert merge_sums({"runs": 2, "counts": {"3": 2}}, {"runs": 1, "counts": {"3": 1, "4": 1}}) == \
+        {"runs": 3, "counts": {"3": 3, "4": 1}}
+    print("✓ Cache keys are canonical")
+
+
+def test_lru_eviction_and_version_stamp():
+    """Oldest entries go first; a different code version starts empty"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite3"
+        cache = ResultCache(path, max_entries=3, version="a")
+        for i in range(3):
+            cache.put(f"k{i}", {"runs": i})
+        assert cache.get("k0") == {"runs": 0}  # k0 is now the most recently used
+        cache.put("k3", {"runs": 3})
+        assert len(cache) == 3
+        assert cache.get("k1") is None
+        assert cache.get("k0") == {"runs": 0}
+        cache.close()
+
+        cache = ResultCache(path, max_entries=3, version="b")
+        assert len(cache) == 0
+        cache.close()
+    print("✓ LRU eviction and version invalidation")
+
+
+def test_stage_summary_served_from_cache():
+    """A repeated seeded task returns the same summary without re-simulating"""
+    from ObeliskGemEV.archaeology.mc_parallel import run_stage_sims_summary
+
+    kwargs = dict(
+        stats={'total_damage': 30, 'armor_pen': 10, 'max_stamina': 120, 'crit_chance': 0.2, 'crit_damage': 2.0},
+        starting_floor=1, n_sims=20, use_crit=True, enrage_enabled=True, flurry_enabled=False,
+        quake_enabled=False, block_cards=None, seed=123,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = result_cache._cache, result_cache._cache_failed
+        result_cache._cache = ResultCache(Path(tmp) / "cache.sqlite3", version="test")
+        try:
+            first = run_stage_sims_summary(**kwargs)
+            assert len(result_cache._cache) == 1
+            second = run_stage_sims_summary(**kwargs)
+            assert second == first
+            assert len(result_cache._cache) == 1
+            run_stage_sims_summary(**dict(kwargs, seed=124))
+            assert len(result_cache._cache) == 2
+            result_cache._cache.close()
+        finally:
+            result_cache._cache, result_cache._cache_failed = saved
+    print(f"✓ Cached stage summary: avg max stage {first['avg_max_stage']:.2f}")
+
+
+def test_crn_evaluation_topped_up_from_cache():
+    """More CRN runs of cached inputs only simulate the missing runs and match a fresh evaluation"""
+    from ObeliskGemEV.event import simulation
+    from ObeliskGemEV.event.mc_parallel import run_event_sims_summary
+
+    kwargs = dict(levels={1: [10, 10, 5, 5, 5, 5, 5, 5, 5, 5]}, gem_levels=[0, 0, 0, 0], prestige=1, seed=5, crn=True)
+    simulated = []
+    original = simulation.run_full_simulation_crn
+
+    def _counting(*args, **kw):
+        simulated.append((kw.get("first_run", 0), kw["runs"]))
+        return original(*args, **kw)
+
+    saved = result_cache._cache, result_cache._cache_failed
+    with tempfile.TemporaryDirectory() as tmp:
+        simulation.run_full_simulation_crn = _counting
+        try:
+            result_cache._cache, result_cache._cache_failed = None, True  # uncached reference
+            fresh = run_event_sims_summary(runs=10, **kwargs)
+            result_cache._cache = ResultCache(Path(tmp) / "cache.sqlite3", version="test")
+            run_event_sims_summary(runs=4, **kwargs)
+            topped_up = run_event_sims_summary(runs=10, **kwargs)
+            run_event_sims_summary(runs=4, **kwargs)
+            result_cache._cache.close()
+        finally:
+            simulation.run_full_simulation_crn = original
+            result_cache._cache, result_cache._cache_failed = saved
+    assert simulated == [(0, 10), (0, 4), (4, 6)]
+    for name in ("avg_wave", "avg_time", "std_wave"):
+        assert abs(topped_up[name] - fresh[name]) < 1e-6
+    print(f"✓ CRN top-up: avg wave {topped_up['avg_wave']:.3f} from 4 cached + 6 new runs")
+
+
+if __name__ == "__main__":
+    test_keys_are_canonical()
+    test_lru_eviction_and_version_stamp()
+    test_stage_summary_served_from_cache()
+    test_crn_evaluation_topped_up_from_cache()
@@ -0,0 +1,68 @@
+"""
+Test script to verify cancel tokens stop Monte Carlo tasks that are already running
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import wait
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.archaeology.mc_parallel import run_stage_sims_summary
+from ObeliskGemEV.worker_pool import TaskCancelled, acquire_worker_pool, new_cancel_token
+
+STATS = {
+    'total_damage': 60,
+    'armor_pen': 5,
+    'max_stamina': 20000,
+    'crit_chance': 0.25,
+    'crit_damage': 1.8,
+}
+# A regular task size, but with long runs: ~20 s uncancelled
+LONG_TASK = dict(
+    stats=STATS, starting_floor=1, n_sims=2000, use_crit=True, enrage_enabled=True,
+    flurry_enabled=False, quake_enabled=False, block_cards=None, seed=11,
+)
+
+
+def test_partial_aggregates_on_cancel():
+    """A token set mid-run stops the batch and returns the finished runs, marked cancelled"""
+    token = new_cancel_token()
+    timer = threading.Timer(0.2, token.set)
+    timer.start()
+    t = time.perf_counter()
+    out = run_stage_sims_summary(cancel_token=token, return_partial=True, **LONG_TASK)
+    elapsed = time.perf_counter() - t
+    timer.cancel()
+    token.release()
+    print(f"Stopped after {elapsed:.2f}s with {out['runs_completed']} runs finished")
+    assert out["cancelled"] is True
+    assert 0 <= out["runs_completed"] < LONG_TASK["n_sims"]
+    assert elapsed < 2.0
+    print("✓ Partial aggregates returned on cancel")
+
+
+def test_shutdown_stops_running_worker_task():
+    """shutdown(cancel_futures=True) reaches a task the worker is already running"""
+    executor = acquire_worker_pool(1)
+    fut = executor.submit(run_stage_sims_summary, cancel_token=executor.cancel_token, **LONG_TASK)
+    time.sleep(1.0)  # let the worker pick it up
+    t = time.perf_counter()
+    executor.shutdown(wait=False, cancel_futures=True)
+    done, _ = wait([fut], timeout=2.0)
+    elapsed = time.perf_counter() - t
+    assert done, "task kept running after cancel"
+    print(f"Worker task stopped {elapsed * 1000:.0f} ms after cancel")
+    assert fut.cancelled() or isinstance(fut.exception(), TaskCancelled)
+    assert executor.cancel_token.slot is None  # released for the next run
+    print("✓ Running worker task cancelled")
+
+
+if __name__ == "__main__":
+    # Cancelled tasks must really simulate, not hit the on-disk cache
+    os.environ.setdefault("OBELISK_MC_CACHE", "0")
+    test_partial_aggregates_on_cancel()
+    test_shutdown_stops_running_worker_task()
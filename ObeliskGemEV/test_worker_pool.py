@@ -0,0 +1,47 @@
+"""
+Test script to verify the shared worker pool keeps its size across sessions
+"""
+import sys
+import time
+from concurrent.futures import wait
+from pathlib import Path
+
+# Add the project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ObeliskGemEV.worker_pool import acquire_worker_pool
+
+
+def test_sessions_share_one_pool_and_limit_concurrency():
+    """Different max_workers reuse the warm pool; each session caps its own in-flight tasks"""
+    narrow = acquire_worker_pool(1)
+    wide = acquire_worker_pool(4)
+    assert narrow._executor is wide._executor
+    wide.shutdown()
+
+    futures = [narrow.submit(pow, 2, n) for n in range(6)]
+    assert len(narrow._in_flight) <= 1
+    done, not_done = wait(futures, timeout=30)
+    assert not not_done
+    assert [f.result() for f in futures] == [2 ** n for n in range(6)]
+    narrow.shutdown()
+    assert narrow.cancel_token.slot is None
+    print("✓ One pool, per-session concurrency")
+
+
+def test_shutdown_cancels_queued_tasks():
+    """Tasks still waiting in the session are cancelled and wake up wait()"""
+    session = acquire_worker_pool(1)
+    running = session.submit(time.sleep, 0.5)
+    queued = [session.submit(time.sleep, 0.5) for _ in range(3)]
+    session.shutdown(wait=False, cancel_futures=True)
+    done, _ = wait(queued, timeout=2.0)
+    assert len(done) == 3 and all(f.cancelled() for f in queued)
+    wait([running], timeout=30)
+    assert running.done()
+    print("✓ Queued tasks cancelled")
+
+
+if __name__ == "__main__":
+    test_sessions_share_one_pool_and_limit_concurrency()
+    test_shutdown_cancels_queued_tasks()
@@ -0,0 +1,291 @@
+"""
+Shared process pool for the Monte Carlo optimizers.
+
+Creating a `ProcessPoolExecutor` per optimizer run pays process spawn plus a full
+package import in every worker, every time. Instead, one pool of POOL_WORKERS
+processes is created lazily on first use, warmed up with the simulation modules,
+and reused by the event and archaeology optimizers until the app exits. Its size
+never changes; a run's `max_workers` only caps how many of its tasks are handed
+to the pool at once (the rest wait in the session).
+
+Usage (drop-in for a per-run executor):
+
+    executor = acquire_worker_pool(max_workers)
+    fut = executor.submit(fn, **kwargs)
+    ...
+    executor.shutdown(wait=False, cancel_futures=True)  # releases this run only
+
+Cancelling queued futures does not stop tasks a worker is already running. For
+that, each session owns a `CancelToken` (one byte in a shared-memory array that
+every worker maps at start-up): pass `cancel_token=executor.cancel_token` to
+entrypoints that poll it, and `shutdown(cancel_futures=True)` or
+`executor.cancel_token.set()` stops them within one simulation step.
+"""
+
+import atexit
+import importlib
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+# Modules imported in every worker at start-up (relative to the app root).
+# These are the Tk-free simulation core: importing them must not load tkinter/PIL
+# (see test_headless_imports.py).
+WARM_MODULES = (
+    "event.mc_parallel",
+    "event.wave_distribution",
+    "archaeology.mc_parallel",
+)
+
+# Worker processes of the shared pool (sessions limit their own concurrency)
+POOL_WORKERS = os.cpu_count() or 1
+
+# Cancel flags shared with the workers (tokens beyond this run without cancellation)
+MAX_CANCEL_TOKENS = 256
+
+_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+
+_token_lock = threading.Lock()
+_cancel_flags = None  # RawArray('b'); created in the app process, inherited by every pool's workers
+_free_slots: List[int] = []
+
+
+class TaskCancelled(Exception):
+    """Raised by a worker entrypoint whose CancelToken was set mid-run"""
+
+
+class CancelToken:
+    """
+    Cross-process cancel flag (picklable; only its slot index is sent to workers).
+
+    Set and released in the app process, polled by worker tasks via `is_set()`.
+    """
+
+    def __init__(self, slot: Optional[int]):
+        self.slot = slot
+
+    def is_set(self) -> bool:
+        return self.slot is not None and _cancel_flags is not None and _cancel_flags[self.slot] != 0
+
+    def set(self) -> None:
+        with _token_lock:
+            if self.slot is not None:
+                _cancel_flags[self.slot] = 1
+
+    def release(self) -> None:
+        """Return the slot for reuse (only once no task polls it any more)"""
+        with _token_lock:
+            if self.slot is not None:
+                _cancel_flags[self.slot] = 0
+                _free_slots.append(self.slot)
+                self.slot = None
+
+
+def _shared_cancel_flags():
+    global _cancel_flags
+    with _token_lock:
+        if _cancel_flags is None:
+            _cancel_flags = multiprocessing.RawArray("b", MAX_CANCEL_TOKENS)
+            _free_slots.extend(range(MAX_CANCEL_TOKENS - 1, -1, -1))
+        return _cancel_flags
+
+
+def new_cancel_token() -> CancelToken:
+    """Claim a cleared cancel flag (a no-op token if all slots are in use)"""
+    _shared_cancel_flags()
+    with _token_lock:
+        slot = _free_slots.pop() if _free_slots else None
+        if slot is not None:
+            _cancel_flags[slot] = 0
+    return CancelToken(slot)
+
+
+def _warm_up(package_prefix: str, cancel_flags=None) -> None:
+    """Worker initializer: map the cancel flags and pre-import the simulation modules"""
+    global _cancel_flags
+    if cancel_flags is not None:
+        _cancel_flags = cancel_flags
+    for name in WARM_MODULES:
+        try:
+            importlib.import_module(package_prefix + name)
+        except Exception:
+            # A missing optional module only costs the warm-up, not the worker
+            pass
+
+
+def _package_prefix() -> str:
+    # "ObeliskGemEV.worker_pool" -> "ObeliskGemEV.", "worker_pool" (gui.py on sys.path) -> ""
+    package = __name__.rpartition(".")[0]
+    return package + "." if package else ""
+
+
+def _is_broken(executor: ProcessPoolExecutor) -> bool:
+    return bool(getattr(executor, "_broken", False)) or bool(getattr(executor, "_shutdown_thread", False))
+
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared pool (POOL_WORKERS processes), creating it on first use.
+
+    A broken pool (e.g. after a worker crash) is retired and replaced.
+    """
+    global _executor
+    with _lock:
+        if _executor is not None and _is_broken(_executor):
+            _executor.shutdown(wait=False)
+            _executor = None
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS,
+                initializer=_warm_up,
+                initargs=(_package_prefix(), _shared_cancel_flags()),
+            )
+        return _executor
+
+
+def shutdown_worker_pool(wait: bool = False) -> None:
+    """Shut down the shared pool (cancelling queued work). Safe to call repeatedly."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is None:
+        return
+    try:
+        executor.shutdown(wait=wait, cancel_futures=True)
+    except Exception:
+        pass
+
+
+class _SessionFuture(Future):
+    """Future handed out by a session; cancelling it also cancels the pool task behind it"""
+
+    def __init__(self):
+        super().__init__()
+        self.inner: Optional[Future] = None
+
+    def cancel(self) -> bool:
+        inner = self.inner
+        if inner is not None and not inner.cancel():
+            return False  # already running in a worker
+        return super().cancel()
+
+
+class WorkerPoolSession:
+    """
+    One optimizer run's view of the shared pool.
+
+    Mirrors the `submit`/`shutdown` subset of the Executor API. At most
+    `max_workers` of the session's tasks are in the pool at a time; `submit`
+    never blocks, further tasks wait in the session. `shutdown` only cancels the
+    futures this session submitted - the pool stays warm.
+    `shutdown(cancel_futures=True)` also sets `cancel_token`, stopping this
+    session's running tasks that poll it; the token is released once they finish.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(1, int(max_workers or POOL_WORKERS))
+        self._executor = get_worker_pool()
+        self._queue = deque()  # (future, fn, args, kwargs) not yet handed to the pool
+        self._in_flight = {}  # pool future -> session future
+        self._lock = threading.Lock()
+        self._closed = False
+        self.cancel_token = new_cancel_token()
+
+    def submit(self, fn, /, *args, **kwargs):
+        fut = _SessionFuture()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._queue.append((fut, fn, args, kwargs))
+        fut.add_done_callback(self._on_session_future_done)
+        self._dispatch()
+        return fut
+
+    def _submit_to_pool(self, fn, args, kwargs) -> Future:
+        try:
+            return self._executor.submit(fn, *args, **kwargs)
+        except (BrokenProcessPool, RuntimeError):
+            # A worker crashed or the pool was shut down - get a fresh one
+            self._executor = get_worker_pool()
+            return self._executor.submit(fn, *args, **kwargs)
+
+    def _dispatch(self) -> None:
+        """Hand queued tasks to the pool while the session is below max_workers"""
+        while True:
+            with self._lock:
+                if len(self._in_flight) >= self.max_workers or not self._queue:
+                    return
+                fut, fn, args, kwargs = self._queue.popleft()
+                if fut.done():
+                    continue  # cancelled while queued
+                try:
+                    inner = self._submit_to_pool(fn, args, kwargs)
+                except Exception as exc:
+                    inner = None
+                    error = exc
+                else:
+                    fut.inner = inner
+                    self._in_flight[inner] = fut
+            if inner is None:
+                fut.set_exception(error)
+                continue
+            inner.add_done_callback(self._on_pool_future_done)
+
+    def _on_pool_future_done(self, inner: Future) -> None:
+        with self._lock:
+            fut = self._in_flight.pop(inner)
+        self._dispatch()
+        # Release before publishing, so a waiter sees the token free once the last task is done
+        self._release_if_idle()
+        try:
+            if inner.cancelled():
+                fut.cancel()
+            elif inner.exception() is not None:
+                fut.set_exception(inner.exception())
+            else:
+                fut.set_result(inner.result())
+        except InvalidStateError:
+            pass  # the session future was cancelled meanwhile
+
+    def _on_session_future_done(self, fut: Future) -> None:
+        if fut.cancelled():
+            # Wake wait()/as_completed() like an executor does for cancelled work
+            fut.set_running_or_notify_cancel()
+        self._release_if_idle()
+
+    def _release_if_idle(self) -> None:
+        with self._lock:
+            idle = self._closed and not self._in_flight and all(f.done() for f, *_ in self._queue)
+        if idle:
+            self.cancel_token.release()
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if cancel_futures:
+            self.cancel_token.set()
+        with self._lock:
+            self._closed = True
+            futures = [f for f, *_ in self._queue] + list(self._in_flight.values())
+        if cancel_futures:
+            for fut in futures:
+                fut.cancel()
+        self._release_if_idle()
+        if wait:
+            for fut in futures:
+                if not fut.cancelled():
+                    try:
+                        fut.exception()
+                    except Exception:
+                        pass
+
+
+def acquire_worker_pool(max_workers: Optional[int] = None) -> WorkerPoolSession:
+    """Start an optimizer run on the shared pool (see WorkerPoolSession)."""
+    return WorkerPoolSession(max_workers)
+
+
+atexit.register(shutdown_worker_pool)